@@ -0,0 +1,231 @@
+import glob
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from src.checks.schema_checks import SchemaValidator
+from src.config.settings import DEFAULT_BATCH_WORKERS, S3_INVALID_ROWS_FORMAT
+from src.utils.compression import is_compressed
+from src.utils.data_loader import schema_read_options
+from src.utils.parquet_stats import is_parquet
+from src.utils.file_utils import list_files_recursive, load_yaml_config
+from src.validators.validate import use_context_mode
+from validation_processor import StopProcessError, ValidationProcessor
+
+# Setup logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# Per-file outcomes that are final; anything else (e.g. "error") is retried when a batch is resumed
+DONE_STATUSES = ("valid", "invalid_rows", "skipped")
+
+
+def validate_one_file(file_path: str, yaml_config_path: str, process_id: str, invalid_file_path: str = None,
+                      engine: str = "native", read_options: dict = None, schema: dict = None,
+                      invalid_rows_s3_format: str = S3_INVALID_ROWS_FORMAT) -> dict:
+    """
+    Runs the file checks and the expectations for one file; executed in a worker process.
+    The invalid rows go to the same outputs as a single-file run: `invalid_file_path` and, unless
+    `invalid_rows_s3_format` is None, S3 (the key tagged with the file name); they are written
+    before the outcome is returned.
+
+    Returns the file outcome: status is "valid", "invalid_rows" (rows split out by 'skip'
+    expectations), "skipped" (a failed file check with action 'skip'), "aborted" (a failed
+    file check with action 'abort' or a failed expectation with action 'failure') or "error".
+    """
+    start = time.monotonic()
+    outcome = {"file_path": file_path, "status": "error", "rows": 0, "valid_rows": 0, "invalid_rows": 0,
+               "file_checks": [], "details": None}
+    try:
+        processor = ValidationProcessor(file_path, yaml_config_path, None, process_id,
+                                        invalid_file_path=invalid_file_path, engine=engine)
+        processor.s3_key_tag = os.path.basename(file_path)
+        processor.load_data()
+
+        # Compressed inputs are decompressed once, for the integrity check and the parse together
+        compressed = is_compressed(file_path)
+        if compressed:
+            processor.load_dataframe(read_options, schema)
+
+        file_validation_results = processor.validate_file()
+        outcome["file_checks"] = file_validation_results
+        failed_checks = [result for result in file_validation_results if not result["result"]]
+        if failed_checks:
+            aborting = [result for result in failed_checks if result["action"] == "abort"]
+            outcome["status"] = "aborted" if aborting else "skipped"
+            outcome["details"] = "; ".join(f"{result['check_name']}: {result['details']}"
+                                           for result in (aborting or failed_checks))
+            return outcome
+
+        # Schema expectations are answered from the header / Parquet schema before loading the data
+        schema_results, skip_file = processor.validate_schema(schema_read_options(schema) if schema else read_options)
+        if skip_file:
+            outcome["status"] = "skipped"
+            outcome["details"] = "; ".join(f"Schema: {SchemaValidator.describe(result)}" for result in schema_results
+                                           if not result["success"] and result["action"] == "skip")
+            return outcome
+
+        # A Parquet file whose expectations all pass on its footer statistics is never loaded
+        if engine == "native" and is_parquet(file_path) and processor.validate_from_statistics() is not None:
+            outcome["rows"] = outcome["valid_rows"] = processor.parquet_statistics["num_rows"]
+            outcome["status"] = "valid"
+            return outcome
+
+        if not compressed:
+            processor.load_dataframe(read_options, schema)
+        if processor.df is None:
+            report = processor.compression_report
+            raise ValueError(f"Could not load {file_path}: {report['error'] or report['parse_error']}")
+        outcome["rows"] = len(processor.df)
+        invalid_df, df_valid, df_invalid = processor.validate_rows()
+        if not invalid_df.empty and (invalid_file_path or invalid_rows_s3_format):
+            processor.open_output_writer(invalid_rows_s3_format).submit(invalid_df)
+            processor.flush_outputs()
+
+        outcome["valid_rows"] = len(df_valid)
+        outcome["invalid_rows"] = len(df_invalid)
+        outcome["status"] = "invalid_rows" if len(df_invalid) else "valid"
+    except StopProcessError as e:
+        outcome["status"] = "aborted"
+        outcome["details"] = str(e)
+    except Exception as e:
+        outcome["details"] = f"{type(e).__name__}: {e}"
+    finally:
+        outcome["seconds"] = round(time.monotonic() - start, 3)
+    return outcome
+
+
+class BatchProcessor:
+    def __init__(self, source: str, yaml_config_path: str, process_id: str,
+                 workers: int = DEFAULT_BATCH_WORKERS, manifest_path: str = None,
+                 invalid_dir: str = None, engine: str = "native", read_options: dict = None,
+                 schema: dict = None, invalid_rows_s3_format: str = S3_INVALID_ROWS_FORMAT):
+        """
+        Validates every file of a directory (recursively) or glob pattern on a process pool.
+
+        :param source: Directory or glob pattern of the input files.
+        :param yaml_config_path: User YAML with the file checks and expectations.
+        :param process_id: Process id, as for ValidationProcessor.
+        :param workers: Number of worker processes.
+        :param manifest_path: JSON manifest of per-file outcomes; files already done are skipped on resume.
+        :param invalid_dir: Directory for the per-file invalid rows (<file name>.invalid.csv).
+        :param engine: Expectation engine of ValidationProcessor ("native", "sql" or "gx").
+        :param read_options: Options passed to `pd.read_csv` for every file.
+        :param schema: Declarative input schema (see `load_process_schema`); files are then loaded with
+            the Arrow reader, projected to the columns the expectations use.
+        :param invalid_rows_s3_format: Encoding of the invalid rows uploaded to S3 (csv, csv.gz or
+            parquet), one object per file; None keeps them local.
+
+        Every worker validates with its own ephemeral GX context, so the GX engine and the native
+        fallback never write the file-backed stores concurrently.
+        """
+        self.source = source
+        self.yaml_config_path = yaml_config_path
+        self.process_id = process_id
+        self.workers = workers
+        self.manifest_path = manifest_path
+        self.invalid_dir = invalid_dir
+        self.engine = engine
+        self.read_options = read_options
+        self.schema = schema
+        self.invalid_rows_s3_format = invalid_rows_s3_format
+        self.manifest = {}
+        self.summary = None
+
+    def discover_files(self) -> list:
+        """Lists the input files, sorted so that batches and manifests are reproducible."""
+        if os.path.isdir(self.source):
+            files = list_files_recursive(self.source)
+        else:
+            files = glob.iglob(self.source, recursive=True)
+        manifest_path = os.path.abspath(self.manifest_path) if self.manifest_path else None
+        return sorted(path for path in files if os.path.isfile(path) and os.path.abspath(path) != manifest_path)
+
+    def load_manifest(self) -> dict:
+        """Loads the outcomes recorded by a previous (possibly crashed) run of this batch."""
+        if self.manifest_path and os.path.isfile(self.manifest_path):
+            with open(self.manifest_path, 'r') as file:
+                return json.load(file).get("files", {})
+        return {}
+
+    def save_manifest(self) -> None:
+        """Writes the manifest atomically, so a crash never leaves it half written."""
+        if not self.manifest_path:
+            return
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, 'w') as file:
+            json.dump({"source": self.source, "updated_at": datetime.now().isoformat(), "files": self.manifest},
+                      file, indent=2, default=str)
+        os.replace(temp_path, self.manifest_path)
+
+    def invalid_file_path(self, file_path: str) -> str:
+        if not self.invalid_dir:
+            return None
+        return os.path.join(self.invalid_dir, f"{os.path.basename(file_path)}.invalid.csv")
+
+    def summarize(self, files: list, elapsed: float) -> dict:
+        """Aggregates the per-file outcomes of the batch."""
+        outcomes = [self.manifest[path] for path in files if path in self.manifest]
+        by_status = {}
+        for outcome in outcomes:
+            by_status[outcome["status"]] = by_status.get(outcome["status"], 0) + 1
+        return {
+            "files": len(files),
+            "processed": len(outcomes),
+            "by_status": by_status,
+            "rows": sum(outcome["rows"] for outcome in outcomes),
+            "valid_rows": sum(outcome["valid_rows"] for outcome in outcomes),
+            "invalid_rows": sum(outcome["invalid_rows"] for outcome in outcomes),
+            "failed_files": {outcome["file_path"]: outcome["details"] for outcome in outcomes
+                             if outcome["status"] in ("skipped", "aborted", "error")},
+            "aborted": by_status.get("aborted", 0) > 0,
+            "seconds": round(elapsed, 3),
+        }
+
+    def run(self) -> dict:
+        """
+        Validates the pending files in parallel and returns the batch summary. An 'abort'
+        outcome cancels the files not started yet (recorded as 'cancelled') and raises
+        StopProcessError once the manifest is saved; re-running the batch resumes from the manifest.
+        """
+        start = time.monotonic()
+        load_yaml_config(self.yaml_config_path)  # fail fast on a broken config, before starting workers
+        if self.invalid_dir:
+            os.makedirs(self.invalid_dir, exist_ok=True)
+
+        files = self.discover_files()
+        self.manifest = self.load_manifest()
+        pending = [path for path in files if self.manifest.get(path, {}).get("status") not in DONE_STATUSES]
+        logger.info(f"Batch of {len(files)} file(s): {len(files) - len(pending)} already done, "
+                    f"{len(pending)} to validate with {self.workers} worker(s).")
+
+        aborted = None
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=use_context_mode,
+                                 initargs=("ephemeral",)) as executor:
+            futures = {executor.submit(validate_one_file, path, self.yaml_config_path, self.process_id,
+                                       self.invalid_file_path(path), self.engine, self.read_options, self.schema,
+                                       self.invalid_rows_s3_format): path
+                       for path in pending}
+            for future in as_completed(futures):
+                if future.cancelled():
+                    # Not started before the abort; recorded as not done, so a re-run validates it
+                    outcome = {"file_path": futures[future], "status": "cancelled", "rows": 0, "valid_rows": 0,
+                               "invalid_rows": 0, "file_checks": [],
+                               "details": f"Not started: batch aborted on {aborted['file_path']}", "seconds": 0.0}
+                else:
+                    outcome = future.result()
+                self.manifest[outcome["file_path"]] = outcome
+                self.save_manifest()
+                logger.info(f"{outcome['file_path']}: {outcome['status']}")
+                if outcome["status"] == "aborted" and aborted is None:
+                    aborted = outcome
+                    for other in futures:
+                        other.cancel()
+
+        self.summary = self.summarize(files, time.monotonic() - start)
+        if aborted is not None:
+            raise StopProcessError(f"Batch aborted on {aborted['file_path']}: {aborted['details']}")
+        return self.summary
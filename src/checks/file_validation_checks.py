@@ -1,25 +1,31 @@
-import gzip
 import logging
 import os
-import zipfile
 from datetime import datetime
 
+from src.config.settings import FILE_CHECK_DEFAULT_ACTION
+from src.utils.compression import verify_gzip, verify_zip
+from src.utils.format_sniffer import FORMAT_EXTENSIONS, sniff_file_format
+
 # Setup logging
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
 class FileValidator:
-    def __init__(self, filepath: str, validation_config: dict):
+    def __init__(self, filepath: str, validation_config: dict, compression_report: dict = None):
         """
         Initialize the FileValidator with the file and validation criteria from YAML.
 
         Args:
             filepath (str): The file path to validate.
             validation_config (dict): The validation config loaded from YAML.
+            compression_report (dict): Integrity report of a decompression that already happened
+                (see `load_compressed_data`); the compression check then reuses it instead of
+                decompressing the file again.
         """
         self.filepath = filepath
         self.validation_config = validation_config
+        self.compression_report = compression_report
 
     def validate(self) -> list:
         """
@@ -44,19 +50,40 @@ class FileValidator:
                 result_dict = self.validate_file_date(check)
 
             if result_dict:  # Ensure the result_dict is always appended
+                # On failure: 'skip' the file and continue with the others, or 'abort' the job
+                result_dict["action"] = check.get('action', FILE_CHECK_DEFAULT_ACTION)
                 results.append(result_dict)
 
         return results
 
     # File Validations
     def validate_file_format(self, check) -> dict:
-        """Ensure the file has an allowed format based on its extension."""
+        """
+        Ensure the file has an allowed format. The format is detected from the content (magic bytes,
+        Parquet footer, a small text sample for CSV/JSON/NDJSON, inside gzip/zip archives too), so
+        files without an extension are classified and a misleading extension is caught before loading.
+        """
         filename = os.path.basename(self.filepath)
         file_extension = os.path.splitext(filename)[1].lower()
         allowed_extensions = check.get('allowed_extensions', [])
-        if file_extension in allowed_extensions:
-            return {"check_name": "File Format", "result": True, "details": f"Valid format: {file_extension}"}
-        return {"check_name": "File Format", "result": False, "details": f"Invalid format: {file_extension}"}
+        sniffed = sniff_file_format(self.filepath)
+        detected = sniffed["extension"]
+        result = {"check_name": "File Format", "detected_format": sniffed["format"],
+                  "compression": sniffed["compression"], "delimiter": sniffed["delimiter"]}
+
+        # The extension only has to agree with the content when it names a data format
+        declared = os.path.splitext(filename[:-len(file_extension)])[1].lower() \
+            if file_extension in ('.gz', '.zip') else file_extension
+        if sniffed["format"] == "text" and declared == FORMAT_EXTENSIONS["csv"]:
+            # Undelimited text is a single-column CSV when declared as one
+            detected = declared
+        if declared in FORMAT_EXTENSIONS.values() and detected and declared != detected:
+            return {**result, "result": False,
+                    "details": f"Extension {declared} does not match content: {sniffed['format']}"}
+        if detected in allowed_extensions:
+            return {**result, "result": True, "details": f"Valid format: {sniffed['format']} ({detected})"}
+        return {**result, "result": False,
+                "details": f"Invalid format: {sniffed['format']} (extension: {file_extension or 'none'})"}
 
     def validate_file_size(self, check) -> dict:
         """Ensure the file is not too large."""
@@ -68,20 +95,29 @@ class FileValidator:
                 "details": f"File size exceeds the limit: {file_size_mb:.2f} MB"}
 
     def validate_compressed_file(self, check) -> dict:
-        """Ensure the file is correctly compressed."""
+        """
+        Ensure the file is correctly compressed. The archive is decompressed block by block
+        (constant memory), zip members are CRC-checked in parallel, and the details report
+        truncation, bytes processed and throughput.
+        """
         allowed_compressions = check.get('allowed_compressions', [])
-        try:
-            if self.filepath.endswith('.zip') and 'zip' in allowed_compressions:
-                with zipfile.ZipFile(self.filepath, 'r') as zip_ref:
-                    zip_ref.testzip()
-                return {"check_name": "Compressed File", "result": True, "details": "Valid zip file."}
-            elif self.filepath.endswith('.gz') and 'gz' in allowed_compressions:
-                with gzip.open(self.filepath, 'rb') as f:
-                    f.read()
-                return {"check_name": "Compressed File", "result": True, "details": "Valid gzip file."}
-        except (zipfile.BadZipFile, gzip.BadGzipFile) as e:
-            return {"check_name": "Compressed File", "result": False, "details": f"Compression failed: {e}"}
-        return {"check_name": "Compressed File", "result": False, "details": "Not a valid compressed file."}
+        if self.filepath.endswith('.zip') and 'zip' in allowed_compressions:
+            report, kind = self.compression_report or verify_zip(self.filepath), "zip"
+        elif self.filepath.endswith('.gz') and 'gz' in allowed_compressions:
+            report, kind = self.compression_report or verify_gzip(self.filepath), "gzip"
+        else:
+            return {"check_name": "Compressed File", "result": False, "details": "Not a valid compressed file."}
+
+        processed = f"{report['bytes_processed'] / (1024 * 1024):.2f} MB decompressed in {report['seconds']}s" \
+                    f" ({report['throughput_mb_s']} MB/s)"
+        result = {"check_name": "Compressed File", "result": report["valid"],
+                  "bytes_processed": report["bytes_processed"], "throughput_mb_s": report["throughput_mb_s"],
+                  "truncated": report["truncated"]}
+        if report["valid"]:
+            result["details"] = f"Valid {kind} file, {processed}."
+        else:
+            result["details"] = f"Compression failed: {report['error']} after {processed}."
+        return result
 
     def validate_file_date(self, check) -> dict:
         """Ensure the file's modification date matches the business date."""
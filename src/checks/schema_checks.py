@@ -0,0 +1,87 @@
+import json
+import logging
+from typing import List
+
+import pandas as pd
+
+from src.utils.ExpectationMapper import ExpectationMapper
+from src.utils.format_sniffer import sniff_file_format
+from src.validators.native_validate import NativeDataValidator
+
+# Setup logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# Expectations that only look at the column names, so the header / schema answers them before loading
+SCHEMA_EXPECTATIONS = (
+    "ExpectColumnToExist",
+    "ExpectTableColumnCountToBeBetween",
+    "ExpectTableColumnsToMatchOrderedList",
+    "ExpectTableColumnsToMatchSet",
+)
+
+
+def read_columns(file_path: str, read_options: dict = None) -> List[str]:
+    """
+    Reads only the column names of a file: the Parquet footer schema, the first NDJSON record or
+    the CSV header (`read_options` as for `pd.read_csv`, e.g. header=None, names=[...]). When the
+    file has a header row, that row is returned, not the `names` it would be read with.
+    """
+    read_options = dict(read_options or {})
+    if read_options.get("names") is not None and read_options.get("header") is not None:
+        read_options.pop("names")
+    sniffed = sniff_file_format(file_path)
+    if sniffed["format"] == "parquet":
+        import pyarrow.parquet as pq
+
+        return list(pq.read_schema(file_path).names)
+    if sniffed["format"] == "ndjson":
+        return list(pd.read_json(file_path, lines=True, nrows=1).columns)
+    return list(pd.read_csv(file_path, nrows=0, **read_options).columns)
+
+
+class SchemaValidator:
+    def __init__(self, file_path: str, user_expectations: List[dict], expectation_mapping_config_path: str,
+                 read_options: dict = None, columns: List[str] = None):
+        """
+        Pre-load stage answering the schema expectations of the user YAML from the file's metadata.
+
+        :param file_path: The file to check.
+        :param user_expectations: The 'expectations' entries of the user YAML (others are ignored).
+        :param expectation_mapping_config_path: The expectation mapping config.
+        :param read_options: Options of `pd.read_csv`, so the header is read like the data will be.
+        :param columns: The column names of data already loaded, used instead of the file's.
+        """
+        self.file_path = file_path
+        self.user_expectations = [expectation for expectation in user_expectations
+                                  if expectation['name'] in SCHEMA_EXPECTATIONS]
+        self.expectation_mapping_config_path = expectation_mapping_config_path
+        self.read_options = read_options
+        self.columns = columns
+
+    def validate(self) -> list:
+        """
+        Returns one result per schema expectation: the GX-shaped expectation result plus the
+        expectation's action from the YAML.
+        """
+        if not self.user_expectations:
+            return []
+        columns = self.columns if self.columns is not None else read_columns(self.file_path, self.read_options)
+        # The evaluators of these expectations only read the column names, an empty frame is enough
+        validator = NativeDataValidator(pd.DataFrame(columns=columns))
+        mapper = ExpectationMapper(self.expectation_mapping_config_path)
+
+        results = []
+        for user_expectation in self.user_expectations:
+            for expectation in mapper.map_user_expectations([user_expectation]):
+                result = validator.evaluate_expectation(expectation)
+                result["action"] = user_expectation.get('action')
+                results.append(result)
+                logger.info(f"Schema check {user_expectation['name']}: "
+                            f"{'passed' if result['success'] else 'failed'} on {len(columns)} column(s)")
+        return results
+
+    @staticmethod
+    def describe(result: dict) -> str:
+        config = result["expectation_config"]
+        return f"{config['type']} {json.dumps(config['kwargs'], default=str)}"
@@ -4,3 +4,25 @@ CONFIG_YAML_PATH = 'src/config/expectation_mapping_config.yaml'
 S3_REGION = 'us-east-1'
 BUCKET_NAME = 'ps-test-data-platform-extracts'
 DATA_QUALITY_PATH = 'data_quality/error_records'
+DEFAULT_CHUNK_SIZE = 100000
+SKETCH_QUANTILE_ERROR = 0.005  # KLL rank error for streamed median/quantile expectations
+SKETCH_DISTINCT_ERROR = 0.01  # HyperLogLog relative error for streamed distinct counts
+DOCS_COALESCE_SECONDS = 2.0  # quiet period before a background Data Docs rebuild
+PARTIAL_UNEXPECTED_COUNT = 20  # unexpected values/indices kept in partial_* result lists (GX default)
+ACTION_RESULT_FORMATS = {'skip': 'COMPLETE', 'failure': 'BOOLEAN_ONLY'}  # result detail per YAML action
+DEFAULT_RESULT_FORMAT = 'SUMMARY'  # result detail for report-only expectations (no action)
+FILE_CHECK_DEFAULT_ACTION = 'skip'  # action of a failed file check without one: 'skip' the file or 'abort' the job
+DEFAULT_BATCH_WORKERS = 4  # worker processes of the multi-file batch runner
+COMPRESSION_BLOCK_SIZE = 1024 * 1024  # decompressed bytes read per block when verifying/streaming archives
+COMPRESSION_CHECK_WORKERS = 4  # zip members CRC-checked in parallel
+FORMAT_SNIFF_BYTES = 64 * 1024  # bytes sampled per file to detect its format from content
+SCHEMA_YAML_PATH = 'src/config/schemas.yaml'
+S3_PART_SIZE = 8 * 1024 * 1024  # bytes per multipart part when streaming records to S3 (S3 minimum: 5 MiB)
+S3_INVALID_ROWS_FORMAT = 'csv'  # encoding of the invalid rows uploaded to S3: csv, csv.gz or parquet
+OUTPUT_QUEUE_SIZE = 8  # invalid-row batches queued per output sink before submitting blocks
+WATERMARK_DIR = 'data_quality/watermarks'  # local directory of the incremental-validation watermarks and state
+WATERMARK_CHECK_BYTES = 64 * 1024  # bytes at the start and before the watermark re-hashed to detect a rewritten file
+RESULT_CACHE_DIR = 'data_quality/result_cache'  # local directory of the validation result cache
+RESULT_CACHE_MAX_BYTES = 512 * 1024 * 1024  # size bound of the result cache directory (LRU eviction beyond it)
+SQL_BACKEND = 'auto'  # embedded engine of the SQL pushdown validator: 'duckdb', 'sqlite' or 'auto' (DuckDB when installed)
+METRIC_CACHE_MAX_BYTES = 256 * 1024 * 1024  # memory budget of the run-scoped per-column metric cache (LRU eviction beyond it)
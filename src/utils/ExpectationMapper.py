@@ -1,257 +1,155 @@
 import logging
-from typing import List
+import os
+from typing import Callable, Dict, List
 
 import great_expectations.expectations as gxe
 import yaml
 
+from src.utils.file_utils import fingerprint_config, fingerprint_file
+from src.utils.result_format import action_result_format
+
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+# Keys of a user expectation entry that are handled by the pipeline, not passed to GX
+RESERVED_KEYS = ('name', 'action')
+
+# User YAML key -> GX kwarg, for every expectation
+COMMON_KWARG_ALIASES = {
+    'min': 'min_value',
+    'max': 'max_value',
+    'type': 'type_',
+    'types': 'type_list',
+    'values': 'value_set',
+}
+
+# User YAML key -> GX kwarg, per expectation (takes precedence over COMMON_KWARG_ALIASES)
+KWARG_ALIASES = {
+    'ExpectTableColumnsToMatchOrderedList': {'columns': 'column_list'},
+    'ExpectTableColumnsToMatchSet': {'columns': 'column_set'},
+    'ExpectCompoundColumnsToBeUnique': {'columns': 'column_list'},
+    'ExpectSelectColumnValuesToBeUniqueWithinRecord': {'columns': 'column_list'},
+    'ExpectMulticolumnSumToEqual': {'columns': 'column_list', 'value': 'sum_total'},
+    'ExpectColumnQuantileValuesToBeBetween': {'quantile_values': 'quantile_ranges'},
+    'ExpectColumnValueLengthsToEqual': {'length': 'value'},
+    'ExpectTableRowCountToEqual': {'count': 'value'},
+    'ExpectColumnValueZScoresToBeLessThan': {'value': 'threshold'},
+    'ExpectColumnKLDivergenceToBeLessThan': {'value': 'threshold'},
+    'ExpectColumnPairValuesToBeInSet': {'values': 'value_pairs_set'},
+}
+
+# (mapping config fingerprint, user expectations fingerprint) -> mapped expectations
+_PLAN_CACHE: Dict[tuple, List[gxe.Expectation]] = {}
+# (mapping config path, mtime, size) -> (content fingerprint, master config, compiled builders)
+_MASTER_CONFIG_CACHE: Dict[tuple, tuple] = {}
+
+
+def clear_mapping_cache() -> None:
+    """Drops the compiled master configs and mapped expectation plans cached in this process."""
+    _PLAN_CACHE.clear()
+    _MASTER_CONFIG_CACHE.clear()
+
+
+def expectation_builder(name: str, expectation_class: type) -> Callable[[dict], gxe.Expectation]:
+    """
+    Compiles the constructor for one expectation name: resolves the user YAML keys to GX kwargs once,
+    so mapping an entry is a dict translation plus the GX constructor call.
+
+    :param name: The expectation name used in the user YAML.
+    :param expectation_class: The Great Expectations expectation class to build.
+    :return: A function building the expectation from a user expectation entry.
+    """
+    aliases = {**COMMON_KWARG_ALIASES, **KWARG_ALIASES.get(name, {})}
+    fields = set(expectation_class.__fields__)
+    # Only translate aliases the class actually accepts, e.g. 'value' stays 'value' for LengthsToEqual's GX kwarg
+    key_map = {key: kwarg for key, kwarg in aliases.items() if kwarg in fields}
+
+    def build(user_expectation: dict) -> gxe.Expectation:
+        kwargs = {}
+        for key, value in user_expectation.items():
+            if key in RESERVED_KEYS:
+                continue
+            kwarg = key_map.get(key, key)
+            if kwarg not in fields:
+                logger.warning(f"Ignoring unknown key '{key}' for expectation: {name}")
+                continue
+            kwargs[kwarg] = value
+        # Only as much result detail as the action consumes, unless the YAML sets result_format itself
+        kwargs.setdefault('result_format', action_result_format(user_expectation.get('action')))
+        return expectation_class(**kwargs)
+
+    return build
+
 
 class ExpectationMapper:
     def __init__(self, master_yaml_path: str):
         """Initialize with the path to the master YAML configuration for expectations."""
         self.master_yaml_path = master_yaml_path
-        self.master_config = self.load_master_config()
+        # The file is only read and hashed again once it changes on disk
+        stat = os.stat(master_yaml_path)
+        cache_key = (os.path.abspath(master_yaml_path), stat.st_mtime_ns, stat.st_size)
+        cached = _MASTER_CONFIG_CACHE.get(cache_key)
+        if cached is None:
+            master_config = self.load_master_config()
+            cached = (fingerprint_file(master_yaml_path), master_config, self.compile_builders(master_config))
+            _MASTER_CONFIG_CACHE[cache_key] = cached
+        self.master_fingerprint, self.master_config, self.builders = cached
 
     def load_master_config(self) -> dict:
         """Load the master YAML configuration for expectations."""
         with open(self.master_yaml_path, 'r') as file:
             return yaml.safe_load(file)
 
+    @staticmethod
+    def compile_builders(master_config: dict) -> Dict[str, Callable[[dict], gxe.Expectation]]:
+        """Resolves every expectation name of the master config to its GX constructor, once."""
+        builders = {}
+        for name, expectation_config in master_config['expectation_mapping'].items():
+            class_name = (expectation_config or {}).get('class', name)
+            expectation_class = getattr(gxe, class_name, None)
+            if expectation_class is None:
+                logger.error(f"Unknown Great Expectations class '{class_name}' for expectation: {name}")
+                continue
+            builders[name] = expectation_builder(name, expectation_class)
+        return builders
+
     def map_user_expectations(self, user_expectations: List[dict]) -> List[gxe.Expectation]:
-        """Maps the user expectations from the YAML input to Great Expectations expectations."""
+        """
+        Maps the user expectations from the YAML input to Great Expectations expectations.
+        The mapped list is cached per (mapping config, user expectations) content, so repeat calls
+        only copy the cached expectations (GX assigns ids to the instances it is given).
+        """
+        plan_key = (self.master_fingerprint, fingerprint_config(user_expectations))
+        plan = _PLAN_CACHE.get(plan_key)
+        if plan is None:
+            plan = self.compile_plan(user_expectations)
+            _PLAN_CACHE[plan_key] = plan
+        else:
+            logger.info(f"Reusing {len(plan)} mapped expectations from cache.")
+        return [expectation.copy() for expectation in plan]
+
+    def compile_plan(self, user_expectations: List[dict]) -> List[gxe.Expectation]:
+        """
+        Builds the GX expectations for the user entries, one registry lookup per entry.
+        Raises ValueError listing every entry with missing or invalid arguments, so a typo in the
+        YAML cannot silently drop a check.
+        """
         mapped_expectations = []
-        for user_expectation in user_expectations:
+        errors = []
+        for position, user_expectation in enumerate(user_expectations):
             name = user_expectation['name']
-            if name in self.master_config['expectation_mapping']:
-                # Get the corresponding expectation config
-                expectation_config = self.master_config['expectation_mapping'][name]
-
-                # Dynamically create the corresponding Great Expectations expectation
-                if name == "ExpectColumnValuesToBeNull":
-                    column = user_expectation['column']
-                    mapped_expectations.append(gxe.ExpectColumnValuesToBeNull(column=column))
-                    logger.info(f"Mapped expectation: {name} for column {column}")
-
-                elif name == "ExpectColumnValuesToNotBeNull":
-                    column = user_expectation['column']
-                    mapped_expectations.append(gxe.ExpectColumnValuesToNotBeNull(column=column))
-                    logger.info(f"Mapped expectation: {name} for column {column}")
-
-                elif name == "ExpectColumnToExist":
-                    column = user_expectation['column']
-                    mapped_expectations.append(gxe.ExpectColumnToExist(column=column))
-                    logger.info(f"Mapped expectation: {name} for column {column}")
-
-                elif name == "ExpectColumnValuesToBeOfType":
-                    column = user_expectation['column']
-                    column_type = user_expectation['type']
-                    mapped_expectations.append(gxe.ExpectColumnValuesToBeOfType(column=column, type_=column_type))
-                    logger.info(f"Mapped expectation: {name} for column {column} with type {column_type}")
-
-                elif name == "ExpectColumnValuesToBeInTypeList":
-                    column = user_expectation['column']
-                    type_list = user_expectation['type_list']
-                    mapped_expectations.append(gxe.ExpectColumnValuesToBeInTypeList(column=column, type_list=type_list))
-                    logger.info(f"Mapped expectation: {name} for column {column} with types {type_list}")
-
-                elif name == "ExpectTableColumnCountToBeBetween":
-                    min_column_count = user_expectation['min']
-                    max_column_count = user_expectation['max']
-                    mapped_expectations.append(gxe.ExpectTableColumnCountToBeBetween(min_column_count=min_column_count,
-                                                                                     max_column_count=max_column_count))
-                    logger.info(f"Mapped expectation: {name} with min: {min_column_count}, max: {max_column_count}")
-
-                elif name == "ExpectTableColumnsToMatchOrderedList":
-                    column_list = user_expectation['columns']
-                    mapped_expectations.append(gxe.ExpectTableColumnsToMatchOrderedList(columns=column_list))
-                    logger.info(f"Mapped expectation: {name} for columns {column_list}")
-
-                elif name == "ExpectTableColumnsToMatchSet":
-                    column_set = user_expectation['columns']
-                    mapped_expectations.append(gxe.ExpectTableColumnsToMatchSet(columns=column_set))
-                    logger.info(f"Mapped expectation: {name} for columns {column_set}")
-
-                # --- Uniqueness Expectations ---
-                elif name == "ExpectColumnDistinctValuesToBeInSet":
-                    column = user_expectation['column']
-                    value_set = user_expectation['value_set']
-                    mapped_expectations.append(
-                        gxe.ExpectColumnDistinctValuesToBeInSet(column=column, value_set=value_set))
-                    logger.info(f"Mapped expectation: {name} for column {column} with set {value_set}")
-
-                elif name == "ExpectColumnDistinctValuesToContainSet":
-                    column = user_expectation['column']
-                    value_set = user_expectation['value_set']
-                    mapped_expectations.append(
-                        gxe.ExpectColumnDistinctValuesToContainSet(column=column, value_set=value_set))
-                    logger.info(f"Mapped expectation: {name} for column {column} with set {value_set}")
-
-                elif name == "ExpectColumnDistinctValuesToEqualSet":
-                    column = user_expectation['column']
-                    value_set = user_expectation['value_set']
-                    mapped_expectations.append(
-                        gxe.ExpectColumnDistinctValuesToEqualSet(column=column, value_set=value_set))
-                    logger.info(f"Mapped expectation: {name} for column {column} with set {value_set}")
-
-                elif name == "ExpectColumnProportionOfUniqueValuesToBeBetween":
-                    column = user_expectation['column']
-                    min_value = user_expectation['min']
-                    max_value = user_expectation['max']
-                    mapped_expectations.append(
-                        gxe.ExpectColumnProportionOfUniqueValuesToBeBetween(column=column, min_value=min_value,
-                                                                            max_value=max_value))
-                    logger.info(f"Mapped expectation: {name} for column {column} with range ({min_value}, {max_value})")
-
-                elif name == "ExpectColumnUniqueValueCountToBeBetween":
-                    column = user_expectation['column']
-                    min_count = user_expectation['min']
-                    max_count = user_expectation['max']
-                    mapped_expectations.append(
-                        gxe.ExpectColumnUniqueValueCountToBeBetween(column=column, min_count=min_count,
-                                                                    max_count=max_count))
-                    logger.info(
-                        f"Mapped expectation: {name} for column {column} with count range ({min_count}, {max_count})")
-
-                elif name == "ExpectColumnValuesToBeUnique":
-                    column = user_expectation['column']
-                    mapped_expectations.append(gxe.ExpectColumnValuesToBeUnique(column=column))
-                    logger.info(f"Mapped expectation: {name} for column {column}")
-
-                elif name == "ExpectCompoundColumnsToBeUnique":
-                    columns = user_expectation['columns']
-                    mapped_expectations.append(gxe.ExpectCompoundColumnsToBeUnique(columns=columns))
-                    logger.info(f"Mapped expectation: {name} for columns {columns}")
-
-                elif name == "ExpectSelectColumnValuesToBeUniqueWithinRecord":
-                    columns = user_expectation['columns']
-                    mapped_expectations.append(gxe.ExpectSelectColumnValuesToBeUniqueWithinRecord(columns=columns))
-                    logger.info(f"Mapped expectation: {name} for columns {columns}")
-
-                # --- Validity Expectations ---
-                elif name == "ExpectColumnMostCommonValueToBeInSet":
-                    column = user_expectation['column']
-                    value_set = user_expectation['value_set']
-                    mapped_expectations.append(
-                        gxe.ExpectColumnMostCommonValueToBeInSet(column=column, value_set=value_set))
-                    logger.info(f"Mapped expectation: {name} for column {column} with set {value_set}")
-
-                elif name == "ExpectColumnPairValuesToBeEqual":
-                    column_A = user_expectation['column_A']
-                    column_B = user_expectation['column_B']
-                    mapped_expectations.append(
-                        gxe.ExpectColumnPairValuesToBeEqual(column_A=column_A, column_B=column_B))
-                    logger.info(f"Mapped expectation: {name} for columns {column_A}, {column_B}")
-
-                # --- Numeric Expectations ---
-                elif name == "ExpectColumnMaxToBeBetween":
-                    column = user_expectation['column']
-                    min_value = user_expectation['min']
-                    max_value = user_expectation['max']
-                    mapped_expectations.append(
-                        gxe.ExpectColumnMaxToBeBetween(column=column, min_value=min_value, max_value=max_value))
-                    logger.info(f"Mapped expectation: {name} for column {column} with range ({min_value}, {max_value})")
-
-                elif name == "ExpectColumnMeanToBeBetween":
-                    column = user_expectation['column']
-                    min_value = user_expectation['min']
-                    max_value = user_expectation['max']
-                    mapped_expectations.append(
-                        gxe.ExpectColumnMeanToBeBetween(column=column, min_value=min_value, max_value=max_value))
-                    logger.info(f"Mapped expectation: {name} for column {column} with range ({min_value}, {max_value})")
-
-                elif name == "ExpectColumnMedianToBeBetween":
-                    column = user_expectation['column']
-                    min_value = user_expectation['min']
-                    max_value = user_expectation['max']
-                    mapped_expectations.append(
-                        gxe.ExpectColumnMedianToBeBetween(column=column, min_value=min_value, max_value=max_value))
-                    logger.info(f"Mapped expectation: {name} for column {column} with range ({min_value}, {max_value})")
-
-                elif name == "ExpectColumnMinToBeBetween":
-                    column = user_expectation['column']
-                    min_value = user_expectation['min']
-                    max_value = user_expectation['max']
-                    mapped_expectations.append(
-                        gxe.ExpectColumnMinToBeBetween(column=column, min_value=min_value, max_value=max_value))
-                    logger.info(f"Mapped expectation: {name} for column {column} with range ({min_value}, {max_value})")
-
-                elif name == "ExpectColumnQuantileValuesToBeBetween":
-                    column = user_expectation['column']
-                    quantile_values = user_expectation['quantile_values']
-                    mapped_expectations.append(
-                        gxe.ExpectColumnQuantileValuesToBeBetween(column=column, quantile_values=quantile_values))
-                    logger.info(f"Mapped expectation: {name} for column {column} with quantiles {quantile_values}")
-
-                elif name == "ExpectColumnStdevToBeBetween":
-                    column = user_expectation['column']
-                    min_value = user_expectation['min']
-                    max_value = user_expectation['max']
-                    mapped_expectations.append(
-                        gxe.ExpectColumnStdevToBeBetween(column=column, min_value=min_value, max_value=max_value))
-                    logger.info(f"Mapped expectation: {name} for column {column} with range ({min_value}, {max_value})")
-
-                elif name == "ExpectColumnSumToBeBetween":
-                    column = user_expectation['column']
-                    min_value = user_expectation['min']
-                    max_value = user_expectation['max']
-                    mapped_expectations.append(
-                        gxe.ExpectColumnSumToBeBetween(column=column, min_value=min_value, max_value=max_value))
-                    logger.info(f"Mapped expectation: {name} for column {column} with range ({min_value}, {max_value})")
-
-                elif name == "ExpectColumnValueZScoresToBeLessThan":
-                    column = user_expectation['column']
-                    threshold = user_expectation['threshold']
-                    mapped_expectations.append(
-                        gxe.ExpectColumnValueZScoresToBeLessThan(column=column, threshold=threshold))
-                    logger.info(f"Mapped expectation: {name} for column {column} with threshold {threshold}")
-
-                elif name == "ExpectColumnValuesToBeBetween":
-                    column = user_expectation['column']
-                    min_value = user_expectation['min']
-                    max_value = user_expectation['max']
-                    mapped_expectations.append(
-                        gxe.ExpectColumnValuesToBeBetween(column=column, min_value=min_value, max_value=max_value))
-                    logger.info(f"Mapped expectation: {name} for column {column} with range ({min_value}, {max_value})")
-
-                elif name == "ExpectColumnValuesToBeInSet":
-                    column = user_expectation['column']
-                    value_set = user_expectation['value_set']
-                    mapped_expectations.append(gxe.ExpectColumnValuesToBeInSet(column=column, value_set=value_set))
-                    logger.info(f"Mapped expectation: {name} for column {column} with set {value_set}")
-
-                elif name == "ExpectColumnValuesToNotBeInSet":
-                    column = user_expectation['column']
-                    value_set = user_expectation['value_set']
-                    mapped_expectations.append(gxe.ExpectColumnValuesToNotBeInSet(column=column, value_set=value_set))
-                    logger.info(f"Mapped expectation: {name} for column {column} with set {value_set}")
-
-                elif name == "ExpectMulticolumnSumToEqual":
-                    columns = user_expectation['columns']
-                    value = user_expectation['value']
-                    mapped_expectations.append(gxe.ExpectMulticolumnSumToEqual(columns=columns, value=value))
-                    logger.info(f"Mapped expectation: {name} for columns {columns} with value {value}")
-
-                elif name == "ExpectColumnValueLengthsToBeBetween":
-                    column = user_expectation.get('column')
-                    min_length = user_expectation.get('min')
-                    max_length = user_expectation.get('max')
-
-                    # Check if all required keys are present
-                    if column and min_length is not None and max_length is not None:
-                        mapped_expectations.append(
-                            gxe.ExpectColumnValueLengthsToBeBetween(column=column, min_value=min_length,
-                                                                    max_value=max_length)
-                        )
-                        logger.info(
-                            f"Mapped expectation: {name} for column {column} with length range ({min_length}, {max_length})")
-                    else:
-                        if not column:
-                            logger.error(f"Missing 'column' for expectation: {name}")
-                        if min_length is None:
-                            logger.error(f"Missing 'min' for expectation: {name}")
-                        if max_length is None:
-                            logger.error(f"Missing 'max' for expectation: {name}")
-
+            builder = self.builders.get(name)
+            if builder is None:
+                logger.warning(f"Expectation '{name}' is not in the expectation mapping config, skipping it.")
+                continue
+            try:
+                expectation = builder(user_expectation)
+            except Exception as e:
+                logger.error(f"Invalid arguments for expectation {name}: {e}")
+                errors.append(f"expectation {position} ({name}): {e}")
+                continue
+            mapped_expectations.append(expectation)
+            logger.info(f"Mapped expectation: {name} with {expectation.configuration.kwargs}")
+        if errors:
+            raise ValueError("Invalid user expectations:\n" + "\n".join(errors))
         return mapped_expectations
@@ -0,0 +1,218 @@
+import gzip
+import io
+import os
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config.settings import COMPRESSION_BLOCK_SIZE, COMPRESSION_CHECK_WORKERS
+
+COMPRESSED_EXTENSIONS = ('.gz', '.zip')
+
+
+def integrity_report(file_path: str, bytes_processed: int, start: float, error: str = None,
+                     truncated: bool = False, members: int = None) -> dict:
+    """Builds the outcome of an integrity check, with the decompression throughput."""
+    seconds = time.monotonic() - start
+    return {
+        "valid": error is None,
+        "error": error,
+        "truncated": truncated,
+        "members": members,
+        "compressed_bytes": os.path.getsize(file_path),
+        "bytes_processed": bytes_processed,
+        "seconds": round(seconds, 3),
+        "throughput_mb_s": round(bytes_processed / (1024 * 1024) / seconds, 2) if seconds > 0 else None,
+    }
+
+
+def verify_gzip(file_path: str, block_size: int = COMPRESSION_BLOCK_SIZE) -> dict:
+    """
+    Decompresses a gzip file block by block (constant memory) and checks every member's CRC and size.
+    A stream that ends before its end-of-stream marker is reported as truncated.
+
+    :param file_path: The path to the gzip file.
+    :param block_size: Decompressed bytes read per block.
+    :return: Integrity report (see `integrity_report`).
+    """
+    start = time.monotonic()
+    bytes_processed = 0
+    try:
+        with gzip.open(file_path, 'rb') as file:
+            while True:
+                block = file.read(block_size)
+                if not block:
+                    break
+                bytes_processed += len(block)
+    except EOFError as e:
+        return integrity_report(file_path, bytes_processed, start, error=f"Truncated gzip stream: {e}", truncated=True)
+    except (gzip.BadGzipFile, zlib.error, OSError) as e:
+        return integrity_report(file_path, bytes_processed, start, error=str(e))
+    return integrity_report(file_path, bytes_processed, start)
+
+
+def _verify_zip_member(file_path: str, member: zipfile.ZipInfo, block_size: int) -> int:
+    # Own handle per thread: a ZipFile shares one file position between its readers
+    with zipfile.ZipFile(file_path, 'r') as archive:
+        with archive.open(member, 'r') as stream:
+            # ZipExtFile checks the CRC-32 once the member has been read to the end
+            total = 0
+            while True:
+                block = stream.read(block_size)
+                if not block:
+                    return total
+                total += len(block)
+
+
+def verify_zip(file_path: str, block_size: int = COMPRESSION_BLOCK_SIZE,
+               workers: int = COMPRESSION_CHECK_WORKERS) -> dict:
+    """
+    Verifies the CRC of every zip member, streaming each one in blocks; members are checked in
+    parallel threads (zlib releases the GIL while inflating).
+
+    :param file_path: The path to the zip file.
+    :param block_size: Decompressed bytes read per block.
+    :param workers: Number of members verified concurrently.
+    :return: Integrity report (see `integrity_report`).
+    """
+    start = time.monotonic()
+    try:
+        with zipfile.ZipFile(file_path, 'r') as archive:
+            members = [member for member in archive.infolist() if not member.is_dir()]
+    except (zipfile.BadZipFile, OSError) as e:
+        # A missing central directory is what a truncated upload looks like
+        return integrity_report(file_path, 0, start, error=str(e), truncated=True)
+
+    bytes_processed = 0
+    errors = []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(members)))) as executor:
+        futures = {executor.submit(_verify_zip_member, file_path, member, block_size): member
+                   for member in members}
+        for future, member in futures.items():
+            try:
+                bytes_processed += future.result()
+            except EOFError as e:
+                errors.append((member.filename, f"truncated: {e}"))
+            except (zipfile.BadZipFile, zlib.error, OSError, NotImplementedError) as e:
+                errors.append((member.filename, str(e)))
+
+    error = "; ".join(f"{name}: {message}" for name, message in errors) or None
+    truncated = any(message.startswith("truncated") for _, message in errors)
+    return integrity_report(file_path, bytes_processed, start, error=error, truncated=truncated,
+                            members=len(members))
+
+
+def is_compressed(file_path: str) -> bool:
+    """Whether the file is a gzip or zip archive, judged by its extension."""
+    return file_path.lower().endswith(COMPRESSED_EXTENSIONS)
+
+
+class CountingReader(io.RawIOBase):
+    """
+    Raw binary stream over a decompressing reader that counts the decompressed bytes and keeps the
+    integrity error (truncation, bad CRC) raised while a parser consumes it.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.bytes_read = 0
+        self.error = None
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        try:
+            data = self.stream.read(len(buffer))
+        except Exception as e:
+            self.error = e
+            raise
+        buffer[:len(data)] = data
+        self.bytes_read += len(data)
+        return len(data)
+
+    def drain(self, block_size: int = COMPRESSION_BLOCK_SIZE) -> None:
+        """Reads whatever the parser left (e.g. with `nrows`) so the end-of-stream CRC is still checked."""
+        try:
+            while True:
+                block = self.stream.read(block_size)
+                if not block:
+                    return
+                self.bytes_read += len(block)
+        except Exception as e:
+            self.error = e
+
+
+def integrity_error(error: Exception):
+    """Splits an exception raised while decompressing into (message, truncated)."""
+    if isinstance(error, EOFError):
+        return f"Truncated stream: {error}", True
+    return str(error), False
+
+
+def parse_stream(stream, parse, block_size: int = COMPRESSION_BLOCK_SIZE):
+    """
+    Feeds one decompressed stream to `parse(binary_file)` and verifies its integrity in the same pass.
+    Returns (parsed or None, decompressed bytes, integrity error or None, truncated, parse error or None).
+    """
+    reader = CountingReader(stream)
+    parsed = parse_error = None
+    try:
+        parsed = parse(io.BufferedReader(reader, buffer_size=block_size))
+    except Exception as e:
+        if reader.error is None:
+            parse_error = e
+    if reader.error is None:
+        reader.drain(block_size)
+    error, truncated = integrity_error(reader.error) if reader.error is not None else (None, False)
+    return parsed, reader.bytes_read, error, truncated, parse_error
+
+
+def _parse_zip_member(file_path: str, member: zipfile.ZipInfo, parse, block_size: int):
+    with zipfile.ZipFile(file_path, 'r') as archive:
+        with archive.open(member, 'r') as stream:
+            return parse_stream(stream, parse, block_size)
+
+
+def decompress_and_parse(file_path: str, parse, block_size: int = COMPRESSION_BLOCK_SIZE,
+                         workers: int = COMPRESSION_CHECK_WORKERS):
+    """
+    Single-pass pipeline for compressed inputs: the compressed bytes are decompressed once, and the
+    same stream is both integrity-checked and fed to the parser. Zip members are handled in
+    parallel threads, one stream per member.
+
+    :param file_path: The path to the .gz or .zip file.
+    :param parse: Function parsing a binary file object (e.g. `lambda f: pd.read_csv(f)`).
+    :param block_size: Decompressed bytes read per block.
+    :param workers: Number of zip members processed concurrently.
+    :return: (list of parsed members in archive order, integrity report with a "parse_error" entry).
+        The list is None when the archive is corrupt or a member could not be parsed.
+    """
+    start = time.monotonic()
+    if file_path.lower().endswith('.gz'):
+        try:
+            with gzip.open(file_path, 'rb') as stream:
+                outcomes, members = [parse_stream(stream, parse, block_size)], None
+        except OSError as e:
+            return None, {**integrity_report(file_path, 0, start, error=str(e)), "parse_error": None}
+    else:
+        try:
+            with zipfile.ZipFile(file_path, 'r') as archive:
+                entries = [member for member in archive.infolist() if not member.is_dir()]
+        except (zipfile.BadZipFile, OSError) as e:
+            return None, {**integrity_report(file_path, 0, start, error=str(e), truncated=True), "parse_error": None}
+        members = len(entries)
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, members))) as executor:
+            outcomes = list(executor.map(lambda member: _parse_zip_member(file_path, member, parse, block_size),
+                                         entries))
+
+    errors = [error for _, _, error, _, _ in outcomes if error]
+    parse_errors = [str(parse_error) for _, _, _, _, parse_error in outcomes if parse_error is not None]
+    report = integrity_report(file_path, sum(outcome[1] for outcome in outcomes), start,
+                              error="; ".join(errors) or None,
+                              truncated=any(outcome[3] for outcome in outcomes), members=members)
+    report["parse_error"] = "; ".join(parse_errors) or None
+    if errors or parse_errors:
+        return None, report
+    return [outcome[0] for outcome in outcomes], report
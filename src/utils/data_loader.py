@@ -1,4 +1,31 @@
+import io
+from typing import List, Optional, Tuple
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+from src.config.settings import DEFAULT_CHUNK_SIZE, SCHEMA_YAML_PATH
+from src.utils.compression import decompress_and_parse
+from src.utils.file_utils import load_yaml_config
+from src.utils.watermarks import ByteRangeReader
+
+# Arrow type of each schema type; "object" is parsed as string and converted to Python objects
+SCHEMA_TYPES = {
+    "int64": pa.int64(),
+    "float64": pa.float64(),
+    "bool": pa.bool_(),
+    "string": pa.string(),
+    "category": pa.dictionary(pa.int32(), pa.string()),
+    "object": pa.string(),
+}
+
+# Expectations that look at every column of the table: with one of them, no column projection is done
+TABLE_SHAPE_EXPECTATIONS = (
+    "ExpectTableColumnCountToBeBetween",
+    "ExpectTableColumnsToMatchOrderedList",
+    "ExpectTableColumnsToMatchSet",
+)
 
 
 def load_data_as_pd(file_path):
@@ -11,3 +38,123 @@ def load_data_as_pd(file_path):
     except Exception as e:
         print(f"Error loading data: {str(e)}")
         return None
+
+
+def load_data_in_chunks(file_path, chunk_size: int = DEFAULT_CHUNK_SIZE, byte_range: Tuple[int, int] = None,
+                        first_row: int = 0, **read_options):
+    """
+    Lazily load a CSV file as DataFrames of at most `chunk_size` rows.
+    `read_options` are passed to `pd.read_csv` (e.g. header=None, names=[...], dtype={...}).
+    Chunks keep a RangeIndex continuing across the file, starting at `first_row`.
+    With `byte_range` (start, end) only those bytes are parsed, e.g. the rows appended since a watermark.
+    """
+    if byte_range is None:
+        source = file_path
+    elif byte_range[0] >= byte_range[1]:
+        return
+    else:
+        source = io.BufferedReader(ByteRangeReader(file_path, *byte_range))
+    try:
+        with pd.read_csv(source, chunksize=chunk_size, **read_options) as reader:
+            for chunk in reader:
+                if first_row:
+                    chunk.index += first_row
+                yield chunk
+    finally:
+        if byte_range is not None:
+            source.close()
+
+
+def load_compressed_data(file_path, **read_options):
+    """
+    Load a .gz or .zip CSV in a single decompression pass: the same decompressed stream is
+    integrity-checked (CRC, truncation) and parsed. Zip members are concatenated in archive order.
+    `read_options` are passed to `pd.read_csv`.
+    Returns (DataFrame or None when the archive is corrupt / unparsable, integrity report); the report
+    can be handed to `FileValidator` so the compression check does not decompress the file again.
+    """
+    frames, report = decompress_and_parse(file_path, lambda stream: pd.read_csv(stream, **read_options))
+    if frames is None:
+        return None, report
+    data = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    return data, report
+
+
+def load_process_schema(process_id: str, schema_path: str = SCHEMA_YAML_PATH) -> Optional[dict]:
+    """Returns the declarative input schema of a process from the schema YAML, or None if it has none."""
+    return (load_yaml_config(schema_path).get('schemas') or {}).get(process_id)
+
+
+def referenced_columns(user_expectations: List[dict], consumer_columns: List[str] = None,
+                       schema_columns: List[str] = None) -> Optional[List[str]]:
+    """
+    Columns the configured expectations and the downstream consumer need, in first-use order.
+    Returns None (load everything) when an expectation depends on the full set of columns.
+    With `schema_columns`, columns outside the schema are left out, so e.g. an ExpectColumnToExist
+    on such a column fails on the loaded frame instead of failing the load.
+    """
+    columns = []
+    for expectation in user_expectations:
+        if expectation['name'] in TABLE_SHAPE_EXPECTATIONS:
+            return None
+        for key in ('column', 'column_A', 'column_B'):
+            if expectation.get(key):
+                columns.append(expectation[key])
+        columns.extend(expectation.get('columns') or [])
+    columns.extend(consumer_columns or [])
+    if schema_columns is not None:
+        columns = [column for column in columns if column in schema_columns]
+    return list(dict.fromkeys(columns))
+
+
+def schema_read_options(schema: dict) -> dict:
+    """`pd.read_csv` options reading a file of this schema with the same column names (e.g. for its header)."""
+    return {
+        'header': 0 if schema.get('header') else None,
+        'names': [column['name'] for column in schema['columns']],
+        'quotechar': schema.get('quotechar', '"'),
+        'sep': schema.get('delimiter', ','),
+    }
+
+
+def read_csv_with_schema(source, schema: dict, columns: List[str] = None) -> pd.DataFrame:
+    """
+    Parse a CSV (path or binary file object) with the pyarrow CSV reader into Arrow-backed pandas
+    columns, typed by the declarative `schema`; only `columns` (None: all) are decoded.
+    Category columns are dictionary-encoded; object columns become Python objects.
+    """
+    names = [column['name'] for column in schema['columns']]
+    types = {column['name']: column.get('type', 'string') for column in schema['columns']}
+    if columns is not None:
+        unknown = [column for column in columns if column not in types]
+        if unknown:
+            raise ValueError(f"Columns {unknown} are not in the schema.")
+
+    table = pa_csv.read_csv(
+        source,
+        read_options=pa_csv.ReadOptions(column_names=names, skip_rows=1 if schema.get('header') else 0),
+        parse_options=pa_csv.ParseOptions(quote_char=schema.get('quotechar', '"'),
+                                          delimiter=schema.get('delimiter', ',')),
+        convert_options=pa_csv.ConvertOptions(column_types={name: SCHEMA_TYPES[types[name]] for name in names},
+                                              include_columns=columns, strings_can_be_null=True),
+    )
+    data = table.to_pandas(types_mapper=pd.ArrowDtype)
+    for name in data.columns:
+        if types[name] == 'object':
+            data[name] = data[name].astype(object).where(data[name].notna(), None)
+    return data
+
+
+def load_data_with_schema(file_path, schema: dict, columns: List[str] = None):
+    """
+    Load a CSV (plain, .gz or .zip) with `read_csv_with_schema`. Compressed files go through the
+    single-pass decompress/verify/parse pipeline.
+    Returns (DataFrame or None, integrity report or None for uncompressed files).
+    """
+    if not str(file_path).lower().endswith(('.gz', '.zip')):
+        return read_csv_with_schema(file_path, schema, columns), None
+    frames, report = decompress_and_parse(file_path, lambda stream: read_csv_with_schema(stream, schema, columns))
+    if frames is None:
+        return None, report
+    data = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    return data, report
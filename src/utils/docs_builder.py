@@ -0,0 +1,124 @@
+import atexit
+import logging
+import threading
+import time
+from typing import List, Optional
+
+from src.config.settings import DOCS_COALESCE_SECONDS
+
+# Setup logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+
+class DataDocsBuilder:
+    """
+    Builds GX Data Docs on a background thread, off the validation critical path.
+
+    Build requests are coalesced: every request made while a build is pending or running
+    is folded into a single `context.build_data_docs()` call per context, issued once no new
+    request has arrived for `coalesce_seconds`. `flush()` blocks until the docs are built.
+    """
+
+    def __init__(self, coalesce_seconds: float = DOCS_COALESCE_SECONDS):
+        self.coalesce_seconds = coalesce_seconds
+        self.requests = 0
+        self.builds = 0
+        self.last_error = None
+        self._condition = threading.Condition()
+        # id(context) -> [context, site names or None for every site]
+        self._pending = {}
+        self._last_request = 0.0
+        self._building = False
+        self._thread = None
+
+    def request_build(self, context, site_names: Optional[List[str]] = None) -> None:
+        """
+        Schedules a Data Docs build for `context` and returns immediately.
+
+        :param context: The GX data context whose docs sites should be rebuilt.
+        :param site_names: Sites to build; None builds every configured site.
+        """
+        with self._condition:
+            self.requests += 1
+            self._last_request = time.monotonic()
+            entry = self._pending.get(id(context))
+            if entry is None:
+                self._pending[id(context)] = [context, None if site_names is None else set(site_names)]
+            elif entry[1] is not None:
+                entry[1] = None if site_names is None else entry[1] | set(site_names)
+
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="data-docs-builder", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                # Wait for a quiet period so bursts of requests collapse into one build
+                while self._pending:
+                    remaining = self._last_request + self.coalesce_seconds - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if not self._pending:
+                    self._thread = None
+                    self._condition.notify_all()
+                    return
+                pending, self._pending = list(self._pending.values()), {}
+                self._building = True
+
+            for context, site_names in pending:
+                self._build(context, site_names)
+
+            with self._condition:
+                self._building = False
+                self._condition.notify_all()
+
+    def _build(self, context, site_names) -> None:
+        try:
+            start = time.monotonic()
+            if site_names is None:
+                context.build_data_docs()
+            else:
+                context.build_data_docs(site_names=sorted(site_names))
+            self.builds += 1
+            logger.info(f"Data Docs built in {time.monotonic() - start:.2f}s.")
+        except Exception as e:
+            self.last_error = e
+            logger.error(f"Error while building Data Docs: {e}")
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Builds any pending docs now and waits for in-flight builds to finish.
+
+        :param timeout: Maximum seconds to wait; None waits indefinitely.
+        :return: True if no build is pending or running when the call returns.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            # Skip the rest of the quiet period, the caller needs the docs now
+            self._last_request = 0.0
+            self._condition.notify_all()
+            while self._pending or self._building:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+
+# Process-wide builder shared by every validator, flushed on interpreter exit
+docs_builder = DataDocsBuilder()
+atexit.register(docs_builder.flush)
+
+
+def request_data_docs_build(context, site_names: Optional[List[str]] = None) -> None:
+    """Schedules a coalesced background Data Docs build on the shared builder."""
+    docs_builder.request_build(context, site_names)
+
+
+def flush_data_docs(timeout: Optional[float] = None) -> bool:
+    """Waits until every requested Data Docs build has finished."""
+    return docs_builder.flush(timeout)
@@ -1,4 +1,6 @@
 import glob
+import hashlib
+import json
 import os
 
 import yaml
@@ -84,3 +86,29 @@ def load_yaml_config(file_path: str) -> dict:
     except:
         print("Invalid file YAML")
         raise ("Invalid file YAML")
+
+
+def fingerprint_config(*configs) -> str:
+    """
+    Returns a stable SHA-256 fingerprint of one or more parsed configs (dicts, lists, scalars).
+    Key order does not change the fingerprint.
+
+    :param configs: Objects to fingerprint together.
+    :return: Hex digest.
+    """
+    payload = json.dumps(configs, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def fingerprint_file(file_path: str) -> str:
+    """
+    Returns the SHA-256 fingerprint of a file's content.
+
+    :param file_path: The path to the file.
+    :return: Hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
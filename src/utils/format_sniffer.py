@@ -0,0 +1,148 @@
+import csv
+import gzip
+import json
+import os
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from src.config.settings import FORMAT_SNIFF_BYTES
+
+# Leading bytes of the binary formats we receive
+MAGIC_BYTES = {
+    b"PAR1": "parquet",
+    b"\x1f\x8b": "gzip",
+    b"PK\x03\x04": "zip",
+    b"PK\x05\x06": "zip",  # empty archive
+}
+
+# Extension ValidateFileFormat compares against for each detected format
+FORMAT_EXTENSIONS = {
+    "csv": ".csv",
+    "json": ".json",
+    "ndjson": ".json",
+    "parquet": ".parquet",
+}
+
+CSV_DELIMITERS = ",\t;|"
+
+
+def _is_parquet(file) -> bool:
+    # Parquet files start and end with PAR1; the 4 bytes before the trailing magic hold the footer length
+    file.seek(0, os.SEEK_END)
+    size = file.tell()
+    if size < 12:
+        return False
+    file.seek(size - 8)
+    footer = file.read(8)
+    return footer[4:] == b"PAR1" and int.from_bytes(footer[:4], "little") <= size - 12
+
+
+def is_parquet_file(file_path: str) -> bool:
+    """Whether the file is a Parquet file, judged by its leading and trailing magic bytes (12 bytes read)."""
+    with open(file_path, 'rb') as file:
+        return file.read(4) == b"PAR1" and _is_parquet(file)
+
+
+def _decompressed_sample(file_path: str, compression: str, sample_size: int) -> bytes:
+    """Decompresses only the first `sample_size` bytes of the (first member of the) archive."""
+    try:
+        if compression == "gzip":
+            with gzip.open(file_path, 'rb') as stream:
+                return stream.read(sample_size)
+        with zipfile.ZipFile(file_path, 'r') as archive:
+            members = [member for member in archive.infolist() if not member.is_dir()]
+            if not members:
+                return b""
+            with archive.open(members[0], 'r') as stream:
+                return stream.read(sample_size)
+    except (OSError, EOFError, zipfile.BadZipFile, zlib.error):
+        return b""
+
+
+def sniff_text(sample: bytes, truncated: bool = True) -> dict:
+    """
+    Classifies a text sample as JSON, NDJSON or delimited text (CSV), with the CSV dialect.
+
+    :param sample: The first bytes of the (decompressed) file.
+    :param truncated: Whether the sample may end in the middle of a line (the last line is then dropped).
+    :return: {"format", "delimiter", "quotechar", "has_header"}; format is "text" for text without
+        any delimiter (e.g. a single-column CSV, which only its extension can tell) and "unknown"
+        if nothing matches.
+    """
+    sniffed = {"format": "unknown", "delimiter": None, "quotechar": None, "has_header": None}
+    if b"\x00" in sample:
+        return sniffed
+    text = sample.decode("utf-8", errors="replace").lstrip("﻿")
+    lines = text.splitlines()
+    if truncated and len(lines) > 1 and not text.endswith(("\n", "\r")):
+        lines = lines[:-1]
+    lines = [line for line in lines if line.strip()]
+    if not lines:
+        return sniffed
+
+    first = lines[0].lstrip()
+    if first.startswith("{"):
+        try:
+            for line in lines:
+                json.loads(line)
+            sniffed["format"] = "ndjson"
+        except ValueError:
+            # A pretty-printed object spans several lines
+            sniffed["format"] = "json"
+        return sniffed
+    if first.startswith("["):
+        sniffed["format"] = "json"
+        return sniffed
+
+    body = "\n".join(lines)
+    try:
+        dialect = csv.Sniffer().sniff(body, delimiters=CSV_DELIMITERS)
+    except csv.Error:
+        if not any(delimiter in body for delimiter in CSV_DELIMITERS):
+            sniffed["format"] = "text"
+        return sniffed
+    sniffed.update(format="csv", delimiter=dialect.delimiter, quotechar=dialect.quotechar)
+    try:
+        sniffed["has_header"] = csv.Sniffer().has_header(body)
+    except csv.Error:
+        sniffed["has_header"] = None
+    return sniffed
+
+
+def sniff_file_format(file_path: str, sample_size: int = FORMAT_SNIFF_BYTES) -> dict:
+    """
+    Detects the format of a file from its content, reading only its magic bytes, the Parquet
+    footer or a text sample of `sample_size` bytes (decompressed, for gzip/zip archives).
+
+    :param file_path: The path to the file.
+    :param sample_size: Maximum number of (decompressed) bytes sampled.
+    :return: {"format", "compression", "extension", "delimiter", "quotechar", "has_header"}, where
+        format is csv, json, ndjson, parquet, text (undelimited) or unknown, compression is gzip, zip or None, and
+        extension is the one matching the detected format (None if unknown).
+    """
+    sniffed = {"format": "unknown", "compression": None, "delimiter": None, "quotechar": None, "has_header": None}
+    with open(file_path, 'rb') as file:
+        head = file.read(sample_size)
+        magic = next((name for prefix, name in MAGIC_BYTES.items() if head.startswith(prefix)), None)
+        if magic == "parquet" and _is_parquet(file):
+            sniffed["format"] = "parquet"
+        elif magic in ("gzip", "zip"):
+            sniffed["compression"] = magic
+        elif magic is None:
+            sniffed.update(sniff_text(head, truncated=len(head) == sample_size))
+
+    if sniffed["compression"]:
+        sample = _decompressed_sample(file_path, sniffed["compression"], sample_size)
+        sniffed.update(sniff_text(sample, truncated=len(sample) == sample_size))
+
+    sniffed["extension"] = FORMAT_EXTENSIONS.get(sniffed["format"])
+    return sniffed
+
+
+def sniff_file_formats(file_paths: List[str], sample_size: int = FORMAT_SNIFF_BYTES,
+                       workers: int = 16) -> Dict[str, dict]:
+    """Classifies many files concurrently (I/O bound: a few KB read per file)."""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(file_paths, executor.map(lambda path: sniff_file_format(path, sample_size), file_paths)))
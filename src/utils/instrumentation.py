@@ -0,0 +1,178 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Setup logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# OpenMetrics gauges written per stage / expectation: metric name -> (event key, help text)
+STAGE_METRICS = {
+    "data_quality_stage_wall_seconds": ("wall_seconds", "Wall-clock time of the stage"),
+    "data_quality_stage_cpu_seconds": ("cpu_seconds", "CPU time of the process during the stage"),
+    "data_quality_stage_rows": ("rows", "Rows processed by the stage"),
+    "data_quality_stage_rows_per_second": ("rows_per_second", "Rows processed per wall-clock second"),
+    "data_quality_stage_peak_rss_bytes": ("peak_rss_bytes", "Peak resident set size of the process at the end of the stage"),
+}
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """High-water mark of the process resident set size, None where the platform does not report it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class JSONLogSink:
+    """Emits every event as one JSON log line."""
+
+    def __init__(self, event_logger: logging.Logger = None, level: int = logging.INFO):
+        self.logger = event_logger or logger
+        self.level = level
+
+    def emit(self, event: dict) -> None:
+        self.logger.log(self.level, json.dumps(event, default=str))
+
+    def flush(self) -> None:
+        pass
+
+
+class CallbackSink:
+    """Hands every event to a function, e.g. to push it to a metrics client or an Airflow XCom."""
+
+    def __init__(self, callback: Callable[[dict], None]):
+        self.callback = callback
+
+    def emit(self, event: dict) -> None:
+        self.callback(event)
+
+    def flush(self) -> None:
+        pass
+
+
+class OpenMetricsSink:
+    """
+    Keeps the latest value of every stage / expectation and writes them as an OpenMetrics text file
+    on `flush()` (e.g. for the node exporter textfile collector). The file is replaced atomically.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.latest: Dict[tuple, dict] = {}
+
+    def emit(self, event: dict) -> None:
+        labels = (("process_id", event["process_id"]), ("stage", event["stage"]),
+                  *sorted((key, str(value)) for key, value in event["labels"].items()))
+        self.latest[labels] = event
+
+    @staticmethod
+    def format_labels(labels: tuple) -> str:
+        escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+        return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+    def render(self) -> str:
+        lines = []
+        for metric, (key, help_text) in STAGE_METRICS.items():
+            samples = [(labels, event[key]) for labels, event in self.latest.items() if event.get(key) is not None]
+            if not samples:
+                continue
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"# HELP {metric} {help_text}.")
+            lines.extend(f"{metric}{self.format_labels(labels)} {value}" for labels, value in samples)
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def flush(self) -> None:
+        temp_path = f"{self.file_path}.tmp"
+        with open(temp_path, 'w') as file:
+            file.write(self.render())
+        os.replace(temp_path, self.file_path)
+
+
+class Instrumentation:
+    def __init__(self, process_id: str, sinks: List[object] = None):
+        """
+        Records wall time, CPU time, peak RSS, rows and rows/second of pipeline stages and emits
+        each measurement as a structured event to the sinks (objects with `emit(event)` and `flush()`,
+        e.g. `JSONLogSink`, `OpenMetricsSink` or `CallbackSink`).
+
+        :param process_id: Process id added to every event, so dashboards can split by process.
+        :param sinks: Event sinks; without sinks the events are only kept in `events`.
+        """
+        self.process_id = process_id
+        self.sinks = sinks or []
+        self.events: List[dict] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, rows: int = None, **labels):
+        """
+        Measures the enclosed block as stage `name`. The yielded dict can be updated inside the
+        block, e.g. `measurement["rows"] = len(df)` once the row count is known.
+
+        :param name: Stage name (load, file_checks, mapping, checkpoint, expectation, ...).
+        :param rows: Rows processed by the stage, if known up front.
+        :param labels: Extra event labels, e.g. expectation="expect_column_values_to_not_be_null".
+        """
+        measurement = {"rows": rows}
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield measurement
+        finally:
+            wall_seconds = time.perf_counter() - wall_start
+            self.record(name, wall_seconds, time.process_time() - cpu_start, measurement["rows"], **labels)
+
+    def record(self, name: str, wall_seconds: float, cpu_seconds: float = None, rows: int = None, **labels) -> dict:
+        """Builds the event of a measured stage and emits it to every sink."""
+        event = {
+            "timestamp": datetime.now().isoformat(),
+            "process_id": self.process_id,
+            "stage": name,
+            "labels": labels,
+            "wall_seconds": round(wall_seconds, 6),
+            "cpu_seconds": round(cpu_seconds, 6) if cpu_seconds is not None else None,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "rows": rows,
+            "rows_per_second": round(rows / wall_seconds, 1) if rows is not None and wall_seconds > 0 else None,
+        }
+        with self._lock:
+            self.events.append(event)
+            for sink in self.sinks:
+                try:
+                    sink.emit(event)
+                except Exception as e:
+                    logger.error(f"Instrumentation sink {type(sink).__name__} failed: {e}")
+        return event
+
+    def flush(self) -> None:
+        """Lets the sinks write what they buffer (e.g. the OpenMetrics file)."""
+        with self._lock:
+            for sink in self.sinks:
+                try:
+                    sink.flush()
+                except Exception as e:
+                    logger.error(f"Instrumentation sink {type(sink).__name__} failed to flush: {e}")
+
+    def summary(self) -> Dict[str, dict]:
+        """Total wall time, CPU time and rows per stage over the recorded events."""
+        totals = {}
+        for event in self.events:
+            total = totals.setdefault(event["stage"], {"wall_seconds": 0.0, "cpu_seconds": 0.0, "rows": 0, "events": 0})
+            total["wall_seconds"] += event["wall_seconds"]
+            total["cpu_seconds"] += event["cpu_seconds"] or 0.0
+            total["rows"] += event["rows"] or 0
+            total["events"] += 1
+        return totals
@@ -0,0 +1,121 @@
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config.settings import METRIC_CACHE_MAX_BYTES
+
+# Setup logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# (frame, cache) the metrics of the current validation are drawn from, see `MetricCache.bind`
+_bound_cache: ContextVar[Optional[tuple]] = ContextVar("bound_metric_cache", default=None)
+
+
+def metric_size(value) -> int:
+    """Approximate bytes held by a cached metric."""
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    return sys.getsizeof(value)
+
+
+class MetricCache:
+    """
+    Run-scoped cache of derived column data (null masks, value counts, string lengths, ...)
+    keyed by (column, metric), so the expectations of a run that need the same data share one
+    computation. Entries are accounted by their size; the least recently used are evicted once
+    the cache holds more than `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int = METRIC_CACHE_MAX_BYTES):
+        """
+        :param max_bytes: Memory budget of the cache; a metric larger than it is computed but not kept.
+        """
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.seconds_saved = 0.0
+        self._lock = threading.RLock()
+
+    def get_or_compute(self, column: Hashable, metric: str, compute: Callable[[], object]):
+        """The cached (column, metric), computed and stored on a miss."""
+        key = (column, metric)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                self.seconds_saved += entry[2]
+                return entry[0]
+            self.misses += 1
+
+        start = time.perf_counter()
+        value = compute()
+        seconds = time.perf_counter() - start
+        if isinstance(value, np.ndarray):
+            # Shared by every expectation drawing from the cache, so it must not be modified in place
+            value.flags.writeable = False
+        self.put(key, value, seconds)
+        return value
+
+    def put(self, key: tuple, value, seconds: float = 0.0) -> None:
+        """Stores an entry, then evicts the least recently used ones beyond the memory budget."""
+        size = metric_size(value)
+        with self._lock:
+            if size > self.max_bytes:
+                logger.info(f"Metric {key} ({size} bytes) exceeds the metric cache budget and is not kept.")
+                return
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self.entries[key] = (value, size, seconds)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self.entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions, "entries": len(self.entries), "bytes": self.bytes,
+                "seconds_saved": round(self.seconds_saved, 6)}
+
+    @contextmanager
+    def bind(self, frame: pd.DataFrame):
+        """Makes `column_metric` draw the metrics of `frame` from this cache inside the block."""
+        token = _bound_cache.set((frame, self))
+        try:
+            yield self
+        finally:
+            _bound_cache.reset(token)
+
+
+def column_metric(df: pd.DataFrame, column: Hashable, metric: str, compute: Callable[[pd.Series], object]):
+    """
+    `compute(df[column])`, drawn from the metric cache bound to `df` when there is one. Frames
+    without a bound cache (stream chunks, row-group subsets, ...) are computed directly.
+    """
+    bound = _bound_cache.get()
+    if bound is None or bound[0] is not df:
+        return compute(df[column])
+    return bound[1].get_or_compute(column, metric, lambda: compute(df[column]))
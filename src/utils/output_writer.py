@@ -0,0 +1,154 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import Dict, Optional
+
+import pandas as pd
+
+from src.config.settings import OUTPUT_QUEUE_SIZE
+
+# Setup logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# Queue item telling a sink worker that no more batches will come
+_CLOSE = object()
+
+# Writers not flushed yet, flushed on interpreter exit so no queued batch is lost
+_OPEN_WRITERS = set()
+
+
+class OutputWriteError(Exception):
+    """
+    Raised by `BackgroundWriter.flush` when a sink failed, with the error of every failed sink.
+    """
+
+    def __init__(self, errors: Dict[str, Exception]):
+        self.errors = errors
+        super().__init__("; ".join(f"{name}: {error}" for name, error in errors.items()))
+
+
+class CSVFileSink:
+    """
+    Appends batches to a local CSV file, with the header written by the first batch; with `append`
+    the file is continued as is, without a header.
+    """
+
+    def __init__(self, file_path: str, append: bool = False):
+        self.file_path = file_path
+        self.header = not append
+
+    def write(self, df: pd.DataFrame) -> None:
+        df.to_csv(self.file_path, mode='w' if self.header else 'a', header=self.header, index=False)
+        self.header = False
+
+    def close(self) -> None:
+        pass
+
+    def abort(self) -> None:
+        pass
+
+
+class BackgroundWriter:
+    """
+    Writes batches of rows to several sinks (objects with `write(df)`, `close()` and `abort()`, e.g.
+    `CSVFileSink` or `S3RecordWriter`) on background threads, one per sink so the sinks are written
+    concurrently. Each sink has a bounded queue: `submit` blocks while a sink is `max_pending`
+    batches behind. Sink errors do not interrupt the producer, they are raised by the final `flush()`.
+    """
+
+    def __init__(self, sinks: Dict[str, object], max_pending: int = OUTPUT_QUEUE_SIZE):
+        self.sinks = sinks
+        self.queues = {name: queue.Queue(maxsize=max_pending) for name in sinks}
+        self.errors: Dict[str, Exception] = {}
+        self.batches = 0
+        self.rows = 0
+        self.closed = False
+        self.aborted = False
+        self.threads = [threading.Thread(target=self._run, args=(name,), name=f"output-writer-{name}", daemon=True)
+                        for name in sinks]
+        for thread in self.threads:
+            thread.start()
+        _OPEN_WRITERS.add(self)
+
+    def submit(self, df: pd.DataFrame, timeout: Optional[float] = None) -> None:
+        """
+        Queues a batch for every sink and returns once it is queued.
+
+        :param df: The rows to write; the frame must not be modified afterwards.
+        :param timeout: Maximum seconds to wait for room in a full queue; raises queue.Full after it.
+        """
+        if self.closed:
+            raise ValueError("submit to a flushed BackgroundWriter")
+        for sink_queue in self.queues.values():
+            sink_queue.put(df, timeout=timeout)
+        self.batches += 1
+        self.rows += len(df)
+
+    def _run(self, name: str) -> None:
+        sink, sink_queue = self.sinks[name], self.queues[name]
+        while True:
+            batch = sink_queue.get()
+            if batch is _CLOSE:
+                break
+            # A failed sink keeps draining its queue so the producer never blocks on it
+            if name in self.errors or self.aborted:
+                continue
+            try:
+                start = time.monotonic()
+                sink.write(batch)
+                logger.debug(f"Wrote {len(batch)} row(s) to {name} in {time.monotonic() - start:.3f}s.")
+            except Exception as e:
+                self.errors[name] = e
+                logger.error(f"Error while writing to {name}: {e}")
+        try:
+            if name in self.errors or self.aborted:
+                sink.abort()
+            else:
+                sink.close()
+        except Exception as e:
+            self.errors.setdefault(name, e)
+            logger.error(f"Error while closing {name}: {e}")
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Final flush: waits until every queued batch is written and the sinks are closed.
+
+        :param timeout: Maximum seconds to wait; None waits indefinitely.
+        :return: True once all sinks are closed, False if the timeout expired first.
+        :raises OutputWriteError: If a sink failed to write or close.
+        """
+        if not self.closed:
+            self.closed = True
+            for sink_queue in self.queues.values():
+                sink_queue.put(_CLOSE)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self.threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        if any(thread.is_alive() for thread in self.threads):
+            return False
+        _OPEN_WRITERS.discard(self)
+        if self.errors:
+            raise OutputWriteError(dict(self.errors))
+        return True
+
+    def abort(self) -> None:
+        """Drops the queued batches and aborts every sink (e.g. the producer failed)."""
+        self.aborted = True
+        try:
+            self.flush()
+        except OutputWriteError:
+            pass
+
+
+def _flush_open_writers() -> None:
+    for writer in list(_OPEN_WRITERS):
+        try:
+            writer.flush()
+        except OutputWriteError as e:
+            logger.error(f"Output writer failed at exit: {e}")
+
+
+atexit.register(_flush_open_writers)
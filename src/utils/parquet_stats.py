@@ -0,0 +1,63 @@
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.utils.format_sniffer import is_parquet_file
+
+PARQUET_EXTENSIONS = ('.parquet',)
+
+
+def is_parquet(file_path: str) -> bool:
+    """
+    Whether the file is a Parquet file, judged by its PAR1 magic bytes like the format sniffer,
+    or by its extension when the file cannot be read.
+    """
+    try:
+        return is_parquet_file(file_path)
+    except OSError:
+        return file_path.lower().endswith(PARQUET_EXTENSIONS)
+
+
+def column_kind(data_type: pa.DataType) -> str:
+    """Groups Arrow types by how their Parquet min/max statistics can be used: integer, floating or other."""
+    if pa.types.is_integer(data_type):
+        return "integer"
+    if pa.types.is_floating(data_type):
+        return "floating"
+    return "other"
+
+
+def read_row_group_statistics(file_path: str) -> dict:
+    """
+    Reads the footer of a Parquet file, no data page is decoded.
+
+    :param file_path: The path to the Parquet file.
+    :return: {"num_rows", "columns": {name: kind (see `column_kind`)}, "row_groups": [{"num_rows",
+        "offset" (position of its first row in the file), "columns": {name: {"null_count", "min", "max"}}}]}.
+        null_count / min / max are None when the writer did not store them. Parquet writers leave NaN
+        out of both min/max and null_count.
+    """
+    metadata = pq.read_metadata(file_path)
+    schema = metadata.schema.to_arrow_schema()
+    columns = {field.name: column_kind(field.type) for field in schema}
+
+    row_groups = []
+    offset = 0
+    for index in range(metadata.num_row_groups):
+        row_group = metadata.row_group(index)
+        column_statistics = {}
+        for position in range(row_group.num_columns):
+            chunk = row_group.column(position)
+            # Nested fields have dotted paths and no top-level column to validate
+            if chunk.path_in_schema not in columns:
+                continue
+            statistics = chunk.statistics if chunk.is_stats_set else None
+            has_min_max = statistics is not None and statistics.has_min_max
+            column_statistics[chunk.path_in_schema] = {
+                "null_count": statistics.null_count if statistics is not None and statistics.has_null_count else None,
+                "min": statistics.min if has_min_max else None,
+                "max": statistics.max if has_min_max else None,
+            }
+        row_groups.append({"num_rows": row_group.num_rows, "offset": offset, "columns": column_statistics})
+        offset += row_group.num_rows
+
+    return {"num_rows": metadata.num_rows, "columns": columns, "row_groups": row_groups}
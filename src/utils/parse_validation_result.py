@@ -11,7 +11,14 @@ class Parse_GXValidator:
         """Initializes the GXValidator class with the data source name and logger."""
         self.data_source_name = data_source_name
         self.log = logging.getLogger("GX validation")
-        self.context = gx.data_context.get_context()  # Instantiate a GX data context (adjust as needed)
+        self._context = None
+
+    @property
+    def context(self):
+        """GX data context, instantiated on first use so parsing native engine results stays GX-free."""
+        if self._context is None:
+            self._context = gx.data_context.get_context()
+        return self._context
 
     def extract_validation_result_from_checkpoint_result(
             self, checkpoint_result: gx.checkpoint.checkpoint.CheckpointResult
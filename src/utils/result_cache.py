@@ -0,0 +1,114 @@
+import logging
+import os
+import pickle
+import threading
+from typing import Optional
+
+from src.config.settings import RESULT_CACHE_DIR, RESULT_CACHE_MAX_BYTES
+from src.utils.file_utils import fingerprint_config, fingerprint_file
+
+# Setup logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# Bumped when the layout of a cache entry changes, so older entries are never read
+CACHE_FORMAT_VERSION = 1
+
+
+class ResultCache:
+    """
+    On-disk cache of validation outcomes, so a rerun on the same input with the same configuration
+    (e.g. an Airflow retry) returns without running any check. Entries are pickles in a local
+    directory that only the pipeline writes to; the least recently used are evicted once the
+    directory grows beyond `max_bytes`.
+    """
+
+    def __init__(self, directory: str = RESULT_CACHE_DIR, max_bytes: int = RESULT_CACHE_MAX_BYTES,
+                 fast: bool = False):
+        """
+        :param directory: Directory of the cache entries.
+        :param max_bytes: Size bound of the directory; LRU entries are evicted beyond it.
+        :param fast: Identify inputs by size, modification time and ETag instead of hashing their content.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.fast = fast
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def input_fingerprint(self, file_path: str, etag: str = None) -> str:
+        """Identity of the input: its content hash, or size + mtime + ETag in fast mode."""
+        if self.fast:
+            stat = os.stat(file_path)
+            return fingerprint_config("fast", stat.st_size, stat.st_mtime_ns, etag)
+        return fingerprint_file(file_path)
+
+    def key(self, input_fingerprint: str, *configs) -> str:
+        """Key of an entry: the input fingerprint and everything else that decides the outcome."""
+        return fingerprint_config(CACHE_FORMAT_VERSION, input_fingerprint, *configs)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key: str) -> Optional[dict]:
+        """The cached entry, marked as recently used, or None on a miss."""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as file:
+                entry = pickle.load(file)
+            os.utime(path)
+        except FileNotFoundError:
+            entry = None
+        except Exception as e:
+            logger.error(f"Ignoring unreadable result cache entry {path}: {e}")
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: dict) -> None:
+        """Stores an entry (replacing it atomically), then evicts beyond the size bound."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as file:
+            pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        self.evict(keep=path)
+
+    def evict(self, keep: str = None) -> int:
+        """Deletes the least recently used entries until the directory fits `max_bytes`; returns how many."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+        if evicted:
+            logger.info(f"Evicted {evicted} result cache entr{'y' if evicted == 1 else 'ies'} from {self.directory}.")
+        return evicted
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
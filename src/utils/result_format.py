@@ -0,0 +1,84 @@
+from typing import List, Optional
+
+import great_expectations.expectations as gxe
+
+from src.config.settings import ACTION_RESULT_FORMATS, DEFAULT_RESULT_FORMAT, PARTIAL_UNEXPECTED_COUNT
+
+# GX result_format levels, least to most detailed
+RESULT_FORMAT_LEVELS = ("BOOLEAN_ONLY", "BASIC", "SUMMARY", "COMPLETE")
+
+# Result keys each level adds on top of the previous one (map expectations)
+_SUMMARY_KEYS = ("partial_unexpected_index_list", "partial_unexpected_counts")
+_COMPLETE_KEYS = ("unexpected_list", "unexpected_index_list")
+_VALUE_KEYS = ("unexpected_list", "partial_unexpected_list", "partial_unexpected_counts")
+
+
+def action_result_format(action: Optional[str]) -> dict:
+    """
+    Result detail needed by the pipeline for a YAML action: row indices for `skip` (to split
+    invalid rows, without echoing the values), success only for `failure`, a summary otherwise.
+
+    :param action: The expectation's action from the user YAML (skip, failure or None).
+    :return: A GX result_format dict.
+    """
+    level = ACTION_RESULT_FORMATS.get(action, DEFAULT_RESULT_FORMAT)
+    result_format = {"result_format": level, "partial_unexpected_count": PARTIAL_UNEXPECTED_COUNT}
+    if level == "COMPLETE":
+        result_format["exclude_unexpected_values"] = True
+    return result_format
+
+
+def expectation_result_format(expectation: gxe.Expectation) -> dict:
+    """
+    Normalizes the result_format of an expectation to a dict with `result_format`,
+    `partial_unexpected_count` and `exclude_unexpected_values`. Expectations built without an
+    explicit result_format get COMPLETE, the level the checkpoint always requested.
+    """
+    result_format = expectation.result_format if "result_format" in expectation.__fields_set__ else "COMPLETE"
+    if not isinstance(result_format, dict):
+        result_format = {"result_format": result_format}
+    return {
+        "result_format": str(getattr(result_format["result_format"], "value", result_format["result_format"])),
+        "partial_unexpected_count": result_format.get("partial_unexpected_count", PARTIAL_UNEXPECTED_COUNT),
+        "exclude_unexpected_values": bool(result_format.get("exclude_unexpected_values", False)),
+    }
+
+
+def checkpoint_result_format(expectations: List[gxe.Expectation]) -> dict:
+    """
+    A GX checkpoint applies one result_format to every expectation, so use the most detailed level
+    any expectation needs. Unexpected values are only echoed if some expectation at that level wants them.
+    """
+    formats = [expectation_result_format(expectation) for expectation in expectations] or \
+              [{"result_format": "COMPLETE", "partial_unexpected_count": PARTIAL_UNEXPECTED_COUNT,
+                "exclude_unexpected_values": False}]
+    level = max((result_format["result_format"] for result_format in formats), key=RESULT_FORMAT_LEVELS.index)
+    at_level = [result_format for result_format in formats if result_format["result_format"] == level]
+    return {
+        "result_format": level,
+        "partial_unexpected_count": max(result_format["partial_unexpected_count"] for result_format in formats),
+        "exclude_unexpected_values": all(result_format["exclude_unexpected_values"] for result_format in at_level),
+    }
+
+
+def apply_result_format(result: dict, result_format: dict) -> dict:
+    """Trims a COMPLETE-shaped result dict down to the keys the result_format level asks for."""
+    level = result_format["result_format"]
+    if level == "BOOLEAN_ONLY":
+        return {}
+
+    dropped = set()
+    if level == "BASIC":
+        dropped.update(_SUMMARY_KEYS + _COMPLETE_KEYS)
+    elif level == "SUMMARY":
+        dropped.update(_COMPLETE_KEYS)
+    if result_format["exclude_unexpected_values"]:
+        dropped.update(_VALUE_KEYS)
+
+    cap = result_format["partial_unexpected_count"]
+    trimmed = {}
+    for key, value in result.items():
+        if key in dropped:
+            continue
+        trimmed[key] = value[:cap] if key.startswith("partial_") and isinstance(value, list) else value
+    return trimmed
@@ -0,0 +1,187 @@
+import gzip
+import io
+import threading
+
+import boto3
+import pandas as pd
+
+from src.config.settings import S3_PART_SIZE, S3_REGION
+
+# Minimum size of every multipart part but the last (S3 limit)
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+
+# Record file formats: extension and content type of the uploaded object
+RECORD_FORMATS = {
+    "csv": (".csv", "text/csv"),
+    "csv.gz": (".csv.gz", "application/gzip"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+_S3_CLIENTS = {}
+_S3_CLIENTS_LOCK = threading.Lock()
+
+
+def get_s3_client(region_name: str = S3_REGION):
+    """
+    Returns the S3 client of the region, created once per process and shared by every caller
+    (boto3 clients are thread-safe and keep their connection pool between requests).
+    """
+    with _S3_CLIENTS_LOCK:
+        client = _S3_CLIENTS.get(region_name)
+        if client is None:
+            client = boto3.client('s3', region_name=region_name)
+            _S3_CLIENTS[region_name] = client
+        return client
+
+
+class S3MultipartWriter(io.RawIOBase):
+    """
+    Binary file object uploading what is written to it as S3 multipart parts of `part_size` bytes,
+    so memory stays bounded by one part. The object is only published by `complete()` (an object
+    smaller than one part is sent with a single put_object); closing the writer any other way,
+    including garbage collection of an abandoned writer, aborts the multipart upload, so neither
+    a partial object nor orphaned parts are left behind.
+    """
+
+    def __init__(self, bucket: str, key: str, client=None, part_size: int = S3_PART_SIZE,
+                 content_type: str = None):
+        self.bucket = bucket
+        self.key = key
+        self.client = client or get_s3_client()
+        self.part_size = max(part_size, S3_MIN_PART_SIZE)
+        self.content_type = content_type
+        self.buffer = bytearray()
+        self.upload_id = None
+        self.parts = []
+        self.bytes_written = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("write to a closed S3MultipartWriter")
+        self.buffer.extend(data)
+        self.bytes_written += len(data)
+        while len(self.buffer) >= self.part_size:
+            self._upload_part(bytes(self.buffer[:self.part_size]))
+            del self.buffer[:self.part_size]
+        return len(data)
+
+    def tell(self) -> int:
+        # Parquet writers record offsets of what they have written
+        return self.bytes_written
+
+    def _upload_part(self, body: bytes) -> None:
+        if self.upload_id is None:
+            extra = {"ContentType": self.content_type} if self.content_type else {}
+            self.upload_id = self.client.create_multipart_upload(Bucket=self.bucket, Key=self.key,
+                                                                 **extra)["UploadId"]
+        part_number = len(self.parts) + 1
+        response = self.client.upload_part(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id,
+                                           PartNumber=part_number, Body=body)
+        self.parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+
+    def complete(self) -> None:
+        """Uploads the last part and completes the upload (or puts the whole object if it fits one part)."""
+        if self.closed:
+            raise ValueError("complete on a closed S3MultipartWriter")
+        try:
+            if self.upload_id is None:
+                extra = {"ContentType": self.content_type} if self.content_type else {}
+                self.client.put_object(Bucket=self.bucket, Key=self.key, Body=bytes(self.buffer), **extra)
+            else:
+                if self.buffer:
+                    self._upload_part(bytes(self.buffer))
+                self.client.complete_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id,
+                                                      MultipartUpload={"Parts": self.parts})
+        except Exception:
+            self.abort()
+            raise
+        finally:
+            self.buffer = bytearray()
+            super().close()
+
+    def close(self) -> None:
+        """Closes without publishing: an upload that was not completed is aborted."""
+        self.abort()
+
+    def abort(self) -> None:
+        """Drops the parts uploaded so far; nothing is left in the bucket."""
+        if self.closed:
+            return
+        if self.upload_id is not None:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
+            self.upload_id = None
+        self.buffer = bytearray()
+        super().close()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.complete()
+
+
+class S3RecordWriter:
+    def __init__(self, bucket: str, key: str, file_format: str = "csv", client=None,
+                 part_size: int = S3_PART_SIZE):
+        """
+        Streams DataFrames of records to one S3 object as they are produced, encoded as CSV,
+        gzip-compressed CSV or Parquet (one row group per written frame).
+
+        :param bucket: Target bucket.
+        :param key: Object key (the format's extension is not added).
+        :param file_format: "csv", "csv.gz" or "parquet".
+        :param client: S3 client; the shared client of `get_s3_client` by default.
+        :param part_size: Bytes per multipart part.
+        """
+        if file_format not in RECORD_FORMATS:
+            raise ValueError(f"Unknown record format '{file_format}'. Available: {list(RECORD_FORMATS)}")
+        self.file_format = file_format
+        self.upload = S3MultipartWriter(bucket, key, client, part_size, content_type=RECORD_FORMATS[file_format][1])
+        self.stream = None
+        self.parquet_writer = None
+        self.rows = 0
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Appends the rows of `df`; the CSV header / Parquet schema comes from the first frame."""
+        if self.file_format == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self.parquet_writer is None:
+                self.parquet_writer = pq.ParquetWriter(self.upload, table.schema)
+            self.parquet_writer.write_table(table.cast(self.parquet_writer.schema))
+        else:
+            first = self.stream is None
+            if first:
+                binary = gzip.GzipFile(fileobj=self.upload, mode='wb') if self.file_format == "csv.gz" else self.upload
+                self.stream = io.TextIOWrapper(binary, encoding='utf-8', newline='')
+            df.to_csv(self.stream, header=first, index=False)
+        self.rows += len(df)
+
+    def close(self) -> None:
+        """Flushes the encoder and completes the upload."""
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
+        if self.stream is not None:
+            # Detached rather than closed: closing the wrapper would close (and so abort) the upload
+            self.stream.flush()
+            binary = self.stream.detach()
+            if binary is not self.upload:
+                binary.close()  # writes the gzip trailer; GzipFile leaves the upload open
+        self.upload.complete()
+
+    def abort(self) -> None:
+        self.upload.abort()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
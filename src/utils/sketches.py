@@ -0,0 +1,256 @@
+import math
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def weighted_quantiles(items: np.ndarray, weights: np.ndarray, quantiles: List[float]) -> list:
+    """
+    Quantiles of weighted items using 'nearest' interpolation (the GX/pandas method used
+    by ExpectColumnQuantileValuesToBeBetween).
+    """
+    order = np.argsort(items, kind="stable")
+    items, cumulative = items[order], np.cumsum(weights[order])
+    positions = np.around(np.asarray(quantiles, dtype=float) * (cumulative[-1] - 1))
+    return items[np.searchsorted(cumulative, positions, side="right")].tolist()
+
+
+def weighted_median(items: np.ndarray, weights: np.ndarray) -> float:
+    """Median of weighted items, averaging the two middle values like pandas for even counts."""
+    order = np.argsort(items, kind="stable")
+    items, cumulative = items[order], np.cumsum(weights[order])
+    total = cumulative[-1]
+    lower, upper = np.searchsorted(cumulative, [(total - 1) // 2, total // 2], side="right")
+    return float((items[lower] + items[upper]) / 2)
+
+
+def canonical_values(values: pd.Series) -> pd.Series:
+    """
+    Values in a dtype that does not depend on how a chunk was inferred: numbers as float64 and
+    everything else as str, so 1 and 1.0 read from different chunks hash the same.
+    """
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return values.astype("float64")
+    return values.astype(str)
+
+
+def canonical_hashes(values) -> np.ndarray:
+    """64-bit hashes of the canonical values of a Series, or of the rows of a DataFrame."""
+    if isinstance(values, pd.DataFrame):
+        values = pd.DataFrame({column: canonical_values(values[column]) for column in values.columns})
+    else:
+        values = canonical_values(values)
+    return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+
+class MomentsAccumulator:
+    """Welford/Chan running count, mean, variance, min, max and sum; exact and mergeable."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def update(self, values) -> None:
+        """Folds a batch of numeric values (NaN ignored) into the running moments."""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        batch = MomentsAccumulator()
+        batch.count = len(values)
+        batch.mean = float(values.mean())
+        batch.m2 = float(((values - batch.mean) ** 2).sum())
+        batch.sum = float(values.sum())
+        batch.min = float(values.min())
+        batch.max = float(values.max())
+        self.merge(batch)
+
+    def merge(self, other: "MomentsAccumulator") -> "MomentsAccumulator":
+        """Merges another accumulator into this one (Chan et al. parallel variance)."""
+        if not other.count:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.sum += other.sum
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.count = total
+        return self
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Sample variance (ddof=1), as pandas `Series.std` uses."""
+        if self.count < 2:
+            return None
+        return self.m2 / (self.count - 1)
+
+    @property
+    def stdev(self) -> Optional[float]:
+        variance = self.variance
+        return math.sqrt(variance) if variance is not None else None
+
+
+class QuantileSketch:
+    """
+    KLL quantile sketch.
+
+    With `exact=True` it keeps every distinct value with its count instead, so quantiles are
+    exact and memory grows with the number of distinct values. Otherwise the normalized rank
+    error stays within `relative_error` (k is derived from it) and memory is O(k log n).
+    """
+
+    def __init__(self, relative_error: float = 0.005, exact: bool = False, seed: Optional[int] = None):
+        self.relative_error = relative_error
+        self.exact = exact
+        # DataSketches' empirical KLL bound: rank error ~ 2.296 / k ** 0.9723 (99% confidence)
+        self.k = max(8, int(math.ceil((2.296 / relative_error) ** (1 / 0.9723))))
+        self.count = 0
+        self._rng = np.random.default_rng(seed)
+        # exact mode: distinct values and their counts; sketch mode: one compactor per level
+        self._values = np.array([], dtype=float)
+        self._counts = np.array([], dtype=np.int64)
+        self._compactors: List[np.ndarray] = [np.array([], dtype=float)]
+
+    def update(self, values) -> None:
+        """Adds a batch of numeric values (NaN ignored)."""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.count += len(values)
+        if self.exact:
+            self._add_exact(*np.unique(values, return_counts=True))
+        else:
+            self._compactors[0] = np.concatenate([self._compactors[0], values])
+            self._compress()
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Merges another sketch built with the same settings into this one."""
+        if self.exact != other.exact:
+            raise ValueError("Cannot merge an exact QuantileSketch with an approximate one.")
+        self.count += other.count
+        if self.exact:
+            self._add_exact(other._values, other._counts)
+            return self
+        while len(self._compactors) < len(other._compactors):
+            self._compactors.append(np.array([], dtype=float))
+        for level, items in enumerate(other._compactors):
+            self._compactors[level] = np.concatenate([self._compactors[level], items])
+        self._compress()
+        return self
+
+    def _add_exact(self, values: np.ndarray, counts: np.ndarray) -> None:
+        merged_values = np.concatenate([self._values, values])
+        merged_counts = np.concatenate([self._counts, counts])
+        self._values, inverse = np.unique(merged_values, return_inverse=True)
+        self._counts = np.bincount(inverse, weights=merged_counts).astype(np.int64)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self._compactors):
+            items = self._compactors[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self._compactors):
+                    self._compactors.append(np.array([], dtype=float))
+                items = np.sort(items)
+                # keep an odd leftover at this level, promote every other item of the rest
+                keep = items[:len(items) % 2]
+                paired = items[len(items) % 2:]
+                promoted = paired[int(self._rng.integers(0, 2))::2]
+                self._compactors[level] = keep
+                self._compactors[level + 1] = np.concatenate([self._compactors[level + 1], promoted])
+            level += 1
+
+    def _weighted_items(self):
+        if self.exact:
+            return self._values, self._counts
+        items = np.concatenate(self._compactors)
+        weights = np.concatenate([np.full(len(c), 2 ** level, dtype=np.int64)
+                                  for level, c in enumerate(self._compactors)])
+        return items, weights
+
+    def quantiles(self, quantiles: List[float]) -> list:
+        if not self.count:
+            return []
+        return weighted_quantiles(*self._weighted_items(), quantiles)
+
+    def median(self) -> Optional[float]:
+        if not self.count:
+            return None
+        return weighted_median(*self._weighted_items())
+
+
+class DistinctCounter:
+    """
+    HyperLogLog distinct-value counter over 64-bit value hashes.
+
+    `relative_error` sets the register count (standard error ~ 1.04 / sqrt(2 ** precision)).
+    With `exact=True` the sorted set of hashes is kept instead, giving exact counts.
+    """
+
+    def __init__(self, relative_error: float = 0.01, exact: bool = False):
+        self.relative_error = relative_error
+        self.exact = exact
+        self.precision = min(18, max(4, int(math.ceil(math.log2((1.04 / relative_error) ** 2)))))
+        self._registers = np.zeros(2 ** self.precision, dtype=np.uint8)
+        self._hashes = np.array([], dtype=np.uint64)
+
+    def update(self, values) -> None:
+        """Adds a batch of values (nulls ignored)."""
+        series = pd.Series(values)
+        series = series[series.notna()]
+        if series.empty:
+            return
+        hashes = canonical_hashes(series)
+        if self.exact:
+            self._hashes = np.union1d(self._hashes, hashes)
+            return
+        p = np.uint64(self.precision)
+        buckets = (hashes >> (np.uint64(64) - p)).astype(np.int64)
+        remainder = hashes & ((np.uint64(1) << (np.uint64(64) - p)) - np.uint64(1))
+        ranks = (64 - self.precision - self._bit_length(remainder) + 1).astype(np.uint8)
+        np.maximum.at(self._registers, buckets, ranks)
+
+    def merge(self, other: "DistinctCounter") -> "DistinctCounter":
+        """Merges another counter built with the same settings into this one."""
+        if self.exact != other.exact or self.precision != other.precision:
+            raise ValueError("Cannot merge DistinctCounters with different settings.")
+        if self.exact:
+            self._hashes = np.union1d(self._hashes, other._hashes)
+        else:
+            np.maximum(self._registers, other._registers, out=self._registers)
+        return self
+
+    @staticmethod
+    def _bit_length(values: np.ndarray) -> np.ndarray:
+        """Vectorized int.bit_length for uint64 arrays."""
+        values = values.copy()
+        lengths = np.zeros(len(values), dtype=np.int64)
+        for shift in (32, 16, 8, 4, 2, 1):
+            high = values >= (np.uint64(1) << np.uint64(shift))
+            lengths[high] += shift
+            values[high] >>= np.uint64(shift)
+        return lengths + (values > 0)
+
+    def count(self) -> int:
+        if self.exact:
+            return len(self._hashes)
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(2.0 ** -self._registers.astype(float))
+        zeros = int(np.count_nonzero(self._registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # small-range correction (linear counting)
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
@@ -0,0 +1,169 @@
+import hashlib
+import io
+import logging
+import os
+import pickle
+from datetime import datetime
+from typing import Optional
+
+from src.config.settings import WATERMARK_CHECK_BYTES, WATERMARK_DIR
+
+# Setup logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+
+def file_identity(process_id: str, file_path: str) -> str:
+    """Key of the watermark of a file: the process and the absolute path of the file."""
+    payload = f"{process_id}\0{os.path.abspath(file_path)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def continuation_dtypes(dtypes: Optional[dict]) -> dict:
+    """
+    `pd.read_csv` dtypes reading appended rows like the first ones were read: integer and boolean
+    columns become their nullable types, as the appended rows may hold nulls; dtypes read_csv does
+    not produce by inference (e.g. dates) are left to inference.
+    """
+    pinned = {}
+    for column, dtype in (dtypes or {}).items():
+        if dtype.startswith(("int", "uint")):
+            pinned[column] = dtype[0].upper() + dtype[1:] if dtype.startswith("int") else "UInt" + dtype[4:]
+        elif dtype == "bool":
+            pinned[column] = "boolean"
+        elif dtype.startswith(("float", "Int", "UInt", "Float")) or dtype in ("boolean", "object", "string",
+                                                                             "category"):
+            pinned[column] = dtype
+    return pinned
+
+
+def region_digest(file_path: str, start: int, end: int) -> str:
+    """SHA-256 of the bytes [start, end) of a file."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        file.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = file.read(min(remaining, 1024 * 1024))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return digest.hexdigest()
+
+
+def complete_lines_end(file_path: str, block_size: int = 64 * 1024) -> int:
+    """
+    Offset just after the last newline of a file, so a line the writer is still appending is left
+    for the next run.
+    """
+    with open(file_path, 'rb') as file:
+        end = file.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(0, end - block_size)
+            file.seek(start)
+            block = file.read(end - start)
+            newline = block.rfind(b"\n")
+            if newline != -1:
+                return start + newline + 1
+            end = start
+    return 0
+
+
+class ByteRangeReader(io.RawIOBase):
+    """Reads the bytes [start, end) of a file, e.g. to parse only the rows appended since a watermark."""
+
+    def __init__(self, file_path: str, start: int, end: int):
+        self.file = open(file_path, 'rb')
+        self.file.seek(start)
+        self.remaining = end - start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self.remaining <= 0:
+            return 0
+        view = memoryview(buffer)[:min(len(buffer), self.remaining)]
+        read = self.file.readinto(view)
+        self.remaining -= read
+        return read
+
+    def close(self) -> None:
+        self.file.close()
+        super().close()
+
+
+class WatermarkStore:
+    """
+    Watermarks of append-only files, one per (process, file): how far the file was validated (bytes
+    and rows), digests of the validated bytes to detect a rewritten file, and the running state of
+    the streaming validator so table-level expectations continue from it. Stored as pickles in a
+    local directory that only the pipeline writes to.
+    """
+
+    def __init__(self, directory: str = WATERMARK_DIR):
+        self.directory = directory
+
+    def path(self, process_id: str, file_path: str) -> str:
+        return os.path.join(self.directory, f"{process_id}_{file_identity(process_id, file_path)[:32]}.pkl")
+
+    def load(self, process_id: str, file_path: str) -> Optional[dict]:
+        """The saved watermark of the file, or None when it has none (or it cannot be read)."""
+        path = self.path(process_id, file_path)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as file:
+                return pickle.load(file)
+        except Exception as e:
+            logger.error(f"Ignoring unreadable watermark {path}: {e}")
+            return None
+
+    def save(self, process_id: str, file_path: str, byte_offset: int, row_count: int,
+             expectations_fingerprint: str, approximate: bool, state: dict) -> dict:
+        """Persists the watermark of the file once the rows up to `byte_offset` are validated."""
+        watermark = {
+            "process_id": process_id,
+            "file_path": os.path.abspath(file_path),
+            "byte_offset": byte_offset,
+            "row_count": row_count,
+            "head_digest": region_digest(file_path, 0, min(byte_offset, WATERMARK_CHECK_BYTES)),
+            "tail_digest": region_digest(file_path, max(0, byte_offset - WATERMARK_CHECK_BYTES), byte_offset),
+            "expectations_fingerprint": expectations_fingerprint,
+            "approximate": approximate,
+            "state": state,
+            "updated_at": datetime.now().isoformat(),
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(process_id, file_path)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as file:
+            pickle.dump(watermark, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        return watermark
+
+    def clear(self, process_id: str, file_path: str) -> None:
+        path = self.path(process_id, file_path)
+        if os.path.exists(path):
+            os.remove(path)
+
+    @staticmethod
+    def stale_reason(watermark: dict, file_path: str, expectations_fingerprint: str,
+                     approximate: bool) -> Optional[str]:
+        """
+        Why the watermark cannot be continued from (the file was truncated or rewritten, or the
+        expectations changed), or None when only the bytes after it need validating.
+        """
+        byte_offset = watermark["byte_offset"]
+        if watermark["expectations_fingerprint"] != expectations_fingerprint:
+            return "expectations changed"
+        if watermark["approximate"] != approximate:
+            return "approximate mode changed"
+        if os.path.getsize(file_path) < byte_offset:
+            return "file is shorter than the watermark"
+        if region_digest(file_path, 0, min(byte_offset, WATERMARK_CHECK_BYTES)) != watermark["head_digest"] or \
+                region_digest(file_path, max(0, byte_offset - WATERMARK_CHECK_BYTES),
+                              byte_offset) != watermark["tail_digest"]:
+            return "validated bytes changed"
+        return None
@@ -0,0 +1,785 @@
+import datetime
+import logging
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+import great_expectations.expectations as gxe
+import numpy as np
+import pandas as pd
+
+from src.config.settings import PARTIAL_UNEXPECTED_COUNT
+from src.utils.metric_cache import MetricCache, column_metric
+from src.utils.result_format import apply_result_format, expectation_result_format
+
+# Setup logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# Python builtin types GX accepts next to the numpy scalar type when checking object columns.
+NATIVE_TYPE_MAP = {
+    "none": (type(None),),
+    "bool": (bool,),
+    "int": (int,),
+    "long": (int,),
+    "float": (float,),
+    "bytes": (bytes,),
+    "complex": (complex,),
+    "str": (str,),
+    "string_types": (str,),
+    "list": (list,),
+    "dict": (dict,),
+}
+
+# Registries of the expectations the native engine evaluates, keyed by the GX expectation type.
+#   map evaluators       -> fn(df, expectation) returns (unexpected_mask, domain_mask)
+#   aggregate evaluators -> fn(df, expectation) returns (success, observed_value)
+MAP_EVALUATORS: Dict[str, Callable[[pd.DataFrame, gxe.Expectation], Tuple[np.ndarray, np.ndarray]]] = {}
+AGGREGATE_EVALUATORS: Dict[str, Callable[[pd.DataFrame, gxe.Expectation], Tuple[bool, object]]] = {}
+
+# Type expectations are row-level on object columns and dtype-level otherwise, so they get their own path.
+TYPE_EXPECTATIONS = ("expect_column_values_to_be_of_type", "expect_column_values_to_be_in_type_list")
+
+
+def map_evaluator(expectation_type: str):
+    """Register a row-level (column map) evaluator for an expectation type."""
+
+    def register(fn):
+        MAP_EVALUATORS[expectation_type] = fn
+        return fn
+
+    return register
+
+
+def aggregate_evaluator(expectation_type: str):
+    """Register a table or column aggregate evaluator for an expectation type."""
+
+    def register(fn):
+        AGGREGATE_EVALUATORS[expectation_type] = fn
+        return fn
+
+    return register
+
+
+def is_supported(expectation: gxe.Expectation) -> bool:
+    """Return True when the native engine can evaluate the expectation without GX."""
+    if getattr(expectation, "row_condition", None):
+        return False
+    expectation_type = expectation.expectation_type
+    return (expectation_type in MAP_EVALUATORS or expectation_type in AGGREGATE_EVALUATORS
+            or expectation_type in TYPE_EXPECTATIONS)
+
+
+# ---------------------------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------------------------
+def _not_null(series: pd.Series) -> np.ndarray:
+    return series.notna().to_numpy(dtype=bool)
+
+
+def as_numeric(series: pd.Series) -> pd.Series:
+    """Numeric view of a column; values that cannot be parsed become NaN."""
+    if pd.api.types.is_bool_dtype(series.dtype) or not pd.api.types.is_numeric_dtype(series.dtype):
+        return pd.to_numeric(series, errors="coerce")
+    return series
+
+
+def _in_range(values: pd.Series, min_value, max_value, strict_min: bool = False, strict_max: bool = False) -> np.ndarray:
+    """Boolean mask of values inside [min_value, max_value]; a None bound is open."""
+    mask = np.ones(len(values), dtype=bool)
+    if min_value is not None:
+        mask &= (values > min_value if strict_min else values >= min_value).fillna(False).to_numpy(dtype=bool)
+    if max_value is not None:
+        mask &= (values < max_value if strict_max else values <= max_value).fillna(False).to_numpy(dtype=bool)
+    return mask
+
+
+def between(observed, min_value, max_value, strict_min: bool = False, strict_max: bool = False) -> bool:
+    if observed is None or (isinstance(observed, float) and np.isnan(observed)):
+        return False
+    if min_value is not None and (observed <= min_value if strict_min else observed < min_value):
+        return False
+    if max_value is not None and (observed >= max_value if strict_max else observed > max_value):
+        return False
+    return True
+
+
+def _comparable_types(type_name: str) -> tuple:
+    """Resolve a GX type name ('int64', 'str', ...) to the Python/numpy types it accepts."""
+    types = []
+    try:
+        types.append(np.dtype(type_name).type)
+    except TypeError:
+        pd_type = getattr(pd, type_name, None)
+        if isinstance(pd_type, type):
+            types.append(pd_type)
+    types.extend(NATIVE_TYPE_MAP.get(type_name.lower(), ()))
+    return tuple(types)
+
+
+def dtype_name(series: pd.Series) -> str:
+    """dtype name with the Arrow suffix stripped, so 'int64[pyarrow]' compares as 'int64'."""
+    return str(series.dtype).replace("[pyarrow]", "")
+
+
+def _type_mask(series: pd.Series, type_names: List[str]) -> Optional[np.ndarray]:
+    """
+    Per-value type mask for object columns (the only case GX checks row by row).
+    Returns None when the check is decided at column level from the dtype.
+    """
+    if series.dtype != object or any(name in ("object", "object_", "O") for name in type_names):
+        return None
+    comp_types = tuple(t for name in type_names for t in _comparable_types(name))
+    matches = series.map(lambda value: isinstance(value, comp_types)).to_numpy(dtype=bool)
+    return ~matches
+
+
+def dtype_matches(series: pd.Series, type_names: List[str]) -> bool:
+    observed = dtype_name(series)
+    for name in type_names:
+        if name == observed or series.dtype.type in _comparable_types(name):
+            return True
+    return False
+
+
+def _string_lengths(series: pd.Series) -> pd.Series:
+    return series.astype(str).str.len()
+
+
+def _value_counts(series: pd.Series) -> pd.Series:
+    counts = series.value_counts(dropna=True)
+    # Categorical columns count their unobserved categories as 0
+    return counts[counts > 0]
+
+
+# Derived column data shared by the expectations of a run through the bound `MetricCache`
+def not_null_mask(df: pd.DataFrame, column) -> np.ndarray:
+    return column_metric(df, column, "not_null", _not_null)
+
+
+def numeric_values(df: pd.DataFrame, column) -> pd.Series:
+    return column_metric(df, column, "numeric", as_numeric)
+
+
+def value_counts(df: pd.DataFrame, column) -> pd.Series:
+    return column_metric(df, column, "value_counts", _value_counts)
+
+
+def string_lengths(df: pd.DataFrame, column) -> pd.Series:
+    return column_metric(df, column, "string_lengths", _string_lengths)
+
+
+def mostly_success(unexpected_count: int, domain_count: int, mostly: Optional[float]) -> bool:
+    if domain_count == 0:
+        return True
+    if mostly is None:
+        return unexpected_count == 0
+    return (domain_count - unexpected_count) / domain_count >= mostly
+
+
+# ---------------------------------------------------------------------------------------------
+# Column map (row-level) expectations
+# ---------------------------------------------------------------------------------------------
+@map_evaluator("expect_column_values_to_be_null")
+def _values_to_be_null(df, expectation):
+    return not_null_mask(df, expectation.column), np.ones(len(df), dtype=bool)
+
+
+@map_evaluator("expect_column_values_to_not_be_null")
+def _values_to_not_be_null(df, expectation):
+    return ~not_null_mask(df, expectation.column), np.ones(len(df), dtype=bool)
+
+
+@map_evaluator("expect_column_values_to_be_in_set")
+def _values_to_be_in_set(df, expectation):
+    series = df[expectation.column]
+    domain = not_null_mask(df, expectation.column)
+    in_set = series.isin(list(expectation.value_set or [])).to_numpy(dtype=bool)
+    return domain & ~in_set, domain
+
+
+@map_evaluator("expect_column_values_to_not_be_in_set")
+def _values_to_not_be_in_set(df, expectation):
+    series = df[expectation.column]
+    domain = not_null_mask(df, expectation.column)
+    in_set = series.isin(list(expectation.value_set or [])).to_numpy(dtype=bool)
+    return domain & in_set, domain
+
+
+@map_evaluator("expect_column_values_to_be_between")
+def _values_to_be_between(df, expectation):
+    domain = not_null_mask(df, expectation.column)
+    inside = _in_range(numeric_values(df, expectation.column), expectation.min_value, expectation.max_value,
+                       expectation.strict_min, expectation.strict_max)
+    return domain & ~inside, domain
+
+
+@map_evaluator("expect_column_values_to_be_unique")
+def _values_to_be_unique(df, expectation):
+    domain = not_null_mask(df, expectation.column)
+    counts = value_counts(df, expectation.column)
+    duplicated = df[expectation.column].isin(counts.index[counts > 1]).to_numpy(dtype=bool)
+    return domain & duplicated, domain
+
+
+@map_evaluator("expect_compound_columns_to_be_unique")
+def _compound_columns_to_be_unique(df, expectation):
+    subset = df[list(expectation.column_list)]
+    domain = _ignore_row_mask(subset, expectation.ignore_row_if)
+    duplicated = subset.duplicated(keep=False).to_numpy(dtype=bool)
+    return domain & duplicated, domain
+
+
+@map_evaluator("expect_select_column_values_to_be_unique_within_record")
+def _select_column_values_unique_within_record(df, expectation):
+    subset = df[list(expectation.column_list)]
+    domain = _ignore_row_mask(subset, expectation.ignore_row_if)
+    distinct = subset.nunique(axis=1, dropna=False).to_numpy()
+    return domain & (distinct < subset.shape[1]), domain
+
+
+@map_evaluator("expect_column_pair_values_to_be_equal")
+def _pair_values_to_be_equal(df, expectation):
+    pair = df[[expectation.column_A, expectation.column_B]]
+    domain = _ignore_row_mask(pair, expectation.ignore_row_if)
+    equal = pair.iloc[:, 0].eq(pair.iloc[:, 1]).to_numpy(dtype=bool)
+    return domain & ~equal, domain
+
+
+@map_evaluator("expect_column_pair_values_to_be_in_set")
+def _pair_values_to_be_in_set(df, expectation):
+    pair = df[[expectation.column_A, expectation.column_B]]
+    domain = _ignore_row_mask(pair, expectation.ignore_row_if)
+    allowed = pd.MultiIndex.from_tuples([tuple(p) for p in expectation.value_pairs_set or []])
+    in_set = pd.MultiIndex.from_frame(pair).isin(allowed)
+    return domain & ~in_set, domain
+
+
+@map_evaluator("expect_multicolumn_sum_to_equal")
+def _multicolumn_sum_to_equal(df, expectation):
+    subset = df[list(expectation.column_list)]
+    domain = _ignore_row_mask(subset, expectation.ignore_row_if)
+    totals = subset.apply(as_numeric).sum(axis=1).to_numpy()
+    return domain & (totals != expectation.sum_total), domain
+
+
+@map_evaluator("expect_column_value_lengths_to_be_between")
+def _value_lengths_to_be_between(df, expectation):
+    domain = not_null_mask(df, expectation.column)
+    inside = _in_range(string_lengths(df, expectation.column), expectation.min_value, expectation.max_value,
+                       expectation.strict_min, expectation.strict_max)
+    return domain & ~inside, domain
+
+
+@map_evaluator("expect_column_value_lengths_to_equal")
+def _value_lengths_to_equal(df, expectation):
+    domain = not_null_mask(df, expectation.column)
+    equal = (string_lengths(df, expectation.column) == expectation.value).to_numpy(dtype=bool)
+    return domain & ~equal, domain
+
+
+@map_evaluator("expect_column_values_to_match_regex")
+def _values_to_match_regex(df, expectation):
+    series = df[expectation.column]
+    domain = not_null_mask(df, expectation.column)
+    matched = series.astype(str).str.contains(expectation.regex, regex=True).to_numpy(dtype=bool)
+    return domain & ~matched, domain
+
+
+@map_evaluator("expect_column_values_to_not_match_regex")
+def _values_to_not_match_regex(df, expectation):
+    series = df[expectation.column]
+    domain = not_null_mask(df, expectation.column)
+    matched = series.astype(str).str.contains(expectation.regex, regex=True).to_numpy(dtype=bool)
+    return domain & matched, domain
+
+
+@map_evaluator("expect_column_values_to_match_regex_list")
+def _values_to_match_regex_list(df, expectation):
+    series = df[expectation.column]
+    domain = not_null_mask(df, expectation.column)
+    as_str = series.astype(str)
+    matches = np.column_stack([as_str.str.contains(regex, regex=True).to_numpy(dtype=bool)
+                               for regex in expectation.regex_list])
+    matched = matches.all(axis=1) if expectation.match_on == "all" else matches.any(axis=1)
+    return domain & ~matched, domain
+
+
+@map_evaluator("expect_column_values_to_not_match_regex_list")
+def _values_to_not_match_regex_list(df, expectation):
+    series = df[expectation.column]
+    domain = not_null_mask(df, expectation.column)
+    pattern = "|".join(f"(?:{regex})" for regex in expectation.regex_list)
+    matched = series.astype(str).str.contains(pattern, regex=True).to_numpy(dtype=bool)
+    return domain & matched, domain
+
+
+@map_evaluator("expect_column_value_z_scores_to_be_less_than")
+def _value_z_scores_to_be_less_than(df, expectation):
+    series = numeric_values(df, expectation.column)
+    domain = _not_null(series)
+    z_scores = ((series - series.mean()) / series.std()).to_numpy(dtype=float)
+    if expectation.double_sided:
+        z_scores = np.abs(z_scores)
+    return domain & ~(z_scores < expectation.threshold), domain
+
+
+def _ignore_row_mask(subset: pd.DataFrame, ignore_row_if: Optional[str]) -> np.ndarray:
+    """Rows that belong to the domain of a multi-column expectation (GX `ignore_row_if`)."""
+    missing = subset.isna().to_numpy()
+    if ignore_row_if in ("all_values_are_missing", "both_values_are_missing"):
+        return ~missing.all(axis=1)
+    if ignore_row_if in ("any_value_is_missing", "either_value_is_missing"):
+        return ~missing.any(axis=1)
+    return np.ones(len(subset), dtype=bool)
+
+
+def expectation_type_names(expectation: gxe.Expectation) -> List[str]:
+    """Type names of an ExpectColumnValuesToBeOfType / ExpectColumnValuesToBeInTypeList expectation."""
+    if hasattr(expectation, "type_"):
+        return [expectation.type_]
+    return list(expectation.type_list or [])
+
+
+def type_evaluation(df, expectation, type_names: List[str]):
+    series = df[expectation.column]
+    mask = _type_mask(series, type_names)
+    if mask is None:
+        return None
+    domain = not_null_mask(df, expectation.column)
+    return mask & domain, domain
+
+
+# ---------------------------------------------------------------------------------------------
+# Aggregate (table / column level) expectations
+# ---------------------------------------------------------------------------------------------
+@aggregate_evaluator("expect_column_to_exist")
+def _column_to_exist(df, expectation):
+    return expectation.column in df.columns, list(df.columns)
+
+
+@aggregate_evaluator("expect_table_column_count_to_be_between")
+def _table_column_count_to_be_between(df, expectation):
+    observed = df.shape[1]
+    return between(observed, expectation.min_value, expectation.max_value), observed
+
+
+@aggregate_evaluator("expect_table_columns_to_match_ordered_list")
+def _table_columns_to_match_ordered_list(df, expectation):
+    observed = list(df.columns)
+    return observed == list(expectation.column_list), observed
+
+
+@aggregate_evaluator("expect_table_columns_to_match_set")
+def _table_columns_to_match_set(df, expectation):
+    observed = set(df.columns)
+    expected = set(expectation.column_set or [])
+    if expectation.exact_match is False:
+        return expected.issubset(observed), sorted(observed)
+    return observed == expected, sorted(observed)
+
+
+@aggregate_evaluator("expect_table_row_count_to_be_between")
+def _table_row_count_to_be_between(df, expectation):
+    observed = len(df)
+    return between(observed, expectation.min_value, expectation.max_value,
+                    expectation.strict_min, expectation.strict_max), observed
+
+
+@aggregate_evaluator("expect_table_row_count_to_equal")
+def _table_row_count_to_equal(df, expectation):
+    observed = len(df)
+    return observed == expectation.value, observed
+
+
+# Column aggregates answered from one fused pass per column: expectation type -> statistic
+STATISTIC_EXPECTATIONS = {
+    "expect_column_min_to_be_between": "min",
+    "expect_column_max_to_be_between": "max",
+    "expect_column_mean_to_be_between": "mean",
+    "expect_column_median_to_be_between": "median",
+    "expect_column_sum_to_be_between": "sum",
+    "expect_column_stdev_to_be_between": "stdev",
+    "expect_column_unique_value_count_to_be_between": "unique_count",
+    "expect_column_proportion_of_unique_values_to_be_between": "unique_proportion",
+}
+NUMERIC_STATISTICS = ("min", "max", "mean", "median", "sum", "stdev")
+
+
+def plan_column_statistics(expectations: List[gxe.Expectation]) -> Dict[str, set]:
+    """Groups the statistic expectations by column: {column: statistics its expectations need}."""
+    plan = {}
+    for expectation in expectations:
+        statistic = STATISTIC_EXPECTATIONS.get(expectation.expectation_type)
+        if statistic is None or getattr(expectation, "row_condition", None):
+            continue
+        plan.setdefault(expectation.column, set()).add(statistic)
+    return plan
+
+
+def compute_column_statistics(df: pd.DataFrame, column, statistics: set) -> dict:
+    """
+    Computes the requested statistics of a column together: the column is parsed to numbers
+    once and every numeric statistic is reduced from that one array, the mean shared with the
+    standard deviation. Numeric statistics of a column without numeric values are None.
+    """
+    computed = {}
+    numeric_statistics = statistics.intersection(NUMERIC_STATISTICS)
+    if numeric_statistics:
+        values = numeric_values(df, column).dropna().to_numpy()
+        if values.dtype == object:
+            values = values.astype(float)
+        count = len(values)
+        mean = values.mean() if count and numeric_statistics & {"mean", "stdev"} else None
+        for statistic in numeric_statistics:
+            if not count:
+                observed = None
+            elif statistic == "min":
+                observed = values.min()
+            elif statistic == "max":
+                observed = values.max()
+            elif statistic == "mean":
+                observed = mean
+            elif statistic == "median":
+                observed = np.median(values)
+            elif statistic == "sum":
+                observed = values.sum()
+            else:
+                # Sample standard deviation, NaN for a single value as `Series.std`
+                observed = np.sqrt(((values - mean) ** 2).sum() / (count - 1)) if count > 1 else np.nan
+            computed[statistic] = observed.item() if hasattr(observed, "item") else observed
+    if statistics & {"unique_count", "unique_proportion"}:
+        unique_count = len(value_counts(df, column))
+        non_null = int(not_null_mask(df, column).sum())
+        computed["unique_count"] = unique_count
+        computed["unique_proportion"] = unique_count / non_null if non_null else None
+    return computed
+
+
+def answer_statistic(expectation: gxe.Expectation, statistics: dict) -> Tuple[bool, object]:
+    """(success, observed value) of a statistic expectation, answered from the column statistics."""
+    statistic = STATISTIC_EXPECTATIONS[expectation.expectation_type]
+    observed = statistics[statistic]
+    if observed is None and statistic in NUMERIC_STATISTICS:
+        return False, None
+    return between(observed, expectation.min_value, expectation.max_value,
+                   expectation.strict_min, expectation.strict_max), observed
+
+
+def _statistic_evaluator(statistic: str):
+    def evaluate(df, expectation):
+        return answer_statistic(expectation, compute_column_statistics(df, expectation.column, {statistic}))
+
+    return evaluate
+
+
+# Evaluated on their own (row conditions, failed fused pass, streaming), the column aggregates use the same pass
+for _expectation_type, _statistic in STATISTIC_EXPECTATIONS.items():
+    AGGREGATE_EVALUATORS[_expectation_type] = _statistic_evaluator(_statistic)
+
+
+@aggregate_evaluator("expect_column_quantile_values_to_be_between")
+def _quantile_values_to_be_between(df, expectation):
+    quantile_ranges = expectation.quantile_ranges or {}
+    quantiles = list(quantile_ranges.get("quantiles", []))
+    value_ranges = list(quantile_ranges.get("value_ranges", []))
+    values = numeric_values(df, expectation.column).dropna()
+    if values.empty:
+        return False, {"quantiles": quantiles, "values": []}
+    observed = [v.item() if hasattr(v, "item") else v
+                for v in values.quantile(quantiles, interpolation="nearest").tolist()]
+    success = all(between(value, low, high) for value, (low, high) in zip(observed, value_ranges))
+    return success, {"quantiles": quantiles, "values": observed}
+
+
+@aggregate_evaluator("expect_column_distinct_values_to_be_in_set")
+def _distinct_values_to_be_in_set(df, expectation):
+    observed = set(value_counts(df, expectation.column).index.tolist())
+    return observed.issubset(set(expectation.value_set or [])), sorted(observed, key=str)
+
+
+@aggregate_evaluator("expect_column_distinct_values_to_contain_set")
+def _distinct_values_to_contain_set(df, expectation):
+    observed = set(value_counts(df, expectation.column).index.tolist())
+    return set(expectation.value_set or []).issubset(observed), sorted(observed, key=str)
+
+
+@aggregate_evaluator("expect_column_distinct_values_to_equal_set")
+def _distinct_values_to_equal_set(df, expectation):
+    observed = set(value_counts(df, expectation.column).index.tolist())
+    return observed == set(expectation.value_set or []), sorted(observed, key=str)
+
+
+@aggregate_evaluator("expect_column_most_common_value_to_be_in_set")
+def _most_common_value_to_be_in_set(df, expectation):
+    counts = value_counts(df, expectation.column)
+    modes = counts.index[counts == counts.max()] if len(counts) else counts.index
+    try:
+        modes = modes.sort_values()
+    except TypeError:
+        pass
+    modes = modes.tolist()
+    value_set = set(expectation.value_set or [])
+    if expectation.ties_okay:
+        success = any(mode in value_set for mode in modes)
+    else:
+        success = len(modes) == 1 and modes[0] in value_set
+    return success, modes
+
+
+# ---------------------------------------------------------------------------------------------
+# Validator
+# ---------------------------------------------------------------------------------------------
+def build_expectation_result(expectation: gxe.Expectation, success: bool, result: dict,
+                             exception: Exception = None) -> dict:
+    """Wraps an evaluation in the dict shape of a GX ExpectationValidationResult."""
+    return {
+        "success": success,
+        "expectation_config": expectation.configuration.to_json_dict(),
+        "result": result,
+        "meta": {},
+        "exception_info": {
+            "raised_exception": exception is not None,
+            "exception_message": str(exception) if exception is not None else None,
+            "exception_traceback": None,
+        },
+    }
+
+
+def build_checkpoint_result(results: List[dict], suite_name: str, validation_definition_name: str,
+                            engine: str = "native") -> "NativeCheckpointResult":
+    """Wraps expectation results in a single-validation CheckpointResult stand-in."""
+    successful = sum(1 for result in results if result["success"])
+    run_id = str(uuid.uuid4())
+    validation_result = {
+        "success": successful == len(results),
+        "results": results,
+        "suite_name": suite_name,
+        "statistics": {
+            "evaluated_expectations": len(results),
+            "successful_expectations": successful,
+            "unsuccessful_expectations": len(results) - successful,
+            "success_percent": successful / len(results) * 100 if results else None,
+        },
+        "meta": {
+            "engine": engine,
+            "run_id": {"run_name": run_id, "run_time": datetime.datetime.now().isoformat()},
+        },
+    }
+    return NativeCheckpointResult({validation_definition_name: validation_result}, run_id)
+
+
+class NativeCheckpointResult:
+    """
+    Lightweight stand-in for the GX CheckpointResult, exposing the same `run_results`
+    mapping so `Parse_GXValidator` and `ValidationProcessor.run` consume it unchanged.
+    """
+
+    def __init__(self, run_results: dict, run_id: str):
+        self.run_results = run_results
+        self.run_id = run_id
+        self.success = all(result["success"] for result in run_results.values())
+
+    def describe_dict(self) -> dict:
+        return {"success": self.success, "run_id": self.run_id,
+                "validation_results": list(self.run_results.values())}
+
+
+class NativeDataValidator:
+    def __init__(self,
+                 dataframe: pd.DataFrame,
+                 data_source_name: str = "DEFAULT_SOURCE_NAME",
+                 data_asset_name: str = "DEFAULT_ASSET_NAME",
+                 expectation_suite_name: str = "DEFAULT_SUITE_NAME",
+                 checkpoint_name: str = "DEFAULT_CHECKPOINT_NAME",
+                 validation_definition_name: str = "DEFAULT_VALIDATION_NAME",
+                 docs_build_action: bool = False,
+                 site_name: str = "DEFAULT_SITE_NAME",
+                 fingerprint: str = None,
+                 instrumentation=None,
+                 metric_cache: MetricCache = None):
+        """
+        Evaluates expectations directly on the DataFrame as NumPy/pandas boolean masks.
+        Takes the same arguments as `DataValidator`, which is used as the fallback for any
+        expectation this engine does not cover, plus an optional `Instrumentation` timing
+        every expectation and the run's `MetricCache`, from which the expectations draw the
+        null masks, value counts, string lengths and numeric values of their columns.
+        """
+        self.df = dataframe
+        self.data_source_name = data_source_name
+        self.data_asset_name = data_asset_name
+        self.expectation_suite_name = expectation_suite_name
+        self.checkpoint_name = checkpoint_name
+        self.validation_definition_name = validation_definition_name
+        self.docs_build_action = docs_build_action
+        self.site_name = site_name
+        self.fingerprint = fingerprint
+        self.instrumentation = instrumentation
+        self.metric_cache = metric_cache if metric_cache is not None else MetricCache()
+        # {column: statistics}, computed by `plan_statistics` before the expectations are evaluated
+        self.column_statistics = {}
+
+    def plan_statistics(self, expectations: List[gxe.Expectation]) -> None:
+        """
+        Groups the aggregate expectations by column and computes all the statistics a column needs
+        in one fused pass, so its min / max / mean / sum / stdev / ... checks share a single scan.
+        """
+        self.column_statistics = {}
+        for column, statistics in plan_column_statistics(expectations).items():
+            if column not in self.df.columns:
+                continue
+            try:
+                if self.instrumentation is None:
+                    self.column_statistics[column] = compute_column_statistics(self.df, column, statistics)
+                    continue
+                with self.instrumentation.stage("column_statistics", rows=len(self.df), column=column,
+                                                statistics=",".join(sorted(statistics))):
+                    self.column_statistics[column] = compute_column_statistics(self.df, column, statistics)
+            except Exception as e:
+                # The expectations of the column are then evaluated, and fail, on their own
+                logger.error(f"Error while computing the statistics of column {column}: {e}")
+
+    def evaluate_expectations(self, expectations: List[gxe.Expectation]) -> List[dict]:
+        """
+        Evaluates the expectations in order, each measured as an 'expectation' stage when instrumented.
+        Column statistics are computed up front, one pass per column, by `plan_statistics`, and
+        derived column data is shared through the metric cache.
+        """
+        with self.metric_cache.bind(self.df):
+            self.plan_statistics(expectations)
+            if self.instrumentation is None:
+                return [self.evaluate_expectation(expectation) for expectation in expectations]
+            results = []
+            for expectation in expectations:
+                with self.instrumentation.stage("expectation", rows=len(self.df),
+                                                expectation=expectation.expectation_type,
+                                                column=getattr(expectation, "column", None) or ""):
+                    results.append(self.evaluate_expectation(expectation))
+            return results
+
+    def evaluate_expectation(self, expectation: gxe.Expectation) -> dict:
+        """Evaluates a single expectation and returns a GX-shaped expectation validation result."""
+        expectation_type = expectation.expectation_type
+        try:
+            if expectation_type in TYPE_EXPECTATIONS:
+                return self._evaluate_type(expectation)
+            if expectation_type in MAP_EVALUATORS:
+                unexpected_mask, domain_mask = MAP_EVALUATORS[expectation_type](self.df, expectation)
+                return self._map_result(expectation, unexpected_mask, domain_mask)
+            statistics = self.column_statistics.get(getattr(expectation, "column", None))
+            if statistics is not None and expectation_type in STATISTIC_EXPECTATIONS:
+                success, observed_value = answer_statistic(expectation, statistics)
+            else:
+                success, observed_value = AGGREGATE_EVALUATORS[expectation_type](self.df, expectation)
+            return build_expectation_result(expectation, bool(success),
+                                            apply_result_format({"observed_value": observed_value},
+                                                                expectation_result_format(expectation)))
+        except Exception as e:
+            logger.error(f"Error while evaluating {expectation_type}: {e}")
+            return build_expectation_result(expectation, False, {}, exception=e)
+
+    def _evaluate_type(self, expectation: gxe.Expectation) -> dict:
+        type_names = expectation_type_names(expectation)
+        evaluation = type_evaluation(self.df, expectation, type_names)
+        if evaluation is not None:
+            return self._map_result(expectation, *evaluation)
+        series = self.df[expectation.column]
+        return build_expectation_result(expectation, dtype_matches(series, type_names),
+                                        apply_result_format({"observed_value": dtype_name(series)},
+                                                            expectation_result_format(expectation)))
+
+    def _map_result(self, expectation: gxe.Expectation, unexpected_mask: np.ndarray, domain_mask: np.ndarray,
+                    decided: Tuple[int, int, int] = (0, 0, 0)) -> dict:
+        """
+        Builds the map-expectation result at the detail its result_format asks for. Unexpected
+        values and index labels are only materialized for the levels that report them.
+        `decided` adds the (element, missing, unexpected) counts of rows evaluated outside this
+        frame, e.g. Parquet row groups answered from their statistics.
+        """
+        result_format = expectation_result_format(expectation)
+        level = result_format["result_format"]
+        element_count = len(self.df) + decided[0]
+        domain_count = int(domain_mask.sum()) + decided[0] - decided[1]
+        missing_count = element_count - domain_count
+        unexpected_count = int(np.count_nonzero(unexpected_mask)) + decided[2]
+        success = mostly_success(unexpected_count, domain_count, getattr(expectation, "mostly", None))
+        if level == "BOOLEAN_ONLY":
+            return build_expectation_result(expectation, success, {})
+
+        result = {
+            "element_count": element_count,
+            "missing_count": missing_count,
+            "missing_percent": missing_count / element_count * 100 if element_count else None,
+            "unexpected_count": unexpected_count,
+            "unexpected_percent": unexpected_count / domain_count * 100 if domain_count else None,
+            "unexpected_percent_total": unexpected_count / element_count * 100 if element_count else None,
+            "unexpected_percent_nonmissing": unexpected_count / domain_count * 100 if domain_count else None,
+        }
+
+        cap = result_format["partial_unexpected_count"]
+        with_values = not result_format["exclude_unexpected_values"]
+        unexpected_positions = np.flatnonzero(unexpected_mask)
+        partial_positions = unexpected_positions[:cap]
+        column = getattr(expectation, "column", None)
+        has_column = column is not None and column in self.df.columns
+
+        def unexpected_values(positions):
+            if has_column:
+                return self.df[column].iloc[positions]
+            return pd.Series(self.df.index[positions])
+
+        if with_values:
+            result["partial_unexpected_list"] = unexpected_values(partial_positions).tolist()
+        if level in ("SUMMARY", "COMPLETE"):
+            result["partial_unexpected_index_list"] = self.df.index[partial_positions].tolist()
+            if with_values and cap > 0:
+                counts = unexpected_values(unexpected_positions).value_counts().head(cap)
+                result["partial_unexpected_counts"] = [{"value": value, "count": int(count)}
+                                                       for value, count in counts.items()]
+        if level == "COMPLETE":
+            result["unexpected_index_list"] = self.df.index[unexpected_positions].tolist()
+            if with_values:
+                result["unexpected_list"] = unexpected_values(unexpected_positions).tolist()
+
+        return build_expectation_result(expectation, success, result)
+
+    def run_fallback(self, expectations: List[gxe.Expectation]):
+        """Runs the expectations the native engine does not cover through Great Expectations."""
+        from src.validators.validate import DataValidator
+
+        logger.info(f"Falling back to Great Expectations for {len(expectations)} expectation(s).")
+        gx_validator = DataValidator(
+            dataframe=self.df,
+            data_source_name=self.data_source_name,
+            data_asset_name=self.data_asset_name,
+            expectation_suite_name=self.expectation_suite_name,
+            checkpoint_name=self.checkpoint_name,
+            validation_definition_name=self.validation_definition_name,
+            docs_build_action=self.docs_build_action,
+            site_name=self.site_name,
+            fingerprint=self.fingerprint
+        )
+        checkpoint_result, context = gx_validator.validate(expectations)
+        validation_result = checkpoint_result.run_results[list(checkpoint_result.run_results.keys())[0]]
+        return list(validation_result["results"]), context
+
+    def validate(self, expectations: List[gxe.Expectation]):
+        """Evaluates all supported expectations natively and the rest through GX."""
+        native = [expectation for expectation in expectations if is_supported(expectation)]
+        fallback = [expectation for expectation in expectations if not is_supported(expectation)]
+
+        results = self.evaluate_expectations(native)
+        logger.debug(f"Native engine evaluated {len(native)} expectation(s), metric cache: {self.metric_cache.stats()}.")
+
+        context = None
+        if fallback:
+            if self.instrumentation is None:
+                fallback_results, context = self.run_fallback(fallback)
+            else:
+                with self.instrumentation.stage("gx_fallback", rows=len(self.df), expectations=len(fallback)):
+                    fallback_results, context = self.run_fallback(fallback)
+            results.extend(fallback_results)
+
+        # Results in the order of the suite, the fallback ones merged back into their positions
+        order = {id(expectation): position for position, expectation in enumerate(native + fallback)}
+        results = [results[order[id(expectation)]] for expectation in expectations]
+        return build_checkpoint_result(results, self.expectation_suite_name, self.validation_definition_name), context
@@ -0,0 +1,253 @@
+import logging
+from typing import List, Optional, Tuple
+
+import great_expectations.expectations as gxe
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.utils.parquet_stats import read_row_group_statistics
+from src.utils.result_format import apply_result_format, expectation_result_format
+from src.validators.native_validate import (
+    MAP_EVALUATORS,
+    NativeDataValidator,
+    as_numeric,
+    between,
+    build_checkpoint_result,
+    build_expectation_result,
+)
+
+# Setup logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# Expectations answered from the row-group statistics of the Parquet footer where they are conclusive
+STATISTICS_EXPECTATIONS = (
+    "expect_column_min_to_be_between",
+    "expect_column_max_to_be_between",
+    "expect_column_values_to_be_between",
+    "expect_column_values_to_not_be_null",
+    "expect_table_row_count_to_be_between",
+)
+
+NUMERIC_KINDS = ("integer", "floating")
+
+
+def is_answerable_from_statistics(expectation: gxe.Expectation) -> bool:
+    """Return True when the footer statistics can (at least partly) answer the expectation."""
+    return (expectation.expectation_type in STATISTICS_EXPECTATIONS
+            and not getattr(expectation, "row_condition", None))
+
+
+def row_group_counts(expectation: gxe.Expectation, kind: str, row_group: dict) -> Optional[Tuple[int, int]]:
+    """
+    (missing, unexpected) counts of a map expectation in one row group, proven from its statistics,
+    or None when only decoding the row group can tell.
+    """
+    statistics = row_group["columns"].get(expectation.column)
+    if statistics is None or statistics["null_count"] is None:
+        return None
+    null_count = statistics["null_count"]
+    non_null = row_group["num_rows"] - null_count
+
+    if expectation.expectation_type == "expect_column_values_to_not_be_null":
+        # NaN are nulls to pandas but are not in the Parquet null_count
+        if kind == "floating":
+            return None
+        return 0, null_count
+
+    if non_null == 0:
+        return null_count, 0
+    if kind not in NUMERIC_KINDS or statistics["min"] is None:
+        return None
+    if kind == "floating" and expectation.mostly is not None:
+        # The domain would count the NaN the statistics cannot see
+        return None
+    bounds = (expectation.min_value, expectation.max_value, expectation.strict_min, expectation.strict_max)
+    if between(statistics["min"], *bounds) and between(statistics["max"], *bounds):
+        return null_count, 0
+    below = not between(statistics["max"], expectation.min_value, None, expectation.strict_min)
+    above = not between(statistics["min"], None, expectation.max_value, False, expectation.strict_max)
+    if kind == "integer" and (below or above):
+        return null_count, non_null
+    return None
+
+
+class ParquetStatisticsValidator:
+    def __init__(self,
+                 file_path: str,
+                 dataframe: pd.DataFrame = None,
+                 data_source_name: str = "DEFAULT_SOURCE_NAME",
+                 data_asset_name: str = "DEFAULT_ASSET_NAME",
+                 expectation_suite_name: str = "DEFAULT_SUITE_NAME",
+                 checkpoint_name: str = "DEFAULT_CHECKPOINT_NAME",
+                 validation_definition_name: str = "DEFAULT_VALIDATION_NAME",
+                 docs_build_action: bool = False,
+                 site_name: str = "DEFAULT_SITE_NAME",
+                 fingerprint: str = None,
+                 instrumentation=None,
+                 metric_cache=None):
+        """
+        Answers min / max / values-between / not-null / row-count expectations of a Parquet file from
+        its row-group statistics first, and decodes only the row groups whose statistics leave the
+        answer open (or whose failing rows must be reported). Other expectations go to
+        `NativeDataValidator` on `dataframe`, or on the file read in full when no frame is given.
+
+        :param file_path: The Parquet file.
+        :param dataframe: The file already loaded (RangeIndex), used instead of decoding row groups.
+        The remaining arguments are those of `NativeDataValidator`.
+        """
+        self.file_path = file_path
+        self.df = dataframe
+        self.data_source_name = data_source_name
+        self.data_asset_name = data_asset_name
+        self.expectation_suite_name = expectation_suite_name
+        self.checkpoint_name = checkpoint_name
+        self.validation_definition_name = validation_definition_name
+        self.docs_build_action = docs_build_action
+        self.site_name = site_name
+        self.fingerprint = fingerprint
+        self.instrumentation = instrumentation
+        self.metric_cache = metric_cache
+        self.statistics = None
+        self.decoded_row_groups = set()
+
+    def footer(self) -> dict:
+        """Row-group statistics of the file, read once."""
+        if self.statistics is None:
+            self.statistics = read_row_group_statistics(self.file_path)
+        return self.statistics
+
+    def read_row_groups(self, indices: List[int], column: str) -> pd.DataFrame:
+        """One column of the given row groups, indexed by row position in the file."""
+        row_groups = self.footer()["row_groups"]
+        positions = np.concatenate([np.arange(row_groups[index]["offset"],
+                                              row_groups[index]["offset"] + row_groups[index]["num_rows"])
+                                    for index in indices] or [np.arange(0)])
+        self.decoded_row_groups.update(indices)
+        if self.df is not None:
+            return self.df[[column]].iloc[positions]
+        frame = pq.ParquetFile(self.file_path).read_row_groups(indices, columns=[column]).to_pandas()
+        frame.index = positions
+        return frame
+
+    def column_kind(self, column: str) -> str:
+        kind = self.footer()["columns"].get(column)
+        if kind is None:
+            raise KeyError(column)
+        return kind
+
+    def evaluate_expectation(self, expectation: gxe.Expectation) -> dict:
+        """Evaluates a single statistics expectation and returns a GX-shaped expectation validation result."""
+        expectation_type = expectation.expectation_type
+        try:
+            if expectation_type == "expect_table_row_count_to_be_between":
+                observed = self.footer()["num_rows"]
+                success = between(observed, expectation.min_value, expectation.max_value,
+                                  expectation.strict_min, expectation.strict_max)
+                return self._aggregate_result(expectation, success, observed)
+            if expectation_type == "expect_column_min_to_be_between":
+                return self._evaluate_statistic(expectation, "min")
+            if expectation_type == "expect_column_max_to_be_between":
+                return self._evaluate_statistic(expectation, "max")
+            return self._evaluate_map(expectation)
+        except Exception as e:
+            logger.error(f"Error while evaluating {expectation_type}: {e}")
+            return build_expectation_result(expectation, False, {}, exception=e)
+
+    def _aggregate_result(self, expectation: gxe.Expectation, success: bool, observed) -> dict:
+        return build_expectation_result(expectation, bool(success),
+                                        apply_result_format({"observed_value": observed},
+                                                            expectation_result_format(expectation)))
+
+    def _evaluate_statistic(self, expectation: gxe.Expectation, statistic: str) -> dict:
+        """Column min / max: the extreme of the row-group statistics and of the row groups decoded for lack of them."""
+        column = expectation.column
+        kind = self.column_kind(column)
+        candidates, undecided = [], []
+        for index, row_group in enumerate(self.footer()["row_groups"]):
+            statistics = row_group["columns"].get(column, {})
+            if kind in NUMERIC_KINDS and statistics.get("null_count") == row_group["num_rows"]:
+                continue
+            if kind in NUMERIC_KINDS and statistics.get(statistic) is not None:
+                candidates.append(statistics[statistic])
+            else:
+                undecided.append(index)
+
+        if undecided:
+            values = as_numeric(self.read_row_groups(undecided, column)[column]).dropna()
+            if not values.empty:
+                observed = values.min() if statistic == "min" else values.max()
+                candidates.append(observed.item() if hasattr(observed, "item") else observed)
+        if not candidates:
+            return self._aggregate_result(expectation, False, None)
+
+        observed = min(candidates) if statistic == "min" else max(candidates)
+        success = between(observed, expectation.min_value, expectation.max_value,
+                          expectation.strict_min, expectation.strict_max)
+        return self._aggregate_result(expectation, success, observed)
+
+    def _evaluate_map(self, expectation: gxe.Expectation) -> dict:
+        """
+        Row-level expectations: row groups proven by their statistics only add to the counts; the
+        rest, and those with failing rows when the result_format reports rows, are decoded.
+        """
+        kind = self.column_kind(expectation.column)
+        reports_rows = expectation_result_format(expectation)["result_format"] != "BOOLEAN_ONLY"
+        decided = np.zeros(3, dtype=np.int64)
+        undecided = []
+        for index, row_group in enumerate(self.footer()["row_groups"]):
+            counts = row_group_counts(expectation, kind, row_group)
+            if counts is None or (counts[1] and reports_rows):
+                undecided.append(index)
+                continue
+            decided += (row_group["num_rows"], *counts)
+
+        subset = self.read_row_groups(undecided, expectation.column)
+        unexpected_mask, domain_mask = MAP_EVALUATORS[expectation.expectation_type](subset, expectation)
+        return NativeDataValidator(subset)._map_result(expectation, unexpected_mask, domain_mask,
+                                                       tuple(int(count) for count in decided))
+
+    def validate(self, expectations: List[gxe.Expectation]):
+        """Answers the statistics expectations from the footer and evaluates the rest natively."""
+        answerable = [expectation for expectation in expectations if is_answerable_from_statistics(expectation)]
+        remaining = [expectation for expectation in expectations if not is_answerable_from_statistics(expectation)]
+
+        results = []
+        for expectation in answerable:
+            if self.instrumentation is None:
+                results.append(self.evaluate_expectation(expectation))
+                continue
+            with self.instrumentation.stage("expectation", rows=self.footer()["num_rows"],
+                                            expectation=expectation.expectation_type,
+                                            column=getattr(expectation, "column", None) or "", source="statistics"):
+                results.append(self.evaluate_expectation(expectation))
+        row_groups = len(self.footer()["row_groups"]) if answerable else 0
+        logger.info(f"Parquet statistics answered {len(answerable)} expectation(s), "
+                    f"decoding {len(self.decoded_row_groups)} of {row_groups} row group(s).")
+
+        context = None
+        if remaining:
+            if self.df is None:
+                self.df = pd.read_parquet(self.file_path)
+            native_validator = NativeDataValidator(
+                dataframe=self.df,
+                data_source_name=self.data_source_name,
+                data_asset_name=self.data_asset_name,
+                expectation_suite_name=self.expectation_suite_name,
+                checkpoint_name=self.checkpoint_name,
+                validation_definition_name=self.validation_definition_name,
+                docs_build_action=self.docs_build_action,
+                site_name=self.site_name,
+                fingerprint=self.fingerprint,
+                instrumentation=self.instrumentation,
+                metric_cache=self.metric_cache
+            )
+            native_result, context = native_validator.validate(remaining)
+            results.extend(native_result.run_results[self.validation_definition_name]["results"])
+
+        checkpoint_result = build_checkpoint_result(results, self.expectation_suite_name,
+                                                    self.validation_definition_name, engine="parquet_statistics")
+        checkpoint_result.run_results[self.validation_definition_name]["meta"]["row_groups"] = {
+            "total": row_groups, "decoded": sorted(self.decoded_row_groups)}
+        return checkpoint_result, context
@@ -0,0 +1,351 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import great_expectations.expectations as gxe
+
+from src.utils.result_format import apply_result_format, expectation_result_format
+from src.validators.native_validate import (
+    between,
+    build_checkpoint_result,
+    build_expectation_result,
+    expectation_type_names,
+    mostly_success,
+)
+
+try:
+    from pyspark.sql import DataFrame, Window
+    from pyspark.sql import functions as F
+except ImportError:  # optional: only needed for the Spark backend
+    DataFrame = Window = F = None
+
+# Setup logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# Row-level expectations compiled to (domain, unexpected) Spark column conditions
+SPARK_MAP_EXPECTATIONS = (
+    "expect_column_values_to_not_be_null",
+    "expect_column_values_to_be_null",
+    "expect_column_values_to_be_in_set",
+    "expect_column_values_to_not_be_in_set",
+    "expect_column_values_to_be_between",
+    "expect_column_value_lengths_to_be_between",
+    "expect_column_value_lengths_to_equal",
+    "expect_column_values_to_match_regex",
+    "expect_column_values_to_not_match_regex",
+    "expect_column_values_to_be_unique",
+)
+
+# Table / column aggregates compiled to Spark aggregate functions (or answered from the schema)
+SPARK_AGGREGATE_EXPECTATIONS = (
+    "expect_table_row_count_to_be_between",
+    "expect_table_row_count_to_equal",
+    "expect_column_min_to_be_between",
+    "expect_column_max_to_be_between",
+    "expect_column_mean_to_be_between",
+    "expect_column_sum_to_be_between",
+    "expect_column_stdev_to_be_between",
+    "expect_column_unique_value_count_to_be_between",
+    "expect_column_proportion_of_unique_values_to_be_between",
+)
+SPARK_SCHEMA_EXPECTATIONS = (
+    "expect_column_to_exist",
+    "expect_table_column_count_to_be_between",
+    "expect_table_columns_to_match_ordered_list",
+    "expect_table_columns_to_match_set",
+)
+# Type expectations answered from the column types of the schema: every value of a Spark column has its type
+SPARK_TYPE_EXPECTATIONS = (
+    "expect_column_values_to_be_of_type",
+    "expect_column_values_to_be_in_type_list",
+)
+
+# Type names of the user YAML (NumPy / pandas or Spark) -> Spark type (`DataFrame.dtypes` form)
+SPARK_TYPE_NAMES = {
+    "int64": "bigint", "int32": "int", "int16": "smallint", "int8": "tinyint",
+    "float64": "double", "float32": "float", "bool": "boolean",
+    "object": "string", "str": "string", "string": "string",
+    "datetime64[ns]": "timestamp", "datetime64": "timestamp",
+    "LongType": "bigint", "IntegerType": "int", "ShortType": "smallint", "ByteType": "tinyint",
+    "DoubleType": "double", "FloatType": "float", "BooleanType": "boolean", "StringType": "string",
+    "TimestampType": "timestamp", "DateType": "date", "BinaryType": "binary",
+}
+
+# Prefix of the helper columns added while validating (dropped from every output)
+HELPER_PREFIX = "__dq_"
+
+
+def is_spark_supported(expectation: gxe.Expectation) -> bool:
+    """Return True when the expectation compiles to Spark column expressions."""
+    if getattr(expectation, "row_condition", None):
+        return False
+    expectation_type = expectation.expectation_type
+    return expectation_type in (SPARK_MAP_EXPECTATIONS + SPARK_AGGREGATE_EXPECTATIONS + SPARK_SCHEMA_EXPECTATIONS
+                                + SPARK_TYPE_EXPECTATIONS)
+
+
+class SparkDataValidator:
+    def __init__(self,
+                 dataframe: "DataFrame",
+                 expectation_suite_name: str = "DEFAULT_SUITE_NAME",
+                 validation_definition_name: str = "DEFAULT_VALIDATION_NAME"):
+        """
+        Evaluates expectations on a Spark DataFrame: every expectation becomes column expressions
+        of a single `agg`, computed across the executors in one pass. Row-level failures are not
+        collected to the driver; `partition` returns them as filtered DataFrames. Only a sample of
+        the unexpected values (`partial_unexpected_count`) is collected for the results.
+        """
+        if F is None:
+            raise ImportError("pyspark is not installed")
+        self.df = dataframe
+        self.expectation_suite_name = expectation_suite_name
+        self.validation_definition_name = validation_definition_name
+        self.expectations: List[gxe.Expectation] = []
+        self.prepared = None
+
+    def prepare(self, compiled: List[Tuple[int, gxe.Expectation]]) -> "DataFrame":
+        """The input with the helper columns some conditions need (value counts of uniqueness checks)."""
+        prepared = self.df
+        for position, expectation in compiled:
+            if expectation.expectation_type == "expect_column_values_to_be_unique":
+                prepared = prepared.withColumn(
+                    f"{HELPER_PREFIX}count_{position}",
+                    F.count(F.lit(1)).over(Window.partitionBy(F.col(expectation.column))))
+        return prepared
+
+    def missing(self, column_name: str):
+        """Null test of a column; NaN counts as missing in floating columns, as it does in pandas."""
+        column = F.col(column_name)
+        if dict(self.df.dtypes).get(column_name) in ("float", "double"):
+            return column.isNull() | F.isnan(column)
+        return column.isNull()
+
+    def conditions(self, position: int, expectation: gxe.Expectation):
+        """(domain, unexpected) boolean columns of a row-level expectation; unexpected is never null."""
+        expectation_type = expectation.expectation_type
+        column = F.col(expectation.column)
+        not_null = ~self.missing(expectation.column)
+
+        if expectation_type == "expect_column_values_to_not_be_null":
+            return F.lit(True), ~not_null
+        if expectation_type == "expect_column_values_to_be_null":
+            return F.lit(True), not_null
+        if expectation_type in ("expect_column_values_to_be_in_set", "expect_column_values_to_not_be_in_set"):
+            in_set = column.isin(list(expectation.value_set or []))
+            if expectation_type == "expect_column_values_to_be_in_set":
+                in_set = ~in_set
+            return not_null, not_null & F.coalesce(in_set, F.lit(False))
+        if expectation_type in ("expect_column_values_to_be_between", "expect_column_value_lengths_to_be_between"):
+            value = column.cast("double") if expectation_type == "expect_column_values_to_be_between" \
+                else F.length(column.cast("string"))
+            inside = F.lit(True)
+            if expectation.min_value is not None:
+                inside = inside & (value > expectation.min_value if expectation.strict_min
+                                   else value >= expectation.min_value)
+            if expectation.max_value is not None:
+                inside = inside & (value < expectation.max_value if expectation.strict_max
+                                   else value <= expectation.max_value)
+            # A value that cannot be compared (null after the cast) is outside the range, as in the native engine
+            return not_null, not_null & ~F.coalesce(inside, F.lit(False))
+        if expectation_type == "expect_column_value_lengths_to_equal":
+            return not_null, not_null & (F.length(column.cast("string")) != expectation.value)
+        if expectation_type in ("expect_column_values_to_match_regex", "expect_column_values_to_not_match_regex"):
+            matched = column.cast("string").rlike(expectation.regex)
+            if expectation_type == "expect_column_values_to_match_regex":
+                matched = ~matched
+            return not_null, not_null & F.coalesce(matched, F.lit(False))
+        if expectation_type == "expect_column_values_to_be_unique":
+            return not_null, not_null & (F.col(f"{HELPER_PREFIX}count_{position}") > 1)
+        raise KeyError(expectation_type)
+
+    def compile(self, compiled: List[Tuple[int, gxe.Expectation]]) -> Tuple[list, Dict[int, Dict[str, int]]]:
+        """
+        Aggregate columns of one `agg` and, per position of an expectation in the suite, the
+        positions of its aggregates in the result row.
+        """
+        aggregates = [F.count(F.lit(1))]
+        positions = {}
+
+        def add(aggregate) -> int:
+            aggregates.append(aggregate)
+            return len(aggregates) - 1
+
+        for position, expectation in compiled:
+            expectation_type = expectation.expectation_type
+            if expectation_type in SPARK_MAP_EXPECTATIONS:
+                domain, unexpected = self.conditions(position, expectation)
+                positions[position] = {
+                    "rows": 0,
+                    "domain": add(F.sum(F.when(domain, 1).otherwise(0))),
+                    "unexpected": add(F.sum(F.when(unexpected, 1).otherwise(0))),
+                }
+            elif expectation_type in SPARK_AGGREGATE_EXPECTATIONS and getattr(expectation, "column", None):
+                # NaN become null so they are skipped by the aggregates, as pandas skips them
+                column = F.when(~self.missing(expectation.column), F.col(expectation.column))
+                value = column.cast("double")
+                positions[position] = {
+                    "count": add(F.count(value)),
+                    "non_null": add(F.count(column)),
+                    "distinct": add(F.countDistinct(column)),
+                    "min": add(F.min(value)),
+                    "max": add(F.max(value)),
+                    "sum": add(F.sum(value)),
+                    "mean": add(F.avg(value)),
+                    "stdev": add(F.stddev_samp(value)),
+                }
+            else:
+                positions[position] = {"rows": 0}
+        return aggregates, positions
+
+    def validate(self, expectations: List[gxe.Expectation]):
+        """
+        Evaluates the expectations in one distributed aggregation. An expectation the Spark backend
+        does not support fails on its own with a NotImplementedError result, like a missing column.
+        Returns (CheckpointResult-shaped summary, None) like the other engines.
+        """
+        self.expectations = expectations
+        dtypes = dict(self.df.dtypes)
+        columns = list(dtypes)
+        unsupported = {position for position, expectation in enumerate(expectations)
+                       if not is_spark_supported(expectation)}
+        missing = {position for position, expectation in enumerate(expectations)
+                   if expectation.expectation_type not in SPARK_SCHEMA_EXPECTATIONS
+                   and getattr(expectation, "column", None) is not None and expectation.column not in columns}
+        compiled = [(position, expectation) for position, expectation in enumerate(expectations)
+                    if position not in missing and position not in unsupported]
+        self.prepared = self.prepare(compiled)
+
+        aggregates, positions = self.compile(compiled)
+        row = self.prepared.agg(*aggregates).first()
+
+        results = []
+        for position, expectation in enumerate(expectations):
+            if position in unsupported:
+                logger.error(f"{expectation.expectation_type} is not supported by the Spark backend.")
+                results.append(build_expectation_result(expectation, False, {}, exception=NotImplementedError(
+                    f"{expectation.expectation_type} is not supported by the Spark backend")))
+                continue
+            if position in missing:
+                results.append(build_expectation_result(expectation, False, {},
+                                                        exception=KeyError(expectation.column)))
+                continue
+            values = {name: row[index] for name, index in positions[position].items()}
+            try:
+                if expectation.expectation_type in SPARK_MAP_EXPECTATIONS:
+                    results.append(self._map_result(position, expectation, values))
+                else:
+                    success, observed = self._answer_aggregate(expectation, values, dtypes)
+                    results.append(build_expectation_result(
+                        expectation, bool(success),
+                        apply_result_format({"observed_value": observed}, expectation_result_format(expectation))))
+            except Exception as e:
+                logger.error(f"Error while evaluating {expectation.expectation_type}: {e}")
+                results.append(build_expectation_result(expectation, False, {}, exception=e))
+
+        logger.info(f"Spark backend evaluated {len(compiled)} expectation(s) in one aggregation.")
+        return build_checkpoint_result(results, self.expectation_suite_name, self.validation_definition_name,
+                                       engine="spark"), None
+
+    @staticmethod
+    def _answer_aggregate(expectation: gxe.Expectation, values: dict, dtypes: dict):
+        expectation_type = expectation.expectation_type
+        columns = list(dtypes)
+        if expectation_type in SPARK_TYPE_EXPECTATIONS:
+            observed = dtypes[expectation.column]
+            expected = [SPARK_TYPE_NAMES.get(type_name, type_name) for type_name in expectation_type_names(expectation)]
+            return observed in expected, observed
+        if expectation_type == "expect_column_to_exist":
+            return expectation.column in columns, columns
+        if expectation_type == "expect_table_column_count_to_be_between":
+            return between(len(columns), expectation.min_value, expectation.max_value), len(columns)
+        if expectation_type == "expect_table_columns_to_match_ordered_list":
+            return columns == list(expectation.column_list), columns
+        if expectation_type == "expect_table_columns_to_match_set":
+            expected = set(expectation.column_set or [])
+            if expectation.exact_match is False:
+                return expected.issubset(columns), sorted(columns)
+            return set(columns) == expected, sorted(columns)
+        if expectation_type == "expect_table_row_count_to_be_between":
+            return between(values["rows"], expectation.min_value, expectation.max_value,
+                           expectation.strict_min, expectation.strict_max), values["rows"]
+        if expectation_type == "expect_table_row_count_to_equal":
+            return values["rows"] == expectation.value, values["rows"]
+
+        if expectation_type == "expect_column_unique_value_count_to_be_between":
+            observed = values["distinct"]
+        elif expectation_type == "expect_column_proportion_of_unique_values_to_be_between":
+            observed = values["distinct"] / values["non_null"] if values["non_null"] else None
+        elif expectation_type == "expect_column_min_to_be_between":
+            observed = values["min"]
+        elif expectation_type == "expect_column_max_to_be_between":
+            observed = values["max"]
+        elif expectation_type == "expect_column_sum_to_be_between":
+            observed = values["sum"] if values["count"] else None
+        elif expectation_type == "expect_column_mean_to_be_between":
+            observed = values["mean"]
+        else:
+            observed = values["stdev"]
+        return between(observed, expectation.min_value, expectation.max_value,
+                       expectation.strict_min, expectation.strict_max), observed
+
+    def _map_result(self, position: int, expectation: gxe.Expectation, values: dict) -> dict:
+        """Counts of a row-level expectation, with a sample of its unexpected values; no row indices."""
+        result_format = expectation_result_format(expectation)
+        level = result_format["result_format"]
+        element_count = values["rows"]
+        domain_count = int(values["domain"] or 0)
+        unexpected_count = int(values["unexpected"] or 0)
+        missing_count = element_count - domain_count
+        success = mostly_success(unexpected_count, domain_count, getattr(expectation, "mostly", None))
+        if level == "BOOLEAN_ONLY":
+            return build_expectation_result(expectation, success, {})
+
+        result = {
+            "element_count": element_count,
+            "missing_count": missing_count,
+            "missing_percent": missing_count / element_count * 100 if element_count else None,
+            "unexpected_count": unexpected_count,
+            "unexpected_percent": unexpected_count / domain_count * 100 if domain_count else None,
+            "unexpected_percent_total": unexpected_count / element_count * 100 if element_count else None,
+            "unexpected_percent_nonmissing": unexpected_count / domain_count * 100 if domain_count else None,
+        }
+        cap = result_format["partial_unexpected_count"]
+        if not result_format["exclude_unexpected_values"]:
+            sample = []
+            if unexpected_count and cap > 0:
+                _, unexpected = self.conditions(position, expectation)
+                sample = [row[0] for row in self.prepared.filter(unexpected)
+                          .select(expectation.column).limit(cap).collect()]
+            result["partial_unexpected_list"] = sample
+        return build_expectation_result(expectation, success, result)
+
+    def unexpected_rows(self, position: int) -> "DataFrame":
+        """The rows failing the row-level expectation at `position` of the validated suite, as a DataFrame."""
+        _, unexpected = self.conditions(position, self.expectations[position])
+        return self.without_helpers(self.prepared.filter(unexpected))
+
+    def without_helpers(self, dataframe: "DataFrame") -> "DataFrame":
+        return dataframe.drop(*[column for column in dataframe.columns if column.startswith(HELPER_PREFIX)])
+
+    def partition(self, failures: List[Tuple[str, Optional[str], int]]) -> Tuple["DataFrame", "DataFrame"]:
+        """
+        Splits the input by the failing expectations, lazily and without collecting any row.
+
+        :param failures: (expectation name, column, position in the validated suite) of every
+            failing row-level expectation whose action is 'skip'.
+        :return: (invalid rows, one per (row, failed expectation) annotated with
+            expectation_failed_name / expectation_failed_column; valid rows).
+        """
+        if not failures:
+            return None, self.without_helpers(self.prepared)
+
+        invalid_df = None
+        any_unexpected = F.lit(False)
+        for name, column, position in failures:
+            _, unexpected = self.conditions(position, self.expectations[position])
+            any_unexpected = any_unexpected | unexpected
+            annotated = (self.prepared.filter(unexpected)
+                         .withColumn("expectation_failed_name", F.lit(name))
+                         .withColumn("expectation_failed_column", F.lit(column).cast("string")))
+            invalid_df = annotated if invalid_df is None else invalid_df.unionByName(annotated)
+        return self.without_helpers(invalid_df), self.without_helpers(self.prepared.filter(~any_unexpected))
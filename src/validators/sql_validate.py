@@ -0,0 +1,578 @@
+import logging
+import math
+import re
+import sqlite3
+from typing import List, Optional, Tuple
+
+import great_expectations.expectations as gxe
+import pandas as pd
+
+from src.config.settings import SQL_BACKEND
+from src.utils.result_format import apply_result_format, expectation_result_format
+from src.validators.native_validate import (
+    NativeDataValidator,
+    between,
+    build_checkpoint_result,
+    build_expectation_result,
+    mostly_success,
+)
+
+try:
+    import duckdb
+except ImportError:  # optional: SQLite is used without it
+    duckdb = None
+
+# Setup logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# Name of the relation the expectations are compiled against
+SOURCE_VIEW = "dq_source"
+
+# Row-level expectations compiled to a (domain, unexpected) pair of SQL conditions
+SQL_MAP_EXPECTATIONS = (
+    "expect_column_values_to_not_be_null",
+    "expect_column_values_to_be_null",
+    "expect_column_values_to_be_in_set",
+    "expect_column_values_to_not_be_in_set",
+    "expect_column_values_to_be_between",
+    "expect_column_value_lengths_to_be_between",
+    "expect_column_value_lengths_to_equal",
+    "expect_column_values_to_match_regex",
+    "expect_column_values_to_not_match_regex",
+    "expect_column_values_to_be_unique",
+)
+
+# Table / column aggregates compiled to aggregate expressions (or answered from the relation's columns)
+SQL_AGGREGATE_EXPECTATIONS = (
+    "expect_table_row_count_to_be_between",
+    "expect_table_row_count_to_equal",
+    "expect_column_min_to_be_between",
+    "expect_column_max_to_be_between",
+    "expect_column_mean_to_be_between",
+    "expect_column_sum_to_be_between",
+    "expect_column_stdev_to_be_between",
+    "expect_column_unique_value_count_to_be_between",
+    "expect_column_proportion_of_unique_values_to_be_between",
+)
+SQL_SCHEMA_EXPECTATIONS = (
+    "expect_column_to_exist",
+    "expect_table_column_count_to_be_between",
+    "expect_table_columns_to_match_ordered_list",
+    "expect_table_columns_to_match_set",
+)
+
+
+# Static DuckDB column types whose values compare with Python numbers (DECIMAL(p, s) is matched by prefix)
+DUCKDB_NUMERIC_TYPES = ("TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT", "UTINYINT", "USMALLINT",
+                        "UINTEGER", "UBIGINT", "UHUGEINT", "FLOAT", "DOUBLE", "DECIMAL")
+
+
+def is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def is_compilable(expectation: gxe.Expectation) -> bool:
+    """Return True when the expectation compiles to SQL."""
+    if getattr(expectation, "row_condition", None):
+        return False
+    expectation_type = expectation.expectation_type
+    if expectation_type == "expect_column_values_to_be_between":
+        # Values are compared as numbers; other bounds (e.g. dates) are left to the native engine
+        return all(bound is None or is_number(bound) for bound in (expectation.min_value, expectation.max_value))
+    return expectation_type in SQL_MAP_EXPECTATIONS + SQL_AGGREGATE_EXPECTATIONS + SQL_SCHEMA_EXPECTATIONS
+
+
+def quote_identifier(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def in_list(expression: str, values: list) -> str:
+    return f"{expression} IN ({', '.join('?' for _ in values)})" if values else "1 = 0"
+
+
+def split_value_set(values: list) -> Tuple[list, list]:
+    """(numbers, other values) of a value set: like `Series.isin`, a number never matches a string."""
+    return [value for value in values if isinstance(value, (int, float))], \
+        [value for value in values if not isinstance(value, (int, float))]
+
+
+def _to_number(value):
+    """SQLite counterpart of `as_numeric`: numbers and numeric strings, everything else NULL."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _regexp(pattern, value) -> Optional[bool]:
+    """SQLite REGEXP operator with the search semantics of `Series.str.contains`."""
+    if value is None:
+        return None
+    return re.search(pattern, str(value)) is not None
+
+
+class SQLiteDialect:
+    """Embedded SQLite: a frame is copied into an in-memory table; regex and numeric parsing are Python functions."""
+    name = "sqlite"
+
+    def __init__(self, connection: sqlite3.Connection = None):
+        self.connection = connection or sqlite3.connect(":memory:")
+        self.connection.create_function("dq_number", 1, _to_number, deterministic=True)
+        self.connection.create_function("regexp", 2, _regexp, deterministic=True)
+
+    def register_frame(self, dataframe: pd.DataFrame) -> None:
+        dataframe.to_sql("dq_frame", self.connection, index=False, if_exists="replace")
+        self.register_table("dq_frame")
+
+    def register_table(self, table: str) -> None:
+        # The rowid keeps the row order visible through the view
+        self.connection.execute(f"DROP VIEW IF EXISTS {SOURCE_VIEW}")
+        self.connection.execute(f"CREATE TEMP VIEW {SOURCE_VIEW} AS SELECT rowid AS dq_rowid, * "
+                                f"FROM {quote_identifier(table)}")
+
+    def fetch_frame(self) -> pd.DataFrame:
+        frame = pd.read_sql_query(f"SELECT * FROM {SOURCE_VIEW} ORDER BY dq_rowid", self.connection)
+        return frame.drop(columns="dq_rowid")
+
+    def numeric(self, column: str) -> str:
+        return f"dq_number({column})"
+
+    def membership(self, column: str, column_type, values: list) -> Tuple[str, list]:
+        # Every stored value keeps its own type, whatever the column affinity: numbers are compared
+        # with the numbers of the set and text with the rest, so '1' is not in {1}
+        numbers, others = split_value_set(values)
+        return (f"((typeof({column}) IN ('integer', 'real') AND {in_list(column, numbers)}) "
+                f"OR (typeof({column}) = 'text' AND {in_list(column, others)}))"), numbers + others
+
+    def text(self, column: str) -> str:
+        return f"CAST({column} AS TEXT)"
+
+    def regex(self, column: str, placeholder: str) -> str:
+        return f"{self.text(column)} REGEXP {placeholder}"
+
+    def position(self) -> str:
+        return "row_number() OVER (ORDER BY dq_rowid) - 1"
+
+    def execute(self, sql: str, params: list = ()):
+        return self.connection.execute(sql, params)
+
+
+class DuckDBDialect:
+    """Embedded DuckDB: frames are scanned without a copy, by its multithreaded columnar engine."""
+    name = "duckdb"
+
+    def __init__(self, connection=None):
+        if duckdb is None:
+            raise ImportError("duckdb is not installed")
+        self.connection = connection or duckdb.connect()
+
+    def register_frame(self, dataframe: pd.DataFrame) -> None:
+        # The row numbers are joined by position: a window without ORDER BY has no defined row order
+        self.connection.register("dq_frame", dataframe)
+        self.connection.register("dq_frame_rowids", pd.DataFrame({"dq_rowid": range(len(dataframe))}))
+        self.connection.execute(f"CREATE OR REPLACE TEMP VIEW {SOURCE_VIEW} AS SELECT dq_frame_rowids.dq_rowid, "
+                                f"dq_frame.* FROM dq_frame POSITIONAL JOIN dq_frame_rowids")
+
+    def register_table(self, table: str) -> None:
+        self.connection.execute(f"CREATE OR REPLACE TEMP VIEW {SOURCE_VIEW} AS SELECT rowid AS dq_rowid, * "
+                                f"FROM {quote_identifier(table)}")
+
+    def fetch_frame(self) -> pd.DataFrame:
+        return self.connection.execute(f"SELECT * EXCLUDE (dq_rowid) FROM {SOURCE_VIEW} ORDER BY dq_rowid").df()
+
+    def numeric(self, column: str) -> str:
+        return f"TRY_CAST({column} AS DOUBLE)"
+
+    def membership(self, column: str, column_type, values: list) -> Tuple[str, list]:
+        # A literal is cast to the column type, which fails for 'x' against a number: only the values
+        # of the column's kind are compared, the others cannot match (as with `Series.isin`)
+        numbers, others = split_value_set(values)
+        column_type = str(column_type)
+        if column_type.startswith(DUCKDB_NUMERIC_TYPES):
+            return in_list(column, numbers), numbers
+        if column_type == "VARCHAR":
+            return in_list(column, others), others
+        return in_list(column, values), values
+
+    def text(self, column: str) -> str:
+        return f"CAST({column} AS VARCHAR)"
+
+    def regex(self, column: str, placeholder: str) -> str:
+        return f"regexp_matches({self.text(column)}, {placeholder})"
+
+    def position(self) -> str:
+        return "row_number() OVER (ORDER BY dq_rowid) - 1"
+
+    def execute(self, sql: str, params: list = ()):
+        return self.connection.execute(sql, list(params))
+
+
+def make_dialect(backend: str = SQL_BACKEND, connection=None):
+    """The dialect of `backend` ('duckdb', 'sqlite' or 'auto': DuckDB when installed)."""
+    if backend == "auto":
+        backend = "duckdb" if duckdb is not None else "sqlite"
+    if backend == "duckdb":
+        return DuckDBDialect(connection)
+    if backend == "sqlite":
+        return SQLiteDialect(connection)
+    raise ValueError(f"Unknown SQL backend '{backend}'. Available: ['auto', 'duckdb', 'sqlite']")
+
+
+class QueryBuilder:
+    """Collects the aggregate expressions of one SELECT with their bind parameters."""
+
+    def __init__(self):
+        self.expressions: List[str] = []
+        self.params: list = []
+
+    def add(self, expression: str, params: list = ()) -> int:
+        """Adds an aggregate expression and returns its position in the result row."""
+        self.expressions.append(expression)
+        self.params.extend(params)
+        return len(self.expressions) - 1
+
+    def sql(self) -> str:
+        return f"SELECT {', '.join(self.expressions)} FROM {SOURCE_VIEW}"
+
+
+class SQLDataValidator:
+    def __init__(self,
+                 dataframe: pd.DataFrame = None,
+                 data_source_name: str = "DEFAULT_SOURCE_NAME",
+                 data_asset_name: str = "DEFAULT_ASSET_NAME",
+                 expectation_suite_name: str = "DEFAULT_SUITE_NAME",
+                 checkpoint_name: str = "DEFAULT_CHECKPOINT_NAME",
+                 validation_definition_name: str = "DEFAULT_VALIDATION_NAME",
+                 docs_build_action: bool = False,
+                 site_name: str = "DEFAULT_SITE_NAME",
+                 fingerprint: str = None,
+                 instrumentation=None,
+                 backend: str = SQL_BACKEND,
+                 connection=None,
+                 table: str = None):
+        """
+        Compiles the expectations into one aggregate SQL statement over the input and runs it on an
+        embedded engine: every expectation becomes counts / min / max / distinct counts / set and
+        regex predicates in the same scan. Only the failing row-level expectations whose
+        result_format reports rows query their rows. Expectations that do not compile go to
+        `NativeDataValidator`.
+
+        The input is `connection` + `table` (a local database, scanned in place) or `dataframe`.
+
+        :param backend: 'duckdb', 'sqlite' or 'auto' (DuckDB when installed).
+        :param connection: An open sqlite3 / duckdb connection holding `table`.
+        :param table: Table of `connection` to validate.
+        The remaining arguments are those of `NativeDataValidator`.
+        """
+        self.df = dataframe
+        self.data_source_name = data_source_name
+        self.data_asset_name = data_asset_name
+        self.expectation_suite_name = expectation_suite_name
+        self.checkpoint_name = checkpoint_name
+        self.validation_definition_name = validation_definition_name
+        self.docs_build_action = docs_build_action
+        self.site_name = site_name
+        self.fingerprint = fingerprint
+        self.instrumentation = instrumentation
+        self.dialect = make_dialect(backend, connection)
+        self.table = table
+        self.columns = None
+        self.column_types = None
+
+    def register_source(self) -> None:
+        """Exposes the input as the SOURCE_VIEW relation and reads its columns."""
+        if self.table is not None:
+            self.dialect.register_table(self.table)
+        elif self.df is not None:
+            self.dialect.register_frame(self.df)
+        else:
+            raise ValueError("SQLDataValidator needs a table or a dataframe")
+        cursor = self.dialect.execute(f"SELECT * FROM {SOURCE_VIEW} LIMIT 0")
+        # SQLite has no column types (None): its values are typed one by one
+        self.column_types = {description[0]: description[1] for description in cursor.description
+                             if description[0] != "dq_rowid"}
+        self.columns = list(self.column_types)
+
+    def conditions(self, expectation: gxe.Expectation) -> Tuple[str, str, list]:
+        """(domain condition, unexpected condition, bind parameters) of a row-level expectation."""
+        expectation_type = expectation.expectation_type
+        column = quote_identifier(expectation.column)
+        not_null = f"{column} IS NOT NULL"
+
+        if expectation_type == "expect_column_values_to_not_be_null":
+            return "1 = 1", f"{column} IS NULL", []
+        if expectation_type == "expect_column_values_to_be_null":
+            return "1 = 1", not_null, []
+        if expectation_type in ("expect_column_values_to_be_in_set", "expect_column_values_to_not_be_in_set"):
+            membership, values = self.dialect.membership(column, self.column_types.get(expectation.column),
+                                                         list(expectation.value_set or []))
+            if expectation_type == "expect_column_values_to_be_in_set":
+                membership = f"NOT ({membership})"
+            return not_null, f"{not_null} AND {membership}", values
+        if expectation_type in ("expect_column_values_to_be_between", "expect_column_value_lengths_to_be_between"):
+            value = self.dialect.numeric(column) if expectation_type == "expect_column_values_to_be_between" \
+                else f"LENGTH({self.dialect.text(column)})"
+            inside, params = ["1 = 1"], []
+            if expectation.min_value is not None:
+                inside.append(f"{value} {'>' if expectation.strict_min else '>='} ?")
+                params.append(expectation.min_value)
+            if expectation.max_value is not None:
+                inside.append(f"{value} {'<' if expectation.strict_max else '<='} ?")
+                params.append(expectation.max_value)
+            # A value that cannot be compared (NULL) is outside the range, as in the native engine
+            return not_null, f"{not_null} AND NOT COALESCE({' AND '.join(inside)}, 0 = 1)", params
+        if expectation_type == "expect_column_value_lengths_to_equal":
+            return not_null, f"{not_null} AND LENGTH({self.dialect.text(column)}) <> ?", [expectation.value]
+        if expectation_type in ("expect_column_values_to_match_regex", "expect_column_values_to_not_match_regex"):
+            matched = self.dialect.regex(column, "?")
+            if expectation_type == "expect_column_values_to_match_regex":
+                matched = f"NOT ({matched})"
+            return not_null, f"{not_null} AND {matched}", [expectation.regex]
+        if expectation_type == "expect_column_values_to_be_unique":
+            duplicated = (f"{column} IN (SELECT {column} FROM {SOURCE_VIEW} WHERE {not_null} "
+                          f"GROUP BY {column} HAVING COUNT(*) > 1)")
+            return not_null, f"{not_null} AND {duplicated}", []
+        raise KeyError(expectation_type)
+
+    def compile(self, expectations: List[gxe.Expectation]) -> Tuple[QueryBuilder, dict]:
+        """Compiles the expectations into one SELECT; returns it and the result positions of each expectation."""
+        query = QueryBuilder()
+        row_count = query.add("COUNT(*)")
+        positions = {}
+        for position, expectation in enumerate(expectations):
+            expectation_type = expectation.expectation_type
+            if expectation_type in SQL_SCHEMA_EXPECTATIONS or expectation_type in (
+                    "expect_table_row_count_to_be_between", "expect_table_row_count_to_equal"):
+                positions[position] = {"rows": row_count}
+            elif expectation_type in SQL_MAP_EXPECTATIONS:
+                domain, unexpected, params = self.conditions(expectation)
+                positions[position] = {
+                    "rows": row_count,
+                    "domain": query.add(f"SUM(CASE WHEN {domain} THEN 1 ELSE 0 END)"),
+                    "unexpected": query.add(f"SUM(CASE WHEN {unexpected} THEN 1 ELSE 0 END)", params),
+                }
+            else:
+                column = quote_identifier(expectation.column)
+                value = self.dialect.numeric(column)
+                positions[position] = {
+                    "count": query.add(f"COUNT({value})"),
+                    "non_null": query.add(f"COUNT({column})"),
+                    "distinct": query.add(f"COUNT(DISTINCT {column})"),
+                    "min": query.add(f"MIN({value})"),
+                    "max": query.add(f"MAX({value})"),
+                    "sum": query.add(f"SUM({value})"),
+                }
+                if expectation_type == "expect_column_stdev_to_be_between":
+                    # Deviations from the column mean (an uncorrelated subquery, evaluated once): the
+                    # textbook SUM(x*x) - SUM(x)^2/n cancels catastrophically on large magnitudes
+                    deviation = f"({value} - (SELECT AVG({value}) FROM {SOURCE_VIEW}))"
+                    positions[position]["deviation_sum"] = query.add(f"SUM({deviation})")
+                    positions[position]["deviation_squares"] = query.add(f"SUM({deviation} * {deviation})")
+        return query, positions
+
+    def query_values(self, expectations: List[gxe.Expectation]) -> List[dict]:
+        """Runs the expectations as one compiled statement; returns the values of each expectation."""
+        query, positions = self.compile(expectations)
+        if self.instrumentation is None:
+            row = self.dialect.execute(query.sql(), query.params).fetchone()
+        else:
+            with self.instrumentation.stage("sql_query", expectations=len(expectations), backend=self.dialect.name):
+                row = self.dialect.execute(query.sql(), query.params).fetchone()
+        return [{name: row[index] for name, index in positions[position].items()}
+                for position in range(len(expectations))]
+
+    def evaluate(self, expectations: List[gxe.Expectation]) -> Tuple[List[dict], List[gxe.Expectation]]:
+        """
+        Runs the compiled statement and builds the result of every expectation from its row. When the
+        statement fails (e.g. a value the engine cannot compare with the column type), each expectation
+        runs in its own statement. Returns the results, in order, and the expectations whose statement
+        still fails, left to the native engine.
+        """
+        # A missing column would fail the whole statement, so those expectations fail on their own
+        missing = {position: expectation.column for position, expectation in enumerate(expectations)
+                   if expectation.expectation_type not in SQL_SCHEMA_EXPECTATIONS
+                   and getattr(expectation, "column", None) is not None and expectation.column not in self.columns}
+        compiled = [expectation for position, expectation in enumerate(expectations) if position not in missing]
+        try:
+            compiled_values = self.query_values(compiled)
+        except Exception as e:
+            logger.warning(f"SQL statement failed, the {len(compiled)} expectation(s) are run one by one: {e}")
+            compiled_values = []
+            for expectation in compiled:
+                try:
+                    compiled_values.extend(self.query_values([expectation]))
+                except Exception as e:
+                    logger.error(f"{expectation.expectation_type} does not run on {self.dialect.name}: {e}")
+                    compiled_values.append(None)
+
+        results, failed = [], []
+        compiled_values = iter(compiled_values)
+        for position, expectation in enumerate(expectations):
+            if position in missing:
+                results.append(build_expectation_result(expectation, False, {}, exception=KeyError(missing[position])))
+                continue
+            values = next(compiled_values)
+            if values is None:
+                failed.append(expectation)
+                continue
+            try:
+                if expectation.expectation_type in SQL_MAP_EXPECTATIONS:
+                    results.append(self._map_result(expectation, values))
+                else:
+                    success, observed = self._answer_aggregate(expectation, values)
+                    results.append(build_expectation_result(
+                        expectation, bool(success),
+                        apply_result_format({"observed_value": observed}, expectation_result_format(expectation))))
+            except Exception as e:
+                logger.error(f"Error while evaluating {expectation.expectation_type}: {e}")
+                results.append(build_expectation_result(expectation, False, {}, exception=e))
+        return results, failed
+
+    def _answer_aggregate(self, expectation: gxe.Expectation, values: dict):
+        expectation_type = expectation.expectation_type
+        columns = self.columns
+
+        if expectation_type == "expect_column_to_exist":
+            return expectation.column in columns, columns
+        if expectation_type == "expect_table_column_count_to_be_between":
+            return between(len(columns), expectation.min_value, expectation.max_value), len(columns)
+        if expectation_type == "expect_table_columns_to_match_ordered_list":
+            return columns == list(expectation.column_list), columns
+        if expectation_type == "expect_table_columns_to_match_set":
+            expected = set(expectation.column_set or [])
+            if expectation.exact_match is False:
+                return expected.issubset(columns), sorted(columns)
+            return set(columns) == expected, sorted(columns)
+        if expectation_type == "expect_table_row_count_to_be_between":
+            return between(values["rows"], expectation.min_value, expectation.max_value,
+                           expectation.strict_min, expectation.strict_max), values["rows"]
+        if expectation_type == "expect_table_row_count_to_equal":
+            return values["rows"] == expectation.value, values["rows"]
+
+        count = values["count"]
+        if expectation_type == "expect_column_unique_value_count_to_be_between":
+            observed = values["distinct"]
+        elif expectation_type == "expect_column_proportion_of_unique_values_to_be_between":
+            observed = values["distinct"] / values["non_null"] if values["non_null"] else None
+        elif expectation_type == "expect_column_min_to_be_between":
+            observed = values["min"]
+        elif expectation_type == "expect_column_max_to_be_between":
+            observed = values["max"]
+        elif expectation_type == "expect_column_sum_to_be_between":
+            observed = values["sum"] if count else None
+        elif expectation_type == "expect_column_mean_to_be_between":
+            observed = values["sum"] / count if count else None
+        else:
+            # Sample standard deviation (ddof=1), as pandas `Series.std`
+            if count < 2:
+                observed = None
+            else:
+                # Corrected two-pass formula; the deviation sum only carries the rounding of the mean
+                variance = (values["deviation_squares"] - values["deviation_sum"] ** 2 / count) / (count - 1)
+                observed = math.sqrt(max(variance, 0.0))
+        return between(observed, expectation.min_value, expectation.max_value,
+                       expectation.strict_min, expectation.strict_max), observed
+
+    def _map_result(self, expectation: gxe.Expectation, values: dict) -> dict:
+        """Row-level result at the detail its result_format asks for; failing rows are queried only when reported."""
+        result_format = expectation_result_format(expectation)
+        level = result_format["result_format"]
+        element_count = values["rows"]
+        domain_count = int(values["domain"] or 0)
+        unexpected_count = int(values["unexpected"] or 0)
+        missing_count = element_count - domain_count
+        success = mostly_success(unexpected_count, domain_count, getattr(expectation, "mostly", None))
+        if level == "BOOLEAN_ONLY":
+            return build_expectation_result(expectation, success, {})
+
+        result = {
+            "element_count": element_count,
+            "missing_count": missing_count,
+            "missing_percent": missing_count / element_count * 100 if element_count else None,
+            "unexpected_count": unexpected_count,
+            "unexpected_percent": unexpected_count / domain_count * 100 if domain_count else None,
+            "unexpected_percent_total": unexpected_count / element_count * 100 if element_count else None,
+            "unexpected_percent_nonmissing": unexpected_count / domain_count * 100 if domain_count else None,
+        }
+        cap = result_format["partial_unexpected_count"]
+        with_values = not result_format["exclude_unexpected_values"]
+        if unexpected_count:
+            rows = self.unexpected_rows(expectation, None if level == "COMPLETE" else cap)
+        else:
+            rows = []
+        positions = [position for position, _ in rows]
+        labels = self.df.index[positions].tolist() if self.df is not None else positions
+
+        if with_values:
+            result["partial_unexpected_list"] = [value for _, value in rows[:cap]]
+        if level in ("SUMMARY", "COMPLETE"):
+            result["partial_unexpected_index_list"] = labels[:cap]
+            if with_values and cap > 0:
+                result["partial_unexpected_counts"] = self.unexpected_counts(expectation, cap) if unexpected_count else []
+        if level == "COMPLETE":
+            result["unexpected_index_list"] = labels
+            if with_values:
+                result["unexpected_list"] = [value for _, value in rows]
+        return build_expectation_result(expectation, success, result)
+
+    def unexpected_rows(self, expectation: gxe.Expectation, limit: Optional[int]) -> List[tuple]:
+        """(row position, value) of the failing rows of a row-level expectation, in row order."""
+        _, unexpected, params = self.conditions(expectation)
+        sql = (f"SELECT dq_position, {quote_identifier(expectation.column)} FROM "
+               f"(SELECT {self.dialect.position()} AS dq_position, * FROM {SOURCE_VIEW}) AS dq_positioned "
+               f"WHERE {unexpected} ORDER BY dq_position")
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return [(int(position), value) for position, value in self.dialect.execute(sql, params).fetchall()]
+
+    def unexpected_counts(self, expectation: gxe.Expectation, limit: int) -> List[dict]:
+        _, unexpected, params = self.conditions(expectation)
+        column = quote_identifier(expectation.column)
+        # Like `Series.value_counts`, NULL values are not counted
+        sql = (f"SELECT {column}, COUNT(*) FROM {SOURCE_VIEW} WHERE ({unexpected}) AND {column} IS NOT NULL "
+               f"GROUP BY {column} ORDER BY 2 DESC LIMIT {int(limit)}")
+        return [{"value": value, "count": int(count)} for value, count in self.dialect.execute(sql, params).fetchall()]
+
+    def validate(self, expectations: List[gxe.Expectation]):
+        """
+        Evaluates the compilable expectations in one query and the rest natively, together with those
+        the SQL engine failed to run.
+        """
+        compiled = [expectation for expectation in expectations if is_compilable(expectation)]
+        remaining = [expectation for expectation in expectations if not is_compilable(expectation)]
+
+        self.register_source()
+        results, failed = self.evaluate(compiled) if compiled else ([], [])
+        if failed:
+            failed_ids = {id(expectation) for expectation in failed}
+            compiled = [expectation for expectation in compiled if id(expectation) not in failed_ids]
+            remaining = failed + remaining
+        logger.info(f"SQL engine ({self.dialect.name}) evaluated {len(compiled)} expectation(s) in one query.")
+
+        context = None
+        if remaining:
+            if self.df is None:
+                self.df = self.dialect.fetch_frame()
+            native_validator = NativeDataValidator(
+                dataframe=self.df,
+                data_source_name=self.data_source_name,
+                data_asset_name=self.data_asset_name,
+                expectation_suite_name=self.expectation_suite_name,
+                checkpoint_name=self.checkpoint_name,
+                validation_definition_name=self.validation_definition_name,
+                docs_build_action=self.docs_build_action,
+                site_name=self.site_name,
+                fingerprint=self.fingerprint,
+                instrumentation=self.instrumentation
+            )
+            native_result, context = native_validator.validate(remaining)
+            results.extend(native_result.run_results[self.validation_definition_name]["results"])
+
+        # Results in the order of the suite, as the other engines return them
+        order = {id(expectation): position for position, expectation in enumerate(compiled + remaining)}
+        results = [results[order[id(expectation)]] for expectation in expectations]
+        return build_checkpoint_result(results, self.expectation_suite_name, self.validation_definition_name,
+                                       engine=f"sql_{self.dialect.name}"), context
@@ -0,0 +1,451 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import great_expectations.expectations as gxe
+import numpy as np
+import pandas as pd
+
+from src.config.settings import SKETCH_DISTINCT_ERROR, SKETCH_QUANTILE_ERROR
+from src.utils.result_format import apply_result_format, expectation_result_format
+from src.utils.sketches import DistinctCounter, MomentsAccumulator, QuantileSketch, canonical_hashes
+from src.validators.native_validate import (
+    AGGREGATE_EVALUATORS,
+    MAP_EVALUATORS,
+    PARTIAL_UNEXPECTED_COUNT,
+    TYPE_EXPECTATIONS,
+    as_numeric,
+    between,
+    build_checkpoint_result,
+    build_expectation_result,
+    dtype_matches,
+    dtype_name,
+    expectation_type_names,
+    mostly_success,
+    type_evaluation,
+)
+
+# Setup logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# Row-level expectations that need to see the whole input. A first pass (`count_keys`) collects the
+# hashes of the values occurring more than once, then every occurrence of them is flagged, as in
+# the native engine.
+UNIQUENESS_EXPECTATIONS = ("expect_column_values_to_be_unique", "expect_compound_columns_to_be_unique")
+
+# Column aggregates answered from a quantile sketch, a distinct counter, or exact value counts.
+QUANTILE_EXPECTATIONS = ("expect_column_median_to_be_between", "expect_column_quantile_values_to_be_between")
+DISTINCT_COUNT_EXPECTATIONS = ("expect_column_unique_value_count_to_be_between",
+                               "expect_column_proportion_of_unique_values_to_be_between")
+VALUE_COUNT_EXPECTATIONS = (
+    "expect_column_distinct_values_to_be_in_set",
+    "expect_column_distinct_values_to_contain_set",
+    "expect_column_distinct_values_to_equal_set",
+    "expect_column_most_common_value_to_be_in_set",
+)
+
+
+def is_streamable(expectation: gxe.Expectation) -> bool:
+    """Return True when the expectation can be evaluated chunk by chunk."""
+    expectation_type = expectation.expectation_type
+    if getattr(expectation, "row_condition", None):
+        return False
+    if expectation_type == "expect_column_value_z_scores_to_be_less_than":
+        # needs the final mean and stdev before any row can be judged
+        return False
+    return (expectation_type in MAP_EVALUATORS or expectation_type in AGGREGATE_EVALUATORS
+            or expectation_type in TYPE_EXPECTATIONS)
+
+
+class ColumnState:
+    """
+    Running statistics of one column, merged chunk by chunk.
+    Quantiles and distinct counts use the sketches in `src.utils.sketches`; with
+    `approximate=False` those fall back to their exact modes.
+    """
+
+    def __init__(self, approximate: bool = False, quantile_error: float = SKETCH_QUANTILE_ERROR,
+                 distinct_error: float = SKETCH_DISTINCT_ERROR):
+        self.approximate = approximate
+        self.quantile_error = quantile_error
+        self.distinct_error = distinct_error
+        self.count = 0
+        self.null_count = 0
+        self.moments = MomentsAccumulator()
+        self.quantiles: Optional[QuantileSketch] = None
+        self.distinct: Optional[DistinctCounter] = None
+        self.value_counts: Optional[pd.Series] = None
+
+    def track(self, expectation_type: str) -> None:
+        """Enables the extra accumulators an aggregate expectation needs."""
+        if expectation_type in QUANTILE_EXPECTATIONS and self.quantiles is None:
+            self.quantiles = QuantileSketch(self.quantile_error, exact=not self.approximate)
+        elif expectation_type in DISTINCT_COUNT_EXPECTATIONS and self.distinct is None:
+            self.distinct = DistinctCounter(self.distinct_error, exact=not self.approximate)
+        elif expectation_type in VALUE_COUNT_EXPECTATIONS and self.value_counts is None:
+            self.value_counts = pd.Series(dtype="int64")
+
+    def update(self, series: pd.Series) -> None:
+        non_null = series.dropna()
+        self.count += len(non_null)
+        self.null_count += len(series) - len(non_null)
+
+        numeric = as_numeric(non_null).to_numpy(dtype=float, na_value=np.nan)
+        self.moments.update(numeric)
+        if self.quantiles is not None:
+            self.quantiles.update(numeric)
+        if self.distinct is not None:
+            self.distinct.update(non_null)
+        if self.value_counts is not None:
+            self.value_counts = self.value_counts.add(non_null.value_counts(), fill_value=0)
+
+    def merge(self, other: "ColumnState") -> "ColumnState":
+        """Merges the state of the same column computed on another partition."""
+        self.count += other.count
+        self.null_count += other.null_count
+        self.moments.merge(other.moments)
+        if self.quantiles is not None and other.quantiles is not None:
+            self.quantiles.merge(other.quantiles)
+        if self.distinct is not None and other.distinct is not None:
+            self.distinct.merge(other.distinct)
+        if self.value_counts is not None and other.value_counts is not None:
+            self.value_counts = self.value_counts.add(other.value_counts, fill_value=0)
+        return self
+
+
+class RowExpectationState:
+    """Counts and partial lists of a row-level expectation, accumulated across chunks."""
+
+    def __init__(self):
+        self.element_count = 0
+        self.domain_count = 0
+        self.unexpected_count = 0
+        self.partial_unexpected_list = []
+        self.partial_unexpected_index_list = []
+        self.observed_dtype = None
+        self.dtype_success = True
+        self.exception = None
+        # Sorted hashes of the values of a uniqueness expectation, and of those seen more than once
+        self.seen_hashes = np.array([], dtype=np.uint64)
+        self.duplicate_hashes = np.array([], dtype=np.uint64)
+
+
+class StreamingDataValidator:
+    def __init__(self,
+                 expectations: List[gxe.Expectation],
+                 expectation_suite_name: str = "DEFAULT_SUITE_NAME",
+                 validation_definition_name: str = "DEFAULT_VALIDATION_NAME",
+                 approximate: bool = False,
+                 quantile_error: float = SKETCH_QUANTILE_ERROR,
+                 distinct_error: float = SKETCH_DISTINCT_ERROR):
+        """
+        Evaluates expectations over a file read in chunks.
+        Row-level expectations are evaluated per chunk and return their masks to the caller,
+        table-level expectations are folded into running state and answered by `finalize`.
+        With `approximate=True` quantiles and distinct counts come from KLL / HyperLogLog
+        sketches bounded by `quantile_error` / `distinct_error` instead of exact state.
+
+        Uniqueness expectations need every chunk passed to `count_keys` before the first one is
+        validated. They keep 8 bytes per distinct value (row, for compound columns) of their
+        columns, twice while a chunk is merged in: about 160 MB for 10 million distinct MMSIs.
+        """
+        unsupported = [expectation.expectation_type for expectation in expectations if not is_streamable(expectation)]
+        if unsupported:
+            raise ValueError(f"Expectations not supported in streaming mode: {unsupported}")
+
+        self.expectations = expectations
+        self.expectation_suite_name = expectation_suite_name
+        self.validation_definition_name = validation_definition_name
+
+        self.row_count = 0
+        self.columns = None
+        # {column: dtype name} of the first chunk, so a continuation can read its rows alike
+        self.dtypes = None
+        self.row_states: Dict[int, RowExpectationState] = {}
+        self.column_states: Dict[str, ColumnState] = {}
+        # Whether the chunks of this run went through `count_keys`
+        self.keys_counted = False
+
+        for position, expectation in enumerate(expectations):
+            expectation_type = expectation.expectation_type
+            if expectation_type in AGGREGATE_EVALUATORS:
+                column = getattr(expectation, "column", None)
+                if column is not None and expectation_type != "expect_column_to_exist":
+                    state = self.column_states.setdefault(
+                        column, ColumnState(approximate, quantile_error, distinct_error))
+                    state.track(expectation_type)
+            else:
+                self.row_states[position] = RowExpectationState()
+
+    @property
+    def needs_key_pass(self) -> bool:
+        """True when uniqueness expectations need a first pass over the chunks (`count_keys`)."""
+        return any(self.expectations[position].expectation_type in UNIQUENESS_EXPECTATIONS
+                   for position in self.row_states)
+
+    def count_keys(self, chunk: pd.DataFrame) -> None:
+        """
+        First pass: folds the values of one chunk into the key sets of the uniqueness expectations.
+        Rows counted by an earlier incremental run are included, so appended duplicates of them are
+        flagged; the earlier rows themselves were already written and stay as they were.
+        """
+        self.keys_counted = True
+        for position, state in self.row_states.items():
+            expectation = self.expectations[position]
+            if expectation.expectation_type not in UNIQUENESS_EXPECTATIONS:
+                continue
+            try:
+                hashes, domain = self._uniqueness_keys(chunk, expectation)
+            except Exception:
+                # Reported when the chunk is validated
+                continue
+            keys = hashes[domain]
+            repeated = keys[pd.Series(keys).duplicated().to_numpy(dtype=bool) | np.isin(keys, state.seen_hashes)]
+            state.duplicate_hashes = np.union1d(state.duplicate_hashes, repeated)
+            state.seen_hashes = np.union1d(state.seen_hashes, keys)
+
+    def validate_chunk(self, chunk: pd.DataFrame) -> List[Tuple[gxe.Expectation, Optional[np.ndarray]]]:
+        """
+        Folds one chunk into the running state.
+        Returns (expectation, unexpected_mask) for every row-level expectation; the mask is None
+        when the expectation was decided at column level or raised for this chunk.
+        """
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+            self.dtypes = {column: str(dtype) for column, dtype in chunk.dtypes.items()}
+
+        for column, state in self.column_states.items():
+            if column in chunk.columns:
+                state.update(chunk[column])
+
+        masks = []
+        for position, state in self.row_states.items():
+            expectation = self.expectations[position]
+            mask = self._evaluate_row_expectation(chunk, expectation, state)
+            masks.append((expectation, mask))
+
+        self.row_count += len(chunk)
+        return masks
+
+    def _evaluate_row_expectation(self, chunk: pd.DataFrame, expectation: gxe.Expectation,
+                                  state: RowExpectationState) -> Optional[np.ndarray]:
+        expectation_type = expectation.expectation_type
+        try:
+            if expectation_type in TYPE_EXPECTATIONS:
+                type_names = expectation_type_names(expectation)
+                evaluation = type_evaluation(chunk, expectation, type_names)
+                if evaluation is None:
+                    series = chunk[expectation.column]
+                    state.observed_dtype = dtype_name(series)
+                    state.dtype_success &= dtype_matches(series, type_names)
+                    state.element_count += len(chunk)
+                    return None
+                unexpected_mask, domain_mask = evaluation
+            elif expectation_type in UNIQUENESS_EXPECTATIONS:
+                unexpected_mask, domain_mask = self._evaluate_uniqueness(chunk, expectation, state)
+            else:
+                unexpected_mask, domain_mask = MAP_EVALUATORS[expectation_type](chunk, expectation)
+        except Exception as e:
+            logger.error(f"Error while evaluating {expectation_type} on chunk: {e}")
+            state.exception = e
+            return None
+
+        positions = np.flatnonzero(unexpected_mask)
+        state.element_count += len(chunk)
+        state.domain_count += int(domain_mask.sum())
+        state.unexpected_count += len(positions)
+
+        missing = PARTIAL_UNEXPECTED_COUNT - len(state.partial_unexpected_index_list)
+        if missing > 0 and len(positions):
+            picked = positions[:missing]
+            state.partial_unexpected_index_list.extend((picked + self.row_count).tolist())
+            column = getattr(expectation, "column", None)
+            if column is not None:
+                state.partial_unexpected_list.extend(chunk[column].iloc[picked].tolist())
+        return unexpected_mask
+
+    @staticmethod
+    def _uniqueness_keys(chunk: pd.DataFrame, expectation: gxe.Expectation) -> Tuple[np.ndarray, np.ndarray]:
+        """(hash of every row's values, domain mask) of a uniqueness expectation."""
+        if expectation.expectation_type == "expect_column_values_to_be_unique":
+            subset = chunk[[expectation.column]]
+            domain = chunk[expectation.column].notna().to_numpy(dtype=bool)
+        else:
+            subset = chunk[list(expectation.column_list)]
+            domain = ~subset.isna().to_numpy().all(axis=1)
+        # Chunks infer their dtypes separately, so values are hashed in a canonical dtype
+        return canonical_hashes(subset), domain
+
+    def _evaluate_uniqueness(self, chunk: pd.DataFrame, expectation: gxe.Expectation, state: RowExpectationState):
+        if not self.keys_counted:
+            raise ValueError("Uniqueness needs the chunks passed to count_keys before they are validated")
+        hashes, domain = self._uniqueness_keys(chunk, expectation)
+        return domain & np.isin(hashes, state.duplicate_hashes), domain
+
+    def _row_result(self, expectation: gxe.Expectation, state: RowExpectationState) -> dict:
+        if state.exception is not None:
+            return build_expectation_result(expectation, False, {}, exception=state.exception)
+        result_format = expectation_result_format(expectation)
+        if state.observed_dtype is not None and state.domain_count == 0:
+            return build_expectation_result(expectation, state.dtype_success,
+                                            apply_result_format({"observed_value": state.observed_dtype},
+                                                                result_format))
+
+        element_count = state.element_count
+        domain_count = state.domain_count
+        unexpected_count = state.unexpected_count
+        missing_count = element_count - domain_count
+        result = {
+            "element_count": element_count,
+            "missing_count": missing_count,
+            "missing_percent": missing_count / element_count * 100 if element_count else None,
+            "unexpected_count": unexpected_count,
+            "unexpected_percent": unexpected_count / domain_count * 100 if domain_count else None,
+            "unexpected_percent_total": unexpected_count / element_count * 100 if element_count else None,
+            "unexpected_percent_nonmissing": unexpected_count / domain_count * 100 if domain_count else None,
+            "partial_unexpected_list": state.partial_unexpected_list,
+            "partial_unexpected_index_list": state.partial_unexpected_index_list,
+        }
+        success = state.dtype_success and mostly_success(unexpected_count, domain_count,
+                                                         getattr(expectation, "mostly", None))
+        return build_expectation_result(expectation, success, apply_result_format(result, result_format))
+
+    def _aggregate_result(self, expectation: gxe.Expectation) -> dict:
+        try:
+            success, observed_value = self._answer_aggregate(expectation)
+            return build_expectation_result(expectation, bool(success),
+                                            apply_result_format({"observed_value": observed_value},
+                                                                expectation_result_format(expectation)))
+        except Exception as e:
+            logger.error(f"Error while evaluating {expectation.expectation_type}: {e}")
+            return build_expectation_result(expectation, False, {}, exception=e)
+
+    def _answer_aggregate(self, expectation: gxe.Expectation):
+        expectation_type = expectation.expectation_type
+        columns = self.columns or []
+
+        if expectation_type == "expect_column_to_exist":
+            return expectation.column in columns, columns
+        if expectation_type == "expect_table_column_count_to_be_between":
+            return between(len(columns), expectation.min_value, expectation.max_value), len(columns)
+        if expectation_type == "expect_table_columns_to_match_ordered_list":
+            return columns == list(expectation.column_list), columns
+        if expectation_type == "expect_table_columns_to_match_set":
+            expected = set(expectation.column_set or [])
+            if expectation.exact_match is False:
+                return expected.issubset(columns), sorted(columns)
+            return set(columns) == expected, sorted(columns)
+        if expectation_type == "expect_table_row_count_to_be_between":
+            return between(self.row_count, expectation.min_value, expectation.max_value,
+                           expectation.strict_min, expectation.strict_max), self.row_count
+        if expectation_type == "expect_table_row_count_to_equal":
+            return self.row_count == expectation.value, self.row_count
+
+        if expectation.column not in columns:
+            raise KeyError(expectation.column)
+        state = self.column_states[expectation.column]
+
+        if expectation_type == "expect_column_quantile_values_to_be_between":
+            quantiles = list(expectation.quantile_ranges.get("quantiles", []))
+            value_ranges = list(expectation.quantile_ranges.get("value_ranges", []))
+            if not state.quantiles.count:
+                return False, {"quantiles": quantiles, "values": []}
+            observed = state.quantiles.quantiles(quantiles)
+            success = all(between(value, low, high) for value, (low, high) in zip(observed, value_ranges))
+            return success, {"quantiles": quantiles, "values": observed}
+
+        distinct = set(state.value_counts.index.tolist()) if state.value_counts is not None else set()
+        if expectation_type == "expect_column_unique_value_count_to_be_between":
+            observed = state.distinct.count()
+        elif expectation_type == "expect_column_proportion_of_unique_values_to_be_between":
+            observed = state.distinct.count() / state.count if state.count else None
+        elif expectation_type == "expect_column_distinct_values_to_be_in_set":
+            return distinct.issubset(set(expectation.value_set or [])), sorted(distinct, key=str)
+        elif expectation_type == "expect_column_distinct_values_to_contain_set":
+            return set(expectation.value_set or []).issubset(distinct), sorted(distinct, key=str)
+        elif expectation_type == "expect_column_distinct_values_to_equal_set":
+            return distinct == set(expectation.value_set or []), sorted(distinct, key=str)
+        elif expectation_type == "expect_column_most_common_value_to_be_in_set":
+            counts = state.value_counts
+            modes = counts[counts == counts.max()].index.tolist() if len(counts) else []
+            value_set = set(expectation.value_set or [])
+            if expectation.ties_okay:
+                return any(mode in value_set for mode in modes), modes
+            return len(modes) == 1 and modes[0] in value_set, modes
+        elif expectation_type == "expect_column_min_to_be_between":
+            observed = state.moments.min
+        elif expectation_type == "expect_column_max_to_be_between":
+            observed = state.moments.max
+        elif expectation_type == "expect_column_sum_to_be_between":
+            observed = state.moments.sum if state.moments.count else None
+        elif expectation_type == "expect_column_mean_to_be_between":
+            observed = state.moments.mean if state.moments.count else None
+        elif expectation_type == "expect_column_stdev_to_be_between":
+            observed = state.moments.stdev
+        else:
+            observed = state.quantiles.median()
+
+        observed = observed.item() if hasattr(observed, "item") else observed
+        return between(observed, expectation.min_value, expectation.max_value,
+                       expectation.strict_min, expectation.strict_max), observed
+
+    def merge(self, other: "StreamingDataValidator") -> "StreamingDataValidator":
+        """
+        Merges the state of a validator that processed another partition of the same input,
+        so table-level expectations can be answered over chunked, partitioned or parallel reads.
+        Row-level counts are summed; partial lists keep this validator's entries first.
+        """
+        self.columns = self.columns or other.columns
+        self.dtypes = self.dtypes or other.dtypes
+        self.row_count += other.row_count
+        for column, state in other.column_states.items():
+            self.column_states[column].merge(state)
+        for position, state in other.row_states.items():
+            mine = self.row_states[position]
+            mine.element_count += state.element_count
+            mine.domain_count += state.domain_count
+            mine.unexpected_count += state.unexpected_count
+            room = PARTIAL_UNEXPECTED_COUNT - len(mine.partial_unexpected_list)
+            mine.partial_unexpected_list.extend(state.partial_unexpected_list[:max(room, 0)])
+            mine.dtype_success &= state.dtype_success
+            mine.observed_dtype = mine.observed_dtype or state.observed_dtype
+            mine.exception = mine.exception or state.exception
+            mine.duplicate_hashes = np.union1d(np.union1d(mine.duplicate_hashes, state.duplicate_hashes),
+                                               np.intersect1d(mine.seen_hashes, state.seen_hashes))
+            mine.seen_hashes = np.union1d(mine.seen_hashes, state.seen_hashes)
+        return self
+
+    def export_state(self) -> dict:
+        """The running state (rows, columns, dtypes, row-level counts, column accumulators), e.g. to persist it."""
+        return {
+            "row_count": self.row_count,
+            "columns": self.columns,
+            "dtypes": self.dtypes,
+            "row_states": self.row_states,
+            "column_states": self.column_states,
+        }
+
+    def restore_state(self, state: dict) -> "StreamingDataValidator":
+        """
+        Continues from the state exported by a validator of the same expectations, so the next
+        chunks are the rows after those it has seen (row indices continue from its row count).
+        """
+        if set(state["row_states"]) != set(self.row_states) or set(state["column_states"]) != set(self.column_states):
+            raise ValueError("State was exported by a validator of other expectations")
+        self.row_count = state["row_count"]
+        self.columns = state["columns"]
+        self.dtypes = state.get("dtypes")
+        self.row_states = state["row_states"]
+        self.column_states = state["column_states"]
+        return self
+
+    def finalize(self):
+        """Builds the CheckpointResult-shaped summary once every chunk has been validated."""
+        results = []
+        for position, expectation in enumerate(self.expectations):
+            if position in self.row_states:
+                results.append(self._row_result(expectation, self.row_states[position]))
+            else:
+                results.append(self._aggregate_result(expectation))
+        return build_checkpoint_result(results, self.expectation_suite_name, self.validation_definition_name,
+                                       engine="streaming")
@@ -8,10 +8,37 @@ import great_expectations.expectations as gxe
 import pandas as pd
 from great_expectations import RunIdentifier
 
+from src.utils.docs_builder import request_data_docs_build
+from src.utils.file_utils import fingerprint_config
+from src.utils.result_format import checkpoint_result_format
+
 # Setup logging
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+# Warm GX objects per checkpoint name (one per process_id), reused while the fingerprint matches.
+# Each entry: {"fingerprint": str, "context": AbstractDataContext, "checkpoint": Checkpoint}
+_WARM_CHECKPOINTS = {}
+
+# Mode of the GX contexts DataValidator creates in this process: "file" (the project's stores) or "ephemeral"
+_CONTEXT_MODE = {"mode": "file"}
+
+
+def clear_checkpoint_cache() -> None:
+    """Drops every warm context/checkpoint kept by DataValidator in this process."""
+    _WARM_CHECKPOINTS.clear()
+
+
+def use_context_mode(mode: str) -> None:
+    """
+    Sets the mode of the GX contexts created in this process from now on. Worker processes that
+    validate files concurrently use "ephemeral", so they never write the same file-backed stores.
+    """
+    if mode not in ("file", "ephemeral"):
+        raise ValueError(f"Unknown GX context mode '{mode}'. Available: ['file', 'ephemeral']")
+    _CONTEXT_MODE["mode"] = mode
+    clear_checkpoint_cache()
+
 
 class DataValidator:
     def __init__(self,
@@ -22,9 +49,22 @@ class DataValidator:
                  checkpoint_name: str = "DEFAULT_CHECKPOINT_NAME",
                  validation_definition_name: str = "DEFAULT_VALIDATION_NAME",
                  docs_build_action: bool = False,
-                 site_name: str = "DEFAULT_SITE_NAME"):
-        # Store the context, dataframe, and names
-        self.context = gx.get_context(mode="file")
+                 site_name: str = "DEFAULT_SITE_NAME",
+                 fingerprint: str = None):
+        # Key of the compiled suite/validation definition/checkpoint: the caller's config fingerprint
+        # (user YAML + mapping config) combined with everything this class writes into the stores.
+        # `validate` adds the expectations actually compiled, which may be a subset of the config
+        # (e.g. the GX fallback of the native engine), into `self.fingerprint`.
+        self.config_fingerprint = None
+        if fingerprint:
+            self.config_fingerprint = fingerprint_config(fingerprint, data_source_name, data_asset_name,
+                                                         expectation_suite_name, checkpoint_name,
+                                                         validation_definition_name, docs_build_action)
+        self.fingerprint = None
+
+        # Store the context, dataframe, and names; a warm context is reused for the same checkpoint
+        warm = _WARM_CHECKPOINTS.get(checkpoint_name)
+        self.context = warm["context"] if warm else gx.get_context(mode=_CONTEXT_MODE["mode"])
 
         # Data Docs setup
         # site_config = {
@@ -59,6 +99,7 @@ class DataValidator:
         self.checkpoint_name = checkpoint_name
         self.validation_definition_name = validation_definition_name
         self.docs_build_action = docs_build_action
+        self.result_format = {"result_format": "COMPLETE"}
         self.site_name = site_name
 
         self.data_source = None
@@ -88,8 +129,9 @@ class DataValidator:
 
     def add_expectations(self, expectations: List[gxe.Expectation]) -> None:
         """Defines and adds expectations to the suite dynamically."""
+        meta = {"fingerprint": self.fingerprint} if self.fingerprint else None
         self.expectation_suite = self.context.suites.add_or_update(
-            gx.ExpectationSuite(name=self.expectation_suite_name)
+            gx.ExpectationSuite(name=self.expectation_suite_name, meta=meta)
         )
 
         # Add the expectations dynamically from the passed list
@@ -147,49 +189,26 @@ class DataValidator:
                 },
             }
 
-            if self.docs_build_action:
-                site_name_new = "pole_star_data_quality"
-                name_s = "update"
-                site_name_update = '_'.join([name_s, site_name_new])
-                actions = [
-                    gx.checkpoint.actions.UpdateDataDocsAction(
-                        name=site_name_update
-                    )
-                ]
-                self.checkpoint = self.context.checkpoints.add_or_update(
-                    gx.Checkpoint(
-                        name=self.checkpoint_name,
-                        validation_definitions=[self.validation_definition],
-                        result_format={
-                            "result_format": "COMPLETE",
-                            "unexpected_index_column_names": [],
-
-                        },
-                        actions=actions,
-
-                    )
-                )
-                logger.info(f"Checkpoint '{self.checkpoint_name}' added successfully.")
-
-            else:
-                self.checkpoint = self.context.checkpoints.add_or_update(
-                    gx.Checkpoint(
-                        name=self.checkpoint_name,
-                        validation_definitions=[self.validation_definition],
-                        result_format={
-                            "result_format": "COMPLETE",
-
-                        },
-                    )
+            # Data Docs are rebuilt by the background builder after the run (see validate), not by an
+            # UpdateDataDocsAction that would render the S3-backed site inside the checkpoint run.
+            self.checkpoint = self.context.checkpoints.add_or_update(
+                gx.Checkpoint(
+                    name=self.checkpoint_name,
+                    validation_definitions=[self.validation_definition],
+                    result_format={
+                        **self.result_format,
+                        "unexpected_index_column_names": [],
+
+                    },
                 )
-                logger.info(f"Checkpoint '{self.checkpoint_name}' added successfully.")
+            )
+            logger.info(f"Checkpoint '{self.checkpoint_name}' added successfully.")
         except Exception as e:
             logger.error(f"Error while adding checkpoint: {e}")
             raise ValueError(f"Error while adding checkpoint: {e}")
 
         # site_name = "my_data_docs_site_new"
         # self.context.add_data_docs_site(site_name=site_name, site_config=site_config)
-        self.context.build_data_docs()
 
     def run_validation(self) -> gx.checkpoint.checkpoint.CheckpointResult:
         """Runs the validation and returns the checkpoint result."""
@@ -210,12 +229,70 @@ class DataValidator:
             logger.error(f"Error while running validation: {e}")
             raise ValueError(f"Error while running validation: {e}")
 
+    def suite_fingerprint(self, expectations: List[gxe.Expectation]):
+        """The config fingerprint combined with the configurations of the expectations compiled."""
+        if not self.config_fingerprint:
+            return None
+        configurations = []
+        for expectation in expectations:
+            configuration = expectation.configuration.to_json_dict()
+            # Ids are assigned once an expectation is added to a suite, they are not part of the config
+            configuration.pop("id", None)
+            configurations.append(configuration)
+        return fingerprint_config(self.config_fingerprint, configurations, self.result_format)
+
+    def load_cached_checkpoint(self) -> bool:
+        """
+        Reuses a checkpoint compiled from the same fingerprint, skipping every store write.
+        Looks at the warm checkpoints of this process first, then at the suite persisted in the store.
+        """
+        if not self.fingerprint:
+            return False
+
+        warm = _WARM_CHECKPOINTS.get(self.checkpoint_name)
+        if warm and warm["fingerprint"] == self.fingerprint:
+            self.checkpoint = warm["checkpoint"]
+            logger.info(f"Reusing warm checkpoint '{self.checkpoint_name}'.")
+            return True
+
+        try:
+            checkpoint = self.context.checkpoints.get(self.checkpoint_name)
+            suite = checkpoint.validation_definitions[0].suite
+        except Exception as e:
+            logger.info(f"No stored checkpoint '{self.checkpoint_name}' to reuse: {e}")
+            return False
+
+        if (suite.meta or {}).get("fingerprint") != self.fingerprint:
+            return False
+
+        self.checkpoint = checkpoint
+        logger.info(f"Stored checkpoint '{self.checkpoint_name}' matches fingerprint, skipping store writes.")
+        return True
+
+    def cache_checkpoint(self) -> None:
+        """Keeps the compiled checkpoint and its context warm for later runs in this process."""
+        if self.fingerprint:
+            _WARM_CHECKPOINTS[self.checkpoint_name] = {
+                "fingerprint": self.fingerprint,
+                "context": self.context,
+                "checkpoint": self.checkpoint,
+            }
+
     def validate(self, expectations: List[gxe.Expectation]) -> gx.checkpoint.checkpoint.CheckpointResult:
         """Complete flow for adding data source, asset, expectations, and validation."""
-        self.add_data_source()
-        self.add_data_asset()
-        self.add_expectations(expectations)  # expectation --dhiraj
-        self.add_validation_definition()
-        self.add_checkpoint()
+        # One result_format per checkpoint: the most detailed level any expectation's action needs
+        self.result_format = checkpoint_result_format(expectations)
+        self.fingerprint = self.suite_fingerprint(expectations)
+        if not self.load_cached_checkpoint():
+            self.add_data_source()
+            self.add_data_asset()
+            self.add_expectations(expectations)  # expectation --dhiraj
+            self.add_validation_definition()
+            self.add_checkpoint()
+            self.cache_checkpoint()
 
-        return self.run_validation(), self.context
+        result = self.run_validation()
+        if self.docs_build_action:
+            # Coalesced background rebuild; call flush_data_docs() when the docs must be ready
+            request_data_docs_build(self.context)
+        return result, self.context
@@ -0,0 +1,114 @@
+"""
+Synthetic AIS deliveries for benchmarks and property tests: header-less CSVs with the column
+layout of `schemas.yaml`, and a known share of rows broken the ways real deliveries break.
+"""
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+import yaml
+from hypothesis import strategies as st
+
+from src.utils.data_loader import load_process_schema
+
+AIS_COLUMNS = [column['name'] for column in load_process_schema('AIS')['columns']]
+
+SOURCES = ["Spire_DAIS", "Spire_SAIS", "Orbcomm", "ExactEarth"]
+NAVIGATIONAL_STATUSES = ["Under way using engine", "At anchor", "Moored", "Restricted maneuverability",
+                         "Engaged in fishing", "Not defined"]
+SHIP_TYPES = ["Cargo", "Tanker", "Fishing", "Passenger", "Tug", ""]
+
+# Ways a generated row is broken; each is caught by one of BENCHMARK_EXPECTATIONS
+ERROR_KINDS = ("malformed_timestamp", "missing_mmsi", "latitude_out_of_range", "unknown_message_type")
+
+# User YAML expectations matching the injected errors, plus a few that always pass
+BENCHMARK_EXPECTATIONS = [
+    # A type check would flag every row of an object column; the pattern flags only the malformed ones
+    {"name": "ExpectColumnValuesToMatchRegex", "column": "ReceivedTimestamp", "regex": r"^\d+$", "action": "skip"},
+    {"name": "ExpectColumnValuesToNotBeNull", "column": "MMSI", "action": "skip"},
+    {"name": "ExpectColumnValuesToBeBetween", "column": "Latitude", "min_value": -90, "max_value": 90,
+     "action": "skip"},
+    {"name": "ExpectColumnValuesToBeBetween", "column": "MessageType", "min_value": 1, "max_value": 27,
+     "action": "skip"},
+    {"name": "ExpectColumnValuesToBeBetween", "column": "Longitude", "min_value": -180, "max_value": 180,
+     "action": "skip"},
+    {"name": "ExpectColumnValuesToBeInSet", "column": "Source", "values": SOURCES},
+    {"name": "ExpectTableRowCountToBeBetween", "min": 1},
+]
+
+
+def generate_ais_frame(rows: int, error_rate: float = 0.01, seed: int = 0) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    Builds `rows` AIS position reports, of which about `error_rate` are broken by one of ERROR_KINDS.
+
+    :return: (frame with the AIS_COLUMNS, boolean mask of the broken rows).
+    """
+    rng = np.random.default_rng(seed)
+    received = rng.integers(1743000000, 1743100000, rows)
+    mmsi = rng.integers(200000000, 775999999, rows)
+    frame = pd.DataFrame({
+        "ReceivedTimestamp": received,
+        "ProcessedTimestamp": received + rng.integers(0, 900, rows),
+        "Source": rng.choice(SOURCES, rows),
+        "TransceiverClass": rng.choice(["A", "B"], rows, p=[0.7, 0.3]),
+        "MessageType": rng.choice([1, 2, 3, 5, 18, 19, 24, 27], rows),
+        "SentenceCount": rng.integers(0, 3, rows),
+        "MMSI": pd.array(mmsi, dtype="Int64"),
+        "RawSentences": [f"\\s:dynamic,c:{stamp}*4D\\!AIVDM,1,1,,A,16:5G4UP078`BqpBCuN1e1Gp0000,0*2C"
+                         for stamp in received],
+        "Error": "",
+        "NavigationalStatus": rng.choice(NAVIGATIONAL_STATUSES, rows),
+        "Latitude": np.round(rng.uniform(-90, 90, rows), 6),
+        "Longitude": np.round(rng.uniform(-180, 180, rows), 6),
+        "Course": np.round(rng.uniform(0, 360, rows), 1),
+        "Heading": rng.choice([511.0, 0.0, 43.0, 221.0], rows),
+        "Speed": np.round(rng.exponential(6.0, rows), 1),
+        "CallSign": "",
+        "Destination": "",
+        "Draught": np.round(rng.uniform(0, 20, rows), 1),
+        "ETA": 0,
+        "IMONumber": "",
+        "Name": "",
+        "ShipType": rng.choice(SHIP_TYPES, rows),
+        "ToPort": rng.integers(0, 30, rows),
+        "ToStarboard": rng.integers(0, 30, rows),
+        "ToBow": rng.integers(0, 200, rows),
+        "ToStern": rng.integers(0, 100, rows),
+    }, columns=AIS_COLUMNS)
+
+    broken = rng.random(rows) < error_rate
+    kinds = rng.integers(0, len(ERROR_KINDS), rows)
+    timestamps = frame["ReceivedTimestamp"].astype(object)
+    for position in np.flatnonzero(broken & (kinds == 0)):
+        timestamps.iat[position] = f"{received[position]}T"
+    frame["ReceivedTimestamp"] = timestamps
+    frame.loc[broken & (kinds == 1), "MMSI"] = pd.NA
+    frame.loc[broken & (kinds == 2), "Latitude"] = 91.0 + rng.uniform(0, 10, rows)[broken & (kinds == 2)].round(6)
+    frame.loc[broken & (kinds == 3), "MessageType"] = 99
+    return frame, broken
+
+
+def write_ais_file(file_path: str, rows: int, error_rate: float = 0.01, seed: int = 0) -> np.ndarray:
+    """Writes a header-less AIS delivery like the stream produces; returns the mask of the broken rows."""
+    frame, broken = generate_ais_frame(rows, error_rate, seed)
+    frame.to_csv(file_path, header=False, index=False)
+    return broken
+
+
+def write_benchmark_config(file_path: str) -> None:
+    """Writes the user YAML the benchmark validates with: a format check and BENCHMARK_EXPECTATIONS."""
+    with open(file_path, 'w') as file:
+        yaml.safe_dump({
+            "file_validation": [{"name": "ValidateFileFormat", "allowed_extensions": [".csv"], "action": "skip"},
+                                {"name": "ValidateFileSize", "max_size_mb": 10240, "action": "skip"}],
+            "expectations": BENCHMARK_EXPECTATIONS,
+        }, file)
+
+
+@st.composite
+def ais_deliveries(draw, max_rows: int = 200):
+    """Hypothesis strategy of (frame, broken mask) drawn through `generate_ais_frame`."""
+    rows = draw(st.integers(min_value=1, max_value=max_rows))
+    error_rate = draw(st.sampled_from([0.0, 0.05, 0.5, 1.0]))
+    seed = draw(st.integers(min_value=0, max_value=2 ** 32 - 1))
+    return generate_ais_frame(rows, error_rate, seed)
@@ -0,0 +1,178 @@
+"""
+Per-stage benchmark of `ValidationProcessor.run` on synthetic AIS deliveries.
+
+    python -m tests.benchmarks.bench_stages --rows 100000 --output tests/benchmarks/baselines/native_100k.json
+    python -m tests.benchmarks.bench_stages --rows 100000 --baseline tests/benchmarks/baselines/native_100k.json
+
+Each stage is timed on its own (median of `--repeat` runs) and measured for peak traced memory in a
+separate run, since tracing slows allocation-heavy stages down. With `--baseline` the run is
+compared to a stored result and exits with status 1 when a stage lost more than `--tolerance`
+of its rows/second or grew its peak memory by more than that.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+from src.utils.ExpectationMapper import ExpectationMapper, clear_mapping_cache
+from tests.benchmarks.ais_data import AIS_COLUMNS, write_ais_file, write_benchmark_config
+from validation_processor import VALIDATION_ENGINES, ValidationProcessor
+
+# Stages of ValidationProcessor.run, in order
+STAGES = ("load", "file_checks", "mapping", "checkpoint", "parsing", "partition", "write")
+
+
+def run_stages(file_path: str, config_path: str, invalid_path: str, engine: str, trace_memory: bool = False) -> dict:
+    """
+    Runs the steps of `ValidationProcessor.run` one at a time.
+    Returns {stage: seconds} or, with `trace_memory`, {stage: peak traced bytes}.
+    """
+    processor = ValidationProcessor(file_path, config_path, None, "BENCHMARK", invalid_file_path=invalid_path,
+                                    engine=engine)
+    processor.load_data()
+    clear_mapping_cache()
+    state = {}
+
+    def checkpoint():
+        validator = VALIDATION_ENGINES[engine](
+            dataframe=processor.df,
+            expectation_suite_name=processor.expectation_suite_name,
+            validation_definition_name=processor.validation_definition_name,
+        )
+        return validator.validate(state["mapping"])[0]
+
+    def partition():
+        actions = {(expectation['name'], expectation.get('column')): expectation.get('action')
+                   for expectation in processor.validation_config['expectations']}
+        return processor.partition_rows(processor.df, processor.collect_failure_masks(state["parsing"], actions))
+
+    def write():
+        invalid_df = state["partition"][0]
+        if not invalid_df.empty:
+            processor.open_output_writer().submit(invalid_df)
+        processor.flush_outputs()
+
+    steps = {
+        "load": lambda: processor.load_dataframe({"header": None, "names": AIS_COLUMNS}),
+        "file_checks": processor.validate_file,
+        "mapping": lambda: ExpectationMapper(processor.expectation_mapping_config_path).map_user_expectations(
+            processor.validation_config['expectations']),
+        "checkpoint": checkpoint,
+        "parsing": lambda: processor.process_results(state["checkpoint"]),
+        "partition": partition,
+        "write": write,
+    }
+
+    measurements = {}
+    for stage in STAGES:
+        if trace_memory:
+            tracemalloc.start()
+            state[stage] = steps[stage]()
+            measurements[stage] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        else:
+            start = time.perf_counter()
+            state[stage] = steps[stage]()
+            measurements[stage] = time.perf_counter() - start
+    measurements["invalid_rows"] = len(state["partition"][2])
+    return measurements
+
+
+def run_benchmark(rows: int, error_rate: float = 0.01, engine: str = "native", repeat: int = 3,
+                  seed: int = 0) -> dict:
+    """Generates a delivery of `rows` rows and returns the per-stage baseline document."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        file_path = os.path.join(work_dir, "ais-delivery.csv")
+        config_path = os.path.join(work_dir, "config.yaml")
+        invalid_path = os.path.join(work_dir, "invalid.csv")
+        broken = write_ais_file(file_path, rows, error_rate, seed)
+        write_benchmark_config(config_path)
+
+        timings = [run_stages(file_path, config_path, invalid_path, engine) for _ in range(repeat)]
+        memory = run_stages(file_path, config_path, invalid_path, engine, trace_memory=True)
+        file_size = os.path.getsize(file_path)
+
+    stages = {}
+    for stage in STAGES:
+        seconds = statistics.median(timing[stage] for timing in timings)
+        stages[stage] = {
+            "seconds": round(seconds, 6),
+            "rows_per_second": round(rows / seconds, 1) if seconds > 0 else None,
+            "peak_memory_mb": round(memory[stage] / (1024 * 1024), 3),
+        }
+    total = sum(stage["seconds"] for stage in stages.values())
+    return {
+        "benchmark": "validation_processor_stages",
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": {"python": platform.python_version(), "pandas": pd.__version__, "machine": platform.machine()},
+        "parameters": {"rows": rows, "error_rate": error_rate, "engine": engine, "repeat": repeat, "seed": seed,
+                       "file_size_mb": round(file_size / (1024 * 1024), 3)},
+        "injected_errors": int(broken.sum()),
+        "invalid_rows": timings[0]["invalid_rows"],
+        "stages": stages,
+        "total": {"seconds": round(total, 6), "rows_per_second": round(rows / total, 1) if total > 0 else None},
+    }
+
+
+def compare_to_baseline(result: dict, baseline: dict, tolerance: float = 0.2) -> list:
+    """
+    Lists the regressions of `result` against `baseline`: stages whose rows/second dropped, or whose
+    peak memory grew, by more than `tolerance` (a fraction).
+    """
+    regressions = []
+    for stage, measured in result["stages"].items():
+        expected = baseline["stages"].get(stage)
+        if expected is None:
+            continue
+        # Stages under a few milliseconds are timer noise, as are peaks under 1 MB
+        if expected["seconds"] >= 0.005 and measured["rows_per_second"] is not None \
+                and measured["rows_per_second"] < expected["rows_per_second"] * (1 - tolerance):
+            regressions.append(f"{stage}: {measured['rows_per_second']:.0f} rows/s, "
+                               f"baseline {expected['rows_per_second']:.0f} rows/s")
+        if expected["peak_memory_mb"] >= 1 and measured["peak_memory_mb"] > expected["peak_memory_mb"] * (1 + tolerance):
+            regressions.append(f"{stage}: peak {measured['peak_memory_mb']:.1f} MB, "
+                               f"baseline {expected['peak_memory_mb']:.1f} MB")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    parser.add_argument("--engine", default="native", choices=list(VALIDATION_ENGINES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the result JSON here (e.g. a new baseline).")
+    parser.add_argument("--baseline", help="Compare against this result JSON.")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(args.rows, args.error_rate, args.engine, args.repeat, args.seed)
+    for stage, measured in result["stages"].items():
+        print(f"{stage:<12} {measured['seconds']:>9.4f}s {measured['rows_per_second'] or 0:>14,.0f} rows/s "
+              f"{measured['peak_memory_mb']:>9.1f} MB")
+    print(f"{'total':<12} {result['total']['seconds']:>9.4f}s {result['total']['rows_per_second'] or 0:>14,.0f} rows/s")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(result, file, indent=2)
+            file.write("\n")
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            regressions = compare_to_baseline(result, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+import json
+
+import numpy as np
+from hypothesis import HealthCheck, given, settings
+
+from src.config.settings import CONFIG_YAML_PATH
+from src.utils.ExpectationMapper import ExpectationMapper
+from src.validators.native_validate import NativeDataValidator
+from tests.benchmarks.ais_data import BENCHMARK_EXPECTATIONS, ERROR_KINDS, ais_deliveries, generate_ais_frame
+from tests.benchmarks.bench_stages import STAGES, compare_to_baseline, run_benchmark
+
+
+def test_generator_is_reproducible_and_breaks_the_requested_share():
+    frame, broken = generate_ais_frame(20000, error_rate=0.05, seed=7)
+    again, _ = generate_ais_frame(20000, error_rate=0.05, seed=7)
+
+    assert frame.equals(again)
+    assert 0.04 < broken.mean() < 0.06
+    assert frame["MMSI"].isna().sum() + (frame["MessageType"] == 99).sum() < broken.sum()
+    assert len(ERROR_KINDS) == 4
+
+
+@settings(max_examples=25, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+@given(ais_deliveries())
+def test_benchmark_expectations_flag_exactly_the_broken_rows(delivery):
+    frame, broken = delivery
+    expectations = ExpectationMapper(CONFIG_YAML_PATH).map_user_expectations(BENCHMARK_EXPECTATIONS)
+    checkpoint_result, _ = NativeDataValidator(frame).validate(expectations)
+
+    flagged = np.zeros(len(frame), dtype=bool)
+    for result in checkpoint_result.run_results["DEFAULT_VALIDATION_NAME"]["results"]:
+        flagged[result["result"].get("unexpected_index_list") or []] = True
+    assert (flagged == broken).all()
+
+
+def test_benchmark_reports_every_stage_and_flags_regressions():
+    result = run_benchmark(2000, error_rate=0.1, repeat=1)
+
+    assert list(result["stages"]) == list(STAGES)
+    assert result["invalid_rows"] == result["injected_errors"]
+    json.dumps(result)
+
+    assert compare_to_baseline(result, result) == []
+    slower = json.loads(json.dumps(result))
+    slower["stages"]["load"].update(seconds=1.0, rows_per_second=result["stages"]["load"]["rows_per_second"] * 2)
+    assert compare_to_baseline(result, slower)[0].startswith("load:")
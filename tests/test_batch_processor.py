@@ -0,0 +1,132 @@
+import io
+import json
+import os
+
+import pandas as pd
+import pytest
+import yaml
+
+import validation_processor
+from batch_processor import BatchProcessor, validate_one_file
+from tests.test_s3_writer import LocalS3
+from validation_processor import StopProcessError, ValidationProcessor
+
+
+@pytest.fixture(autouse=True)
+def local_s3(monkeypatch):
+    # Inherited by the forked workers, so no file of a batch reaches the real S3
+    s3 = LocalS3()
+    monkeypatch.setattr(validation_processor, "get_s3_client", lambda region: s3)
+    return s3
+
+
+def write_batch(tmp_path, format_action="skip"):
+    data = tmp_path / "data"
+    (data / "nested").mkdir(parents=True)
+    pd.DataFrame({"MMSI": ["1", "2"], "Speed": [1.0, 2.0]}).to_csv(data / "good.csv", index=False)
+    pd.DataFrame({"MMSI": ["1", None, None], "Speed": [1.0, 2.0, 3.0]}).to_csv(data / "nested" / "bad.csv",
+                                                                              index=False)
+    (data / "notes.txt").write_text("not a delivery file")
+    config = tmp_path / "config.yaml"
+    config.write_text(yaml.safe_dump({
+        "file_validation": [{"name": "ValidateFileFormat", "allowed_extensions": [".csv"], "action": format_action}],
+        "expectations": [{"name": "ExpectColumnValuesToNotBeNull", "column": "MMSI", "action": "skip"}],
+    }))
+    return data, config
+
+
+def test_batch_validates_files_in_parallel_and_resumes_from_manifest(tmp_path):
+    data, config = write_batch(tmp_path)
+    manifest_path = tmp_path / "manifest.json"
+    batch = BatchProcessor(str(data), str(config), "TEST", workers=2, manifest_path=str(manifest_path),
+                           invalid_dir=str(tmp_path / "invalid"))
+
+    summary = batch.run()
+
+    assert summary["by_status"] == {"valid": 1, "invalid_rows": 1, "skipped": 1}
+    assert (summary["rows"], summary["valid_rows"], summary["invalid_rows"]) == (5, 3, 2)
+    assert list(summary["failed_files"]) == [str(data / "notes.txt")]
+    assert len(pd.read_csv(tmp_path / "invalid" / "bad.csv.invalid.csv")) == 2
+
+    # Simulate a crash: the good file never finished, the others are done and must not be revalidated
+    manifest = json.loads(manifest_path.read_text())
+    manifest["files"][str(data / "good.csv")]["status"] = "error"
+    manifest["files"][str(data / "nested" / "bad.csv")]["rows"] = 999
+    manifest_path.write_text(json.dumps(manifest))
+
+    resumed = BatchProcessor(str(data), str(config), "TEST", workers=2, manifest_path=str(manifest_path)).run()
+
+    assert resumed["by_status"] == {"valid": 1, "invalid_rows": 1, "skipped": 1}
+    assert resumed["rows"] == 999 + 2
+
+
+def test_abort_action_on_a_file_check_stops_the_batch(tmp_path):
+    data, config = write_batch(tmp_path, format_action="abort")
+    # The aborting file sorts first, so the files queued behind it are cancelled
+    (data / "notes.txt").rename(data / "a_notes.txt")
+    for position in range(20):
+        pd.DataFrame({"MMSI": [str(position)], "Speed": [1.0]}).to_csv(data / f"queued_{position:02d}.csv", index=False)
+    manifest_path = tmp_path / "manifest.json"
+    batch = BatchProcessor(str(data / "**" / "*"), str(config), "TEST", workers=1, manifest_path=str(manifest_path))
+
+    with pytest.raises(StopProcessError):
+        batch.run()
+
+    assert batch.summary["aborted"]
+    files = json.loads(manifest_path.read_text())["files"]
+    assert len(files) == 23
+    assert files[str(data / "a_notes.txt")]["status"] == "aborted"
+    assert batch.summary["by_status"].get("cancelled", 0) > 0
+
+
+def test_parquet_files_passing_on_footer_statistics_are_not_loaded(tmp_path, monkeypatch):
+    pd.DataFrame({"MMSI": ["1", "2"], "Speed": [1.0, 2.0]}).to_parquet(tmp_path / "good.parquet", index=False)
+    pd.DataFrame({"MMSI": ["1", None], "Speed": [1.0, 2.0]}).to_parquet(tmp_path / "bad.parquet", index=False)
+    config = tmp_path / "config.yaml"
+    config.write_text(yaml.safe_dump({
+        "file_validation": [{"name": "ValidateFileFormat", "allowed_extensions": [".parquet"], "action": "skip"}],
+        "expectations": [{"name": "ExpectColumnValuesToNotBeNull", "column": "MMSI", "action": "skip"},
+                         {"name": "ExpectTableRowCountToBeBetween", "min": 1, "action": "failure"}],
+    }))
+    loaded = []
+    load_dataframe = ValidationProcessor.load_dataframe
+    monkeypatch.setattr(ValidationProcessor, "load_dataframe",
+                        lambda self, *args: loaded.append(self.file_path) or load_dataframe(self, *args))
+
+    good = validate_one_file(str(tmp_path / "good.parquet"), str(config), "TEST")
+    bad = validate_one_file(str(tmp_path / "bad.parquet"), str(config), "TEST")
+
+    assert (good["status"], good["rows"], good["valid_rows"]) == ("valid", 2, 2)
+    assert (bad["status"], bad["rows"], bad["invalid_rows"]) == ("invalid_rows", 2, 1)
+    assert loaded == [str(tmp_path / "bad.parquet")]
+
+
+def test_invalid_rows_of_a_file_are_uploaded_to_s3_like_a_single_run(tmp_path, local_s3):
+    data, config = write_batch(tmp_path)
+
+    outcome = validate_one_file(str(data / "nested" / "bad.csv"), str(config), "TEST",
+                                str(tmp_path / "bad.csv.invalid.csv"))
+
+    assert outcome["status"] == "invalid_rows"
+    (key, body), = local_s3.objects.items()
+    assert "TEST_bad.csv_data_" in key[1]
+    assert pd.read_csv(io.BytesIO(body))["Speed"].tolist() == [2.0, 3.0]
+    assert len(pd.read_csv(tmp_path / "bad.csv.invalid.csv")) == 2
+
+
+def test_workers_validate_through_ephemeral_gx_contexts(tmp_path, monkeypatch):
+    data, config = write_batch(tmp_path)
+    # A row condition sends the expectation to the GX fallback of the native engine
+    config.write_text(yaml.safe_dump({"file_validation": [], "expectations": [
+        {"name": "ExpectColumnValuesToNotBeNull", "column": "MMSI", "row_condition": "Speed > 0",
+         "condition_parser": "pandas", "action": "skip"}]}))
+    (data / "notes.txt").unlink()
+    mapping_config_path = os.path.abspath(validation_processor.CONFIG_YAML_PATH)
+    monkeypatch.setattr(validation_processor, "CONFIG_YAML_PATH", mapping_config_path)
+    monkeypatch.chdir(tmp_path)
+
+    summary = BatchProcessor(str(data), str(config), "TEST", workers=2).run()
+
+    assert summary["by_status"] == {"valid": 1, "invalid_rows": 1}
+    # No file-backed GX project was written by the workers
+    assert not os.path.exists(tmp_path / "gx")
@@ -0,0 +1,85 @@
+import gzip
+import zipfile
+
+import pandas as pd
+
+from src.checks import file_validation_checks
+from src.utils.data_loader import load_compressed_data
+from validation_processor import ValidationProcessor
+
+FRAME = pd.DataFrame({"MMSI": [str(413000000 + i) for i in range(20000)], "Speed": [i % 307 / 10 for i in range(20000)]})
+
+
+def test_gzip_is_checked_and_parsed_in_one_decompression(tmp_path, monkeypatch):
+    path = tmp_path / "delivery.csv.gz"
+    path.write_bytes(gzip.compress(FRAME.to_csv(index=False).encode()))
+    config = tmp_path / "config.yaml"
+    config.write_text("file_validation:\n  - name: ValidateCompressed\n    allowed_compressions: [gz]\n")
+
+    def second_pass(*args, **kwargs):
+        raise AssertionError("the file was decompressed twice")
+
+    monkeypatch.setattr(file_validation_checks, "verify_gzip", second_pass)
+    processor = ValidationProcessor(str(path), str(config), None, "TEST", engine="native")
+    processor.load_data()
+    df = processor.load_dataframe({"dtype": {"MMSI": str}})
+
+    assert df.equals(FRAME)
+    assert processor.validate_file()[0]["result"]
+    assert processor.compression_report["bytes_processed"] == len(FRAME.to_csv(index=False))
+
+
+def test_zip_members_are_concatenated_and_corruption_is_reported(tmp_path):
+    path = tmp_path / "delivery.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("part-0.csv", FRAME.iloc[:5000].to_csv(index=False))
+        archive.writestr("part-1.csv", FRAME.iloc[5000:].to_csv(index=False))
+    truncated = tmp_path / "truncated.csv.gz"
+    truncated.write_bytes(gzip.compress(FRAME.to_csv(index=False).encode())[:20000])
+
+    df, report = load_compressed_data(str(path), dtype={"MMSI": str})
+    assert df.equals(FRAME) and report["valid"] and report["members"] == 2
+
+    df, report = load_compressed_data(str(truncated))
+    assert df is None and report["truncated"] and not report["valid"]
+
+
+def test_schema_loader_projects_and_types_columns(tmp_path):
+    from src.utils.data_loader import load_data_with_schema, referenced_columns
+
+    schema = {"header": False, "columns": [
+        {"name": "ReceivedTimestamp", "type": "object"}, {"name": "Source", "type": "category"},
+        {"name": "MMSI", "type": "string"}, {"name": "Speed", "type": "float64"}, {"name": "ToBow", "type": "int64"}]}
+    path = tmp_path / "delivery"
+    path.write_text('1743062551T,Spire_DAIS,413226770,0.7,\n1743062890,Orbcomm,,12.5,3\n')
+    expectations = [{"name": "ExpectColumnValuesToBeOfType", "column": "ReceivedTimestamp", "type": "int64"},
+                    {"name": "ExpectColumnValuesToBeInSet", "column": "Source", "value_set": ["Orbcomm"]}]
+
+    columns = referenced_columns(expectations, consumer_columns=["ToBow"])
+    df, report = load_data_with_schema(str(path), schema, columns)
+
+    assert list(df.columns) == ["ReceivedTimestamp", "Source", "ToBow"] and report is None
+    assert df["ReceivedTimestamp"].tolist() == ["1743062551T", "1743062890"]
+    assert str(df["ToBow"].dtype) == "int64[pyarrow]" and df["ToBow"].isna().tolist() == [True, False]
+    assert "dictionary" in str(df["Source"].dtype)
+    assert referenced_columns(expectations + [{"name": "ExpectTableColumnCountToBeBetween"}]) is None
+    assert referenced_columns(expectations + [{"name": "ExpectColumnToExist", "column": "Heading"}],
+                              schema_columns=[column["name"] for column in schema["columns"]]) == \
+        ["ReceivedTimestamp", "Source"]
+
+
+def test_schema_loaded_frame_validates_like_the_pandas_one():
+    from src.utils.data_loader import load_data_with_schema, load_process_schema
+    from src.validators.native_validate import NativeDataValidator
+    import great_expectations.expectations as gxe
+
+    path = "src/data/stage-ais-cleaned-data-delivery-stream-1-2025-03-27-08-14-57"
+    df, _ = load_data_with_schema(path, load_process_schema("AIS"))
+    results = NativeDataValidator(df).validate([
+        gxe.ExpectColumnValuesToBeOfType(column="ReceivedTimestamp", type_="int64"),
+        gxe.ExpectColumnValuesToBeInSet(column="Source", value_set=["Spire_DAIS"]),
+        gxe.ExpectColumnValuesToNotBeNull(column="MMSI"),
+    ])[0].run_results["DEFAULT_VALIDATION_NAME"]["results"]
+
+    assert results[0]["result"]["unexpected_count"] == 6
+    assert results[1]["success"] and results[2]["success"]
@@ -0,0 +1,45 @@
+import threading
+import time
+
+from src.utils.docs_builder import DataDocsBuilder
+
+
+class FakeContext:
+    def __init__(self, build_seconds=0.0):
+        self.build_seconds = build_seconds
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def build_data_docs(self, site_names=None):
+        time.sleep(self.build_seconds)
+        with self.lock:
+            self.calls.append(site_names)
+
+
+def test_requests_return_immediately_and_coalesce_into_one_build():
+    builder = DataDocsBuilder(coalesce_seconds=0.2)
+    context = FakeContext(build_seconds=0.2)
+
+    start = time.monotonic()
+    for site in ["a", "b", "a"]:
+        builder.request_build(context, [site])
+    assert time.monotonic() - start < 0.1
+    assert context.calls == []
+
+    assert builder.flush(timeout=5)
+    assert context.calls == [["a", "b"]]
+    assert builder.requests == 3 and builder.builds == 1
+
+
+def test_flush_with_nothing_pending_and_failed_builds_are_logged_not_raised():
+    builder = DataDocsBuilder(coalesce_seconds=0.0)
+    assert builder.flush(timeout=1)
+
+    class BrokenContext:
+        def build_data_docs(self, site_names=None):
+            raise RuntimeError("no S3")
+
+    builder.request_build(BrokenContext())
+    assert builder.flush(timeout=5)
+    assert isinstance(builder.last_error, RuntimeError)
+    assert builder.builds == 0
@@ -0,0 +1,75 @@
+import great_expectations.expectations as gxe
+import pytest
+
+from src.config.settings import CONFIG_YAML_PATH
+from src.utils import ExpectationMapper as mapper_module
+from src.utils.ExpectationMapper import ExpectationMapper
+
+
+def configs(expectations):
+    return [(e.expectation_type, {k: v for k, v in e.configuration.kwargs.items() if k != "result_format"})
+            for e in expectations]
+
+
+def test_user_keys_are_translated_to_gx_kwargs():
+    mapped = ExpectationMapper(CONFIG_YAML_PATH).map_user_expectations([
+        {"name": "ExpectColumnValuesToBeOfType", "column": "MessageType", "type": "int64", "action": "skip"},
+        {"name": "ExpectTableColumnCountToBeBetween", "min": 1, "max": 30},
+        {"name": "ExpectColumnValuesToBeBetween", "column": "Speed", "min": 0, "max": 102.3, "mostly": 0.9},
+        {"name": "ExpectMulticolumnSumToEqual", "columns": ["ToBow", "ToStern"], "value": 10},
+        {"name": "ExpectColumnValuesToMatchRegex", "column": "MMSI", "regex": r"^\d{9}$"},
+        {"name": "ExpectTableRowCountToEqual", "count": 5},
+        {"name": "NotARealExpectation", "column": "MMSI"},
+    ])
+
+    assert configs(mapped) == configs([
+        gxe.ExpectColumnValuesToBeOfType(column="MessageType", type_="int64"),
+        gxe.ExpectTableColumnCountToBeBetween(min_value=1, max_value=30),
+        gxe.ExpectColumnValuesToBeBetween(column="Speed", min_value=0, max_value=102.3, mostly=0.9),
+        gxe.ExpectMulticolumnSumToEqual(column_list=["ToBow", "ToStern"], sum_total=10),
+        gxe.ExpectColumnValuesToMatchRegex(column="MMSI", regex=r"^\d{9}$"),
+        gxe.ExpectTableRowCountToEqual(value=5),
+    ])
+
+
+def test_invalid_entries_are_reported_together():
+    with pytest.raises(ValueError) as error:
+        ExpectationMapper(CONFIG_YAML_PATH).map_user_expectations([
+            {"name": "ExpectColumnValueLengthsToBeBetween", "min": 1},
+            {"name": "ExpectColumnValuesToNotBeNull", "column": "MMSI"},
+            {"name": "ExpectColumnValuesToBeInSet", "value_set": ["Orbcomm"]},
+        ])
+
+    assert "expectation 0 (ExpectColumnValueLengthsToBeBetween)" in str(error.value)
+    assert "expectation 2 (ExpectColumnValuesToBeInSet)" in str(error.value)
+
+
+def test_repeat_mapping_is_served_from_cache_as_fresh_copies(monkeypatch):
+    user_expectations = [{"name": "ExpectColumnValuesToNotBeNull", "column": "MMSI"}]
+    first = ExpectationMapper(CONFIG_YAML_PATH).map_user_expectations(user_expectations)
+    first[0].id = "assigned-by-a-suite"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("should be cached")
+
+    monkeypatch.setattr(ExpectationMapper, "load_master_config", fail)
+    monkeypatch.setattr(mapper_module, "fingerprint_file", fail)
+    monkeypatch.setattr(ExpectationMapper, "compile_plan", fail)
+    second = ExpectationMapper(CONFIG_YAML_PATH).map_user_expectations(user_expectations)
+
+    assert configs(second) == configs([gxe.ExpectColumnValuesToNotBeNull(column="MMSI")])
+    assert second[0].id is None and second[0] is not first[0]
+    assert len(mapper_module._PLAN_CACHE) >= 1
+
+
+def test_result_format_follows_the_action():
+    mapped = ExpectationMapper(CONFIG_YAML_PATH).map_user_expectations([
+        {"name": "ExpectColumnValuesToNotBeNull", "column": "MMSI", "action": "skip"},
+        {"name": "ExpectColumnValuesToNotBeNull", "column": "MMSI", "action": "failure"},
+        {"name": "ExpectColumnValuesToNotBeNull", "column": "MMSI"},
+        {"name": "ExpectColumnValuesToNotBeNull", "column": "MMSI", "action": "skip", "result_format": "BASIC"},
+    ])
+
+    assert [e.result_format if isinstance(e.result_format, str) else e.result_format["result_format"]
+            for e in mapped] == ["COMPLETE", "BOOLEAN_ONLY", "SUMMARY", "BASIC"]
+    assert mapped[0].result_format["exclude_unexpected_values"]
@@ -0,0 +1,20 @@
+from src.utils.file_utils import fingerprint_config, fingerprint_file
+
+
+def test_fingerprint_config_ignores_key_order_but_not_values():
+    first = [{"name": "ExpectColumnValuesToNotBeNull", "column": "MMSI", "action": "skip"}]
+    reordered = [{"action": "skip", "column": "MMSI", "name": "ExpectColumnValuesToNotBeNull"}]
+    changed = [{"name": "ExpectColumnValuesToNotBeNull", "column": "MMSI", "action": "failure"}]
+
+    assert fingerprint_config(first, "mapping") == fingerprint_config(reordered, "mapping")
+    assert fingerprint_config(first, "mapping") != fingerprint_config(changed, "mapping")
+    assert fingerprint_config(first, "mapping") != fingerprint_config(first, "other-mapping")
+
+
+def test_fingerprint_file_tracks_content(tmp_path):
+    path = tmp_path / "mapping.yaml"
+    path.write_text("a: 1\n")
+    before = fingerprint_file(str(path))
+    path.write_text("a: 2\n")
+
+    assert fingerprint_file(str(path)) != before
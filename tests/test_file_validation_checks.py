@@ -0,0 +1,42 @@
+import gzip
+import zipfile
+
+from src.checks.file_validation_checks import FileValidator
+
+CHECK = {"name": "ValidateCompressed", "allowed_compressions": ["zip", "gz"]}
+PAYLOAD = b"MMSI,Speed\n" + "".join(f"{413000000 + i},{i % 307 / 10}\n" for i in range(300000)).encode()
+
+
+def check(path):
+    return FileValidator(str(path), {}).validate_compressed_file(CHECK)
+
+
+def test_gzip_is_verified_in_blocks_and_truncation_is_reported(tmp_path):
+    good = tmp_path / "good.csv.gz"
+    good.write_bytes(gzip.compress(PAYLOAD))
+    truncated = tmp_path / "truncated.csv.gz"
+    truncated.write_bytes(good.read_bytes()[:len(good.read_bytes()) // 2])
+
+    result = check(good)
+    assert result["result"] and result["bytes_processed"] == len(PAYLOAD)
+
+    result = check(truncated)
+    assert not result["result"] and result["truncated"]
+    assert 0 < result["bytes_processed"] < len(PAYLOAD)
+
+
+def test_zip_members_are_crc_checked(tmp_path):
+    good = tmp_path / "good.zip"
+    with zipfile.ZipFile(good, "w", compression=zipfile.ZIP_STORED) as archive:
+        for index in range(3):
+            archive.writestr(f"part-{index}.csv", PAYLOAD)
+    corrupt = tmp_path / "corrupt.zip"
+    data = bytearray(good.read_bytes())
+    data[len(data) // 2] ^= 0xFF
+    corrupt.write_bytes(bytes(data))
+
+    result = check(good)
+    assert result["result"] and result["bytes_processed"] == 3 * len(PAYLOAD)
+
+    result = check(corrupt)
+    assert not result["result"] and "CRC" in result["details"]
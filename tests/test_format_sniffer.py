@@ -0,0 +1,54 @@
+import gzip
+import json
+
+import pandas as pd
+
+from src.checks.file_validation_checks import FileValidator
+from src.utils.format_sniffer import sniff_file_format
+
+CHECK = {"name": "ValidateFileFormat", "allowed_extensions": [".csv", ".json", ".parquet"]}
+FRAME = pd.DataFrame({"MMSI": ["413226770", "413768737"], "Name": ["A; B", "C"], "Speed": [12.5, 0.0]})
+
+
+def test_formats_are_detected_from_content(tmp_path):
+    FRAME.to_parquet(tmp_path / "parquet_no_extension")
+    FRAME.to_csv(tmp_path / "semicolon", sep=";", index=False)
+    (tmp_path / "records.gz").write_bytes(gzip.compress(
+        "\n".join(json.dumps(row) for row in FRAME.to_dict("records")).encode()))
+    (tmp_path / "array").write_text(json.dumps(FRAME.to_dict("records"), indent=2))
+
+    parquet = sniff_file_format(str(tmp_path / "parquet_no_extension"))
+    csv = sniff_file_format(str(tmp_path / "semicolon"))
+    ndjson = sniff_file_format(str(tmp_path / "records.gz"))
+    array = sniff_file_format(str(tmp_path / "array"))
+
+    assert (parquet["format"], parquet["extension"]) == ("parquet", ".parquet")
+    assert (csv["format"], csv["delimiter"], csv["has_header"]) == ("csv", ";", True)
+    assert (ndjson["format"], ndjson["compression"]) == ("ndjson", "gzip")
+    assert array["format"] == "json"
+
+
+def test_validate_file_format_checks_content_not_just_the_extension(tmp_path):
+    FRAME.to_csv(tmp_path / "delivery-stream-1-2025-03-27", index=False)
+    FRAME.to_parquet(tmp_path / "mislabelled.csv")
+    (tmp_path / "notes.txt").write_bytes(b"\x00\x01binary")
+
+    def check(name):
+        return FileValidator(str(tmp_path / name), {}).validate_file_format(CHECK)
+
+    assert check("delivery-stream-1-2025-03-27")["result"]
+    assert not check("mislabelled.csv")["result"]
+    assert check("mislabelled.csv")["detected_format"] == "parquet"
+    assert not check("notes.txt")["result"]
+
+
+def test_single_column_csv_is_accepted_when_declared_as_csv(tmp_path):
+    (tmp_path / "mmsi.csv").write_text("MMSI\n1\n2\n")
+    (tmp_path / "mmsi.txt").write_text("MMSI\n1\n2\n")
+
+    def check(name):
+        return FileValidator(str(tmp_path / name), {}).validate_file_format(CHECK)
+
+    assert sniff_file_format(str(tmp_path / "mmsi.csv"))["format"] == "text"
+    assert check("mmsi.csv")["result"]
+    assert not check("mmsi.txt")["result"]
@@ -0,0 +1,67 @@
+import great_expectations.expectations as gxe
+import pandas as pd
+import yaml
+
+from src.utils.instrumentation import CallbackSink, Instrumentation, OpenMetricsSink
+from src.validators.native_validate import NativeDataValidator
+from tests.test_s3_writer import LocalS3
+from validation_processor import ValidationProcessor
+
+
+def test_stage_events_reach_every_sink_and_the_openmetrics_file(tmp_path):
+    events = []
+    metrics_path = tmp_path / "data_quality.prom"
+    instrumentation = Instrumentation("AIS", [CallbackSink(events.append), OpenMetricsSink(str(metrics_path))])
+
+    with instrumentation.stage("load") as measurement:
+        measurement["rows"] = 1000
+    with instrumentation.stage("expectation", expectation="expect_column_values_to_not_be_null", column='M"SI'):
+        pass
+    instrumentation.flush()
+
+    assert [event["stage"] for event in events] == ["load", "expectation"]
+    assert events[0]["rows"] == 1000 and events[0]["rows_per_second"] > 0
+    assert events[0]["wall_seconds"] >= 0 and events[0]["peak_rss_bytes"] > 0
+    assert instrumentation.summary()["load"]["rows"] == 1000
+
+    text = metrics_path.read_text()
+    assert 'data_quality_stage_rows{process_id="AIS",stage="load"} 1000' in text
+    assert ('data_quality_stage_wall_seconds{process_id="AIS",stage="expectation",column="M\\"SI",'
+            'expectation="expect_column_values_to_not_be_null"}') in text
+    assert text.endswith("# EOF\n")
+
+
+def test_native_engine_times_every_expectation():
+    instrumentation = Instrumentation("TEST")
+    df = pd.DataFrame({"MMSI": ["1", None, "3"], "Latitude": [1.0, 2.0, 95.0]})
+
+    NativeDataValidator(df, instrumentation=instrumentation).validate([
+        gxe.ExpectColumnValuesToNotBeNull(column="MMSI"),
+        gxe.ExpectColumnValuesToBeBetween(column="Latitude", min_value=-90, max_value=90),
+    ])
+
+    labels = [event["labels"] for event in instrumentation.events if event["stage"] == "expectation"]
+    assert labels == [{"expectation": "expect_column_values_to_not_be_null", "column": "MMSI"},
+                      {"expectation": "expect_column_values_to_be_between", "column": "Latitude"}]
+
+
+def test_run_records_each_pipeline_stage(tmp_path):
+    path = tmp_path / "positions.csv"
+    pd.DataFrame({"MMSI": ["1", None, "3"], "Speed": [1.0, 2.0, 3.0]}).to_csv(path, index=False)
+    config = tmp_path / "config.yaml"
+    config.write_text(yaml.safe_dump({
+        "file_validation": [],
+        "expectations": [{"name": "ExpectColumnValuesToNotBeNull", "column": "MMSI", "action": "skip"}],
+    }))
+    processor = ValidationProcessor(str(path), str(config), None, "TEST",
+                                    invalid_file_path=str(tmp_path / "invalid.csv"), engine="native")
+    processor.s3_client = LocalS3()
+
+    processor.load_data()
+    processor.load_dataframe()
+    processor.run()
+    processor.flush_outputs()
+
+    stages = [event["stage"] for event in processor.instrumentation.events]
+    assert stages == ["load", "file_checks", "schema", "mapping", "expectation", "checkpoint", "parsing", "partition", "write"]
+    assert processor.instrumentation.events[0]["rows"] == 3
@@ -0,0 +1,45 @@
+import great_expectations.expectations as gxe
+import numpy as np
+import pandas as pd
+
+from src.utils.metric_cache import MetricCache
+from src.validators.native_validate import NativeDataValidator
+
+
+def test_expectations_share_the_derived_column_data():
+    df = pd.DataFrame({"MMSI": ["413226770", "413768737", None, "413768737"],
+                       "Source": ["Spire_DAIS", "Spire_DAIS", "Orbcomm", None]})
+    cache = MetricCache()
+    checkpoint_result, _ = NativeDataValidator(df, metric_cache=cache).validate([
+        gxe.ExpectColumnValuesToNotBeNull(column="MMSI", mostly=0.5),
+        gxe.ExpectColumnValuesToBeUnique(column="MMSI"),
+        gxe.ExpectColumnDistinctValuesToBeInSet(column="MMSI", value_set=["413226770", "413768737"]),
+        gxe.ExpectColumnMostCommonValueToBeInSet(column="MMSI", value_set=["413768737"]),
+        gxe.ExpectColumnValueLengthsToEqual(column="MMSI", value=9),
+        gxe.ExpectColumnValueLengthsToBeBetween(column="Source", min_value=7, max_value=10),
+        gxe.ExpectColumnUniqueValueCountToBeBetween(column="Source", min_value=2, max_value=2),
+    ])
+    results = checkpoint_result.run_results["DEFAULT_VALIDATION_NAME"]["results"]
+
+    assert [result["success"] for result in results] == [True, False, True, True, True, True, True]
+    assert results[1]["result"]["unexpected_index_list"] == [1, 3]
+    assert results[3]["result"]["observed_value"] == ["413768737"]
+    # One null mask, value counts and string lengths per column, drawn by every other expectation
+    assert sorted(cache.entries) == [("MMSI", "not_null"), ("MMSI", "string_lengths"), ("MMSI", "value_counts"),
+                                     ("Source", "not_null"), ("Source", "string_lengths"),
+                                     ("Source", "value_counts")]
+    assert cache.stats()["misses"] == 6 and cache.stats()["hits"] == 5
+    assert not cache.entries[("MMSI", "not_null")][0].flags.writeable
+
+
+def test_least_recently_used_metrics_are_evicted_beyond_the_budget():
+    cache = MetricCache(max_bytes=2 * 800)
+    for column in ["a", "b", "a", "c"]:
+        cache.get_or_compute(column, "not_null", lambda: np.ones(800, dtype=bool))
+
+    assert list(cache.entries) == [("a", "not_null"), ("c", "not_null")]
+    assert cache.stats()["evictions"] == 1 and cache.bytes == 1600
+
+    # A metric larger than the budget is computed but not kept
+    assert len(cache.get_or_compute("d", "value_counts", lambda: np.zeros(4000))) == 4000
+    assert ("d", "value_counts") not in cache.entries
@@ -0,0 +1,161 @@
+import great_expectations.expectations as gxe
+import pandas as pd
+import pytest
+
+from src.utils.parse_validation_result import Parse_GXValidator
+from src.utils.result_format import checkpoint_result_format
+from src.validators import native_validate
+from src.validators.native_validate import AGGREGATE_EVALUATORS, NativeDataValidator, is_supported
+
+
+def make_frame():
+    return pd.DataFrame({
+        "MMSI": ["413226770", "413768737", None, "413768737"],
+        "Latitude": [32.0, 95.5, 13.6, -12.1],
+        "Source": ["Spire_DAIS", "Spire_DAIS", "Orbcomm", "Unknown"],
+        "MessageType": [1, 1, 18, 3],
+    })
+
+
+def results_by_type(expectations):
+    checkpoint_result, context = NativeDataValidator(make_frame()).validate(expectations)
+    assert context is None
+    validation_result = Parse_GXValidator("TEST").extract_validation_result_from_checkpoint_result(checkpoint_result)
+    return {result["expectation_config"]["type"]: result for result in validation_result["results"]}
+
+
+def test_row_level_expectations_report_unexpected_indices():
+    results = results_by_type([
+        gxe.ExpectColumnValuesToNotBeNull(column="MMSI"),
+        gxe.ExpectColumnValuesToBeBetween(column="Latitude", min_value=-90, max_value=90),
+        gxe.ExpectColumnValuesToBeInSet(column="Source", value_set=["Spire_DAIS", "Orbcomm"]),
+        gxe.ExpectColumnValuesToBeUnique(column="MMSI"),
+    ])
+
+    assert results["expect_column_values_to_not_be_null"]["result"]["unexpected_index_list"] == [2]
+    assert results["expect_column_values_to_be_between"]["result"]["unexpected_index_list"] == [1]
+    assert results["expect_column_values_to_be_in_set"]["result"]["unexpected_list"] == ["Unknown"]
+    assert results["expect_column_values_to_be_unique"]["result"]["unexpected_index_list"] == [1, 3]
+    assert not any(result["success"] for result in results.values())
+
+
+def test_mostly_and_aggregate_expectations():
+    results = results_by_type([
+        gxe.ExpectColumnValuesToNotBeNull(column="MMSI", mostly=0.7),
+        gxe.ExpectColumnMaxToBeBetween(column="MessageType", min_value=1, max_value=27),
+        gxe.ExpectTableColumnCountToBeBetween(min_value=1, max_value=3),
+        gxe.ExpectColumnToExist(column="Speed"),
+    ])
+
+    assert results["expect_column_values_to_not_be_null"]["success"]
+    assert results["expect_column_max_to_be_between"]["result"]["observed_value"] == 18
+    assert not results["expect_table_column_count_to_be_between"]["success"]
+    assert not results["expect_column_to_exist"]["success"]
+
+
+def test_multicolumn_sum_is_checked_per_row():
+    df = pd.DataFrame({"Class_A": [1, 2, "3"], "Class_B": [2, 2.0, 0]})
+    checkpoint_result, _ = NativeDataValidator(df).validate([
+        gxe.ExpectMulticolumnSumToEqual(column_list=["Class_A", "Class_B"], sum_total=3),
+    ])
+    result = checkpoint_result.run_results["DEFAULT_VALIDATION_NAME"]["results"][0]
+
+    assert not result["exception_info"]["raised_exception"]
+    assert result["result"]["unexpected_index_list"] == [1]
+
+
+def test_type_check_is_row_level_only_for_object_columns():
+    results = results_by_type([
+        gxe.ExpectColumnValuesToBeOfType(column="MessageType", type_="int64"),
+        gxe.ExpectColumnValuesToBeInTypeList(column="Source", type_list=["int"]),
+    ])
+
+    assert results["expect_column_values_to_be_of_type"]["success"]
+    assert results["expect_column_values_to_be_of_type"]["result"]["observed_value"] == "int64"
+    assert results["expect_column_values_to_be_in_type_list"]["result"]["unexpected_count"] == 4
+
+
+def test_missing_column_is_reported_as_failure():
+    results = results_by_type([gxe.ExpectColumnValuesToNotBeNull(column="Speed")])
+
+    result = results["expect_column_values_to_not_be_null"]
+    assert not result["success"]
+    assert result["exception_info"]["raised_exception"]
+
+
+def test_unsupported_expectations_fall_back_to_gx():
+    conditional = gxe.ExpectColumnValuesToNotBeNull(column="MMSI", row_condition='Source=="Orbcomm"',
+                                                    condition_parser="pandas")
+    assert is_supported(gxe.ExpectColumnValuesToNotBeNull(column="MMSI"))
+    assert not is_supported(conditional)
+    assert is_supported(gxe.ExpectColumnMeanToBeBetween(column="Latitude", min_value=0))
+
+
+def test_result_detail_follows_result_format():
+    results = NativeDataValidator(make_frame()).validate([
+        gxe.ExpectColumnValuesToNotBeNull(column="MMSI", result_format="BOOLEAN_ONLY"),
+        gxe.ExpectColumnValuesToBeInSet(column="Source", value_set=["Orbcomm"], result_format="SUMMARY"),
+        gxe.ExpectColumnValuesToBeUnique(column="MMSI", result_format={
+            "result_format": "COMPLETE", "exclude_unexpected_values": True, "partial_unexpected_count": 1}),
+    ])[0].run_results["DEFAULT_VALIDATION_NAME"]["results"]
+    boolean_only, summary, complete = (result["result"] for result in results)
+
+    assert boolean_only == {}
+    assert summary["partial_unexpected_counts"] == [{"value": "Spire_DAIS", "count": 2},
+                                                   {"value": "Unknown", "count": 1}]
+    assert "unexpected_index_list" not in summary
+    assert complete["unexpected_index_list"] == [1, 3]
+    assert complete["partial_unexpected_index_list"] == [1]
+    assert "unexpected_list" not in complete and "partial_unexpected_list" not in complete
+
+
+def test_checkpoint_uses_the_most_detailed_level_needed():
+    result_format = checkpoint_result_format([
+        gxe.ExpectColumnValuesToNotBeNull(column="MMSI", result_format="BOOLEAN_ONLY"),
+        gxe.ExpectColumnValuesToBeUnique(column="MMSI", result_format={
+            "result_format": "COMPLETE", "exclude_unexpected_values": True, "partial_unexpected_count": 5}),
+    ])
+
+    assert result_format == {"result_format": "COMPLETE", "partial_unexpected_count": 20,
+                             "exclude_unexpected_values": True}
+
+
+def test_column_aggregates_share_one_pass_per_column(monkeypatch):
+    expectations = [expectation_class(column=column, min_value=0, max_value=100)
+                    for column in ["Latitude", "MessageType", "MMSI"]
+                    for expectation_class in [gxe.ExpectColumnMinToBeBetween, gxe.ExpectColumnMaxToBeBetween,
+                                              gxe.ExpectColumnMeanToBeBetween, gxe.ExpectColumnMedianToBeBetween,
+                                              gxe.ExpectColumnSumToBeBetween, gxe.ExpectColumnStdevToBeBetween,
+                                              gxe.ExpectColumnUniqueValueCountToBeBetween]]
+    unfused = [AGGREGATE_EVALUATORS[expectation.expectation_type](make_frame(), expectation)
+               for expectation in expectations]
+
+    parsed = []
+    as_numeric = native_validate.as_numeric
+    monkeypatch.setattr(native_validate, "as_numeric", lambda series: parsed.append(series.name) or as_numeric(series))
+    validator = NativeDataValidator(make_frame())
+    results = validator.evaluate_expectations(expectations)
+
+    assert sorted(parsed) == ["Latitude", "MMSI", "MessageType"]
+    for result, (success, observed) in zip(results, unfused):
+        assert result["success"] == success
+        assert result["result"]["observed_value"] == pytest.approx(observed)
+    assert validator.column_statistics["MessageType"]["max"] == 18
+
+
+
+def test_aggregate_evaluators_go_through_the_column_statistics(monkeypatch):
+    computed = []
+    compute = native_validate.compute_column_statistics
+    monkeypatch.setattr(native_validate, "compute_column_statistics",
+                        lambda df, column, statistics: computed.append(statistics) or compute(df, column, statistics))
+    expectations = [gxe.ExpectColumnMinToBeBetween(column="MessageType", min_value=0),
+                    gxe.ExpectColumnStdevToBeBetween(column="MessageType", min_value=0),
+                    gxe.ExpectColumnProportionOfUniqueValuesToBeBetween(column="MMSI", min_value=0)]
+
+    outcomes = [AGGREGATE_EVALUATORS[expectation.expectation_type](make_frame(), expectation)
+                for expectation in expectations]
+
+    assert computed == [{"min"}, {"stdev"}, {"unique_proportion"}]
+    assert outcomes[0] == (True, make_frame()["MessageType"].min())
+    assert outcomes[1][1] == pytest.approx(make_frame()["MessageType"].std())
@@ -0,0 +1,81 @@
+import queue
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from src.utils.output_writer import BackgroundWriter, CSVFileSink, OutputWriteError
+from validation_processor import ValidationProcessor
+
+
+class SlowSink:
+    def __init__(self, delay=0.0, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.batches = []
+        self.threads = set()
+        self.state = "open"
+
+    def write(self, df):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        if self.fail_on is not None and len(self.batches) == self.fail_on:
+            raise IOError("connection reset")
+        self.batches.append(df)
+
+    def close(self):
+        self.state = "closed"
+
+    def abort(self):
+        self.state = "aborted"
+
+
+def batch(start):
+    return pd.DataFrame({"MMSI": [str(start), str(start + 1)]})
+
+
+def test_sinks_are_written_concurrently_and_flushed(tmp_path):
+    local, remote = CSVFileSink(str(tmp_path / "invalid.csv")), SlowSink(delay=0.05)
+    writer = BackgroundWriter({"local": local, "s3": remote}, max_pending=10)
+
+    start = time.monotonic()
+    for i in range(0, 10, 2):
+        writer.submit(batch(i))
+    submitted = time.monotonic() - start
+
+    assert writer.flush() is True
+    assert submitted < 0.05  # the producer did not wait on the slow sink
+    assert pd.read_csv(tmp_path / "invalid.csv")["MMSI"].tolist() == list(range(10))
+    assert len(remote.batches) == 5 and remote.state == "closed"
+    assert remote.threads == {"output-writer-s3"}
+
+
+def test_full_queue_applies_backpressure_and_errors_surface_at_flush():
+    failing = SlowSink(delay=0.2, fail_on=0)
+    writer = BackgroundWriter({"s3": failing}, max_pending=1)
+
+    writer.submit(batch(0))  # taken by the worker
+    writer.submit(batch(2))  # fills the queue
+    with pytest.raises(queue.Full):
+        writer.submit(batch(4), timeout=0.05)
+
+    with pytest.raises(OutputWriteError, match="s3: connection reset"):
+        writer.flush()
+    assert failing.state == "aborted" and failing.batches == []
+
+
+def test_reopening_the_output_writer_flushes_the_previous_one(tmp_path):
+    processor = ValidationProcessor("unused.csv", "unused.yaml", None, "TEST",
+                                    invalid_file_path=str(tmp_path / "invalid.csv"))
+    failing = SlowSink(delay=0.05, fail_on=1)
+    processor.open_invalid_rows_S3 = lambda s3_file_format: failing
+    processor.open_output_writer("csv").submit(batch(0))
+    processor.output_writer.submit(batch(2))
+
+    # The rows of the first writer are written and its failure raised before it is replaced
+    with pytest.raises(OutputWriteError):
+        processor.open_output_writer()
+    assert pd.read_csv(tmp_path / "invalid.csv")["MMSI"].tolist() == [0, 1, 2, 3]
+    assert failing.state == "aborted"
+    assert processor.open_output_writer() is processor.output_writer
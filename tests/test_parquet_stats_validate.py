@@ -0,0 +1,90 @@
+import great_expectations.expectations as gxe
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from src.utils.parquet_stats import is_parquet
+from src.validators.native_validate import NativeDataValidator
+from src.validators.parquet_stats_validate import ParquetStatisticsValidator
+from validation_processor import ValidationProcessor
+
+
+def write_parquet(path, row_group_size=4):
+    df = pd.DataFrame({
+        "MessageType": np.array([1, 1, 3, 1, 18, 1, 1, 1, 24, 27, 5, 1], dtype=np.int64),
+        "Speed": [0.5, 1.2, 13.0, 2.5, 0.0, 7.7, 1.0, 1.0, 101.0, 3.3, 4.4, 5.5],
+        "MMSI": ["413226770"] * 10 + [None, "413768737"],
+    })
+    df.to_parquet(path, row_group_size=row_group_size, index=False)
+    return df
+
+
+def results_of(validator, expectations):
+    checkpoint_result, _ = validator.validate(expectations)
+    validation_result = checkpoint_result.run_results["DEFAULT_VALIDATION_NAME"]
+    return validation_result["results"], validation_result["meta"]["row_groups"]
+
+
+def test_statistics_decide_without_decoding_and_decode_only_open_row_groups(tmp_path):
+    path = str(tmp_path / "positions.parquet")
+    write_parquet(path)
+
+    results, row_groups = results_of(ParquetStatisticsValidator(path), [
+        gxe.ExpectTableRowCountToBeBetween(min_value=1, max_value=100),
+        gxe.ExpectColumnMaxToBeBetween(column="MessageType", min_value=1, max_value=27),
+        gxe.ExpectColumnValuesToBeBetween(column="MessageType", min_value=1, max_value=27),
+    ])
+    assert all(result["success"] for result in results)
+    assert results[0]["result"]["observed_value"] == 12 and results[1]["result"]["observed_value"] == 27
+    assert row_groups == {"total": 3, "decoded": []}
+
+    # Only the last row group holds nulls and message types above 20
+    results, row_groups = results_of(ParquetStatisticsValidator(path), [
+        gxe.ExpectColumnValuesToNotBeNull(column="MMSI"),
+        gxe.ExpectColumnValuesToBeBetween(column="MessageType", min_value=1, max_value=20,
+                                          result_format="BOOLEAN_ONLY"),
+    ])
+    assert results[0]["result"]["unexpected_index_list"] == [10]
+    assert not results[1]["success"]
+    assert row_groups["decoded"] == [2]
+
+
+def test_statistics_results_match_the_native_engine(tmp_path):
+    path = str(tmp_path / "positions.parquet")
+    df = write_parquet(path, row_group_size=5)
+    expectations = [
+        gxe.ExpectColumnValuesToBeBetween(column="Speed", min_value=0, max_value=100),
+        gxe.ExpectColumnValuesToBeBetween(column="MessageType", min_value=2, max_value=30, mostly=0.3),
+        gxe.ExpectColumnValuesToNotBeNull(column="MMSI", mostly=0.9),
+        gxe.ExpectColumnMinToBeBetween(column="Speed", min_value=0.1),
+        gxe.ExpectColumnValuesToBeInSet(column="MessageType", value_set=[1, 3, 5, 18]),
+    ]
+
+    statistics_results, _ = results_of(ParquetStatisticsValidator(path), expectations)
+    native_result, _ = NativeDataValidator(df).validate(expectations)
+    native_results = native_result.run_results["DEFAULT_VALIDATION_NAME"]["results"]
+
+    for statistics_result, native in zip(statistics_results, native_results):
+        assert statistics_result["expectation_config"] == native["expectation_config"]
+        assert statistics_result["success"] == native["success"]
+        assert statistics_result["result"] == native["result"]
+
+
+def test_run_answers_parquet_expectations_from_statistics_before_the_row_checks(tmp_path, monkeypatch):
+    # Recognised by its magic bytes, not its extension
+    path = str(tmp_path / "positions.dat")
+    df = write_parquet(path)
+    (tmp_path / "positions.csv.parquet").write_text("MessageType\n1\n")
+    assert is_parquet(path) and not is_parquet(str(tmp_path / "positions.csv.parquet"))
+
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump({"expectations": [
+        {"name": "ExpectColumnValuesToNotBeNull", "column": "MessageType", "action": "skip"}]}))
+    processor = ValidationProcessor(path, str(config_path), None, "TEST", engine="native")
+    monkeypatch.setattr(processor, "validate_rows", lambda: pytest.fail("the rows were checked"))
+
+    df_valid = processor.run()
+
+    assert len(df_valid) == len(df) and processor.validation_results.success
+    assert processor.parquet_statistics["num_rows"] == len(df)
@@ -0,0 +1,64 @@
+import os
+
+import pandas as pd
+import yaml
+
+from src.utils.result_cache import ResultCache
+from tests.test_s3_writer import LocalS3
+from validation_processor import ValidationProcessor
+
+
+def run_once(tmp_path, cache, expectations, read_options=None):
+    path = tmp_path / "positions.csv"
+    if not path.exists():
+        pd.DataFrame({"MMSI": ["1", None, "3", None], "Speed": [1.0, 2.0, 3.0, 40.0]}).to_csv(path, index=False)
+    config = tmp_path / "config.yaml"
+    config.write_text(yaml.safe_dump({"file_validation": [], "expectations": expectations}))
+    processor = ValidationProcessor(str(path), str(config), None, "TEST", invalid_file_path=str(tmp_path / "invalid.csv"),
+                                    engine="native", result_cache=cache)
+    processor.s3_client = LocalS3()
+    processor.load_data()
+    processor.load_dataframe(read_options)
+    df_valid = processor.run()
+    processor.flush_outputs()
+    return df_valid, [event["stage"] for event in processor.instrumentation.events]
+
+
+def test_rerun_partitions_rows_from_the_cache(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    expectations = [{"name": "ExpectColumnValuesToNotBeNull", "column": "MMSI", "action": "skip"}]
+
+    first, first_stages = run_once(tmp_path, cache, expectations)
+    os.remove(tmp_path / "invalid.csv")
+    second, second_stages = run_once(tmp_path, cache, expectations)
+
+    assert "checkpoint" in first_stages
+    assert "checkpoint" not in second_stages and "file_checks" not in second_stages
+    assert second.equals(first)
+    assert pd.read_csv(tmp_path / "invalid.csv")["Speed"].tolist() == [2.0, 40.0]
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+    # Another expectation suite is another key
+    expectations.append({"name": "ExpectColumnValuesToBeBetween", "column": "Speed", "max_value": 10,
+                         "action": "skip"})
+    third, third_stages = run_once(tmp_path, cache, expectations)
+    assert "checkpoint" in third_stages
+    assert third["Speed"].tolist() == [1.0, 3.0]
+
+    # The same file parsed another way is another key
+    _, fourth_stages = run_once(tmp_path, cache, expectations, read_options={"dtype": {"MMSI": "string"}})
+    assert "checkpoint" in fourth_stages
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=10 ** 9)
+    for position, key in enumerate(["a", "b", "c"]):
+        cache.put(key, {"payload": "x" * 1000})
+        os.utime(cache.path(key), ns=(position * 10 ** 9, position * 10 ** 9))
+    cache.max_bytes = 3 * os.path.getsize(cache.path("a"))
+
+    assert cache.get("a") is not None
+    cache.put("d", {"payload": "x" * 1000})
+
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in ["a", "c", "d"])
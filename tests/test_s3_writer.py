@@ -0,0 +1,96 @@
+import gc
+import gzip
+import io
+
+import pandas as pd
+import pytest
+
+from src.utils.s3_writer import S3_MIN_PART_SIZE, S3MultipartWriter, S3RecordWriter
+
+
+class LocalS3:
+    """In-memory stand-in for the S3 client calls the writers make."""
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = {}
+        self.put_calls = 0
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.put_calls += 1
+        self.objects[(Bucket, Key)] = bytes(Body)
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        upload_id = f"upload-{len(self.uploads)}"
+        self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.uploads[UploadId][PartNumber] = bytes(Body)
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        parts = self.uploads.pop(UploadId)
+        numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+        assert all(len(parts[number]) >= S3_MIN_PART_SIZE for number in numbers[:-1])
+        self.objects[(Bucket, Key)] = b"".join(parts[number] for number in numbers)
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId)
+
+
+def records(rows, start=0):
+    return pd.DataFrame({"MMSI": [str(413000000 + start + i) for i in range(rows)],
+                         "Speed": [float(i % 50) for i in range(rows)],
+                         "expectation_failed_name": "ExpectColumnValuesToNotBeNull"})
+
+
+@pytest.mark.parametrize("file_format", ["csv", "csv.gz", "parquet"])
+def test_record_writer_streams_frames_in_multipart_parts(file_format):
+    s3 = LocalS3()
+    frames = [records(60000, start) for start in range(0, 240000, 60000)]
+
+    with S3RecordWriter("bucket", "invalid", file_format, client=s3) as writer:
+        for frame in frames:
+            writer.write(frame)
+
+    body = s3.objects[("bucket", "invalid")]
+    if file_format == "parquet":
+        uploaded = pd.read_parquet(io.BytesIO(body))
+    else:
+        uploaded = pd.read_csv(io.BytesIO(gzip.decompress(body) if file_format == "csv.gz" else body),
+                               dtype={"MMSI": str})
+    pd.testing.assert_frame_equal(uploaded, pd.concat(frames, ignore_index=True))
+    assert writer.rows == 240000 and not s3.uploads
+    if file_format == "csv":
+        assert len(writer.upload.parts) > 1 and s3.put_calls == 0
+
+
+def test_small_objects_use_one_put_and_failures_leave_nothing_behind():
+    s3 = LocalS3()
+    with S3RecordWriter("bucket", "small.csv", client=s3) as writer:
+        writer.write(records(3))
+    assert s3.put_calls == 1 and s3.objects[("bucket", "small.csv")].startswith(b"MMSI,Speed")
+
+    with pytest.raises(RuntimeError):
+        with S3MultipartWriter("bucket", "broken", client=s3) as upload:
+            upload.write(b"x" * (S3_MIN_PART_SIZE + 1))
+            raise RuntimeError("validation crashed")
+    assert ("bucket", "broken") not in s3.objects and not s3.uploads
+
+
+def test_abandoned_writer_never_publishes_a_partial_object():
+    s3 = LocalS3()
+    upload = S3MultipartWriter("bucket", "abandoned", client=s3, part_size=S3_MIN_PART_SIZE)
+    upload.write(b"x" * (S3_MIN_PART_SIZE + 1))
+    assert s3.uploads
+
+    del upload
+    gc.collect()
+
+    assert ("bucket", "abandoned") not in s3.objects and not s3.uploads
+
+    small = S3MultipartWriter("bucket", "closed", client=s3)
+    small.write(b"partial")
+    small.close()
+    assert ("bucket", "closed") not in s3.objects and s3.put_calls == 0
@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+import yaml
+
+from src.checks.schema_checks import SchemaValidator, read_columns
+from src.config.settings import CONFIG_YAML_PATH
+from src.utils.data_loader import schema_read_options
+from validation_processor import StopProcessError, ValidationProcessor
+
+EXPECTATIONS = [
+    {"name": "ExpectColumnToExist", "column": "Speed", "action": "skip"},
+    {"name": "ExpectTableColumnCountToBeBetween", "min": 2, "max": 2},
+    {"name": "ExpectTableColumnsToMatchSet", "columns": ["MMSI", "Latitude"], "action": "failure"},
+    {"name": "ExpectColumnValuesToNotBeNull", "column": "MMSI", "action": "skip"},
+]
+
+
+def test_schema_expectations_are_answered_from_the_header_only(tmp_path):
+    csv_path = tmp_path / "delivery.csv"
+    # Only the header is read: the malformed body would make a full parse fail
+    csv_path.write_text('MMSI,Latitude\n1,2\n1,2,3,4\n')
+    parquet_path = tmp_path / "delivery.parquet"
+    pd.DataFrame({"MMSI": ["1"], "Latitude": [1.0], "Speed": [2.0]}).to_parquet(parquet_path)
+
+    csv_results = SchemaValidator(str(csv_path), EXPECTATIONS, CONFIG_YAML_PATH).validate()
+    parquet_results = SchemaValidator(str(parquet_path), EXPECTATIONS, CONFIG_YAML_PATH).validate()
+
+    assert [result["success"] for result in csv_results] == [False, True, True]
+    assert [result["action"] for result in csv_results] == ["skip", None, "failure"]
+    assert [result["success"] for result in parquet_results] == [True, False, False]
+    assert read_columns(str(csv_path), {"header": None, "names": ["a", "b"], "skiprows": 1}) == ["a", "b"]
+
+
+def test_processor_skips_or_stops_before_loading(tmp_path):
+    csv_path = tmp_path / "delivery.csv"
+    csv_path.write_text("MMSI,Latitude\n1,2\n")
+    config_path = tmp_path / "config.yaml"
+
+    config_path.write_text(yaml.safe_dump({"expectations": EXPECTATIONS[:2]}))
+    processor = ValidationProcessor(str(csv_path), str(config_path), None, "TEST", engine="native")
+    processor.load_data()
+    results, skip_file = processor.validate_schema()
+    assert skip_file and len(results) == 2
+
+    config_path.write_text(yaml.safe_dump({"expectations": [
+        {"name": "ExpectTableColumnsToMatchSet", "columns": ["MMSI"], "action": "failure"}]}))
+    processor.load_data()
+    with pytest.raises(StopProcessError):
+        processor.validate_schema()
+
+
+def test_declared_schema_does_not_replace_the_real_header(tmp_path):
+    csv_path = tmp_path / "delivery.csv"
+    csv_path.write_text("MMSI,Lat\n1,2\n")
+    schema = {"header": True, "columns": [{"name": "MMSI"}, {"name": "Latitude"}]}
+
+    results = SchemaValidator(str(csv_path), [{"name": "ExpectColumnToExist", "column": "Latitude"}],
+                              CONFIG_YAML_PATH, schema_read_options(schema)).validate()
+
+    assert read_columns(str(csv_path), schema_read_options(schema)) == ["MMSI", "Lat"]
+    assert not results[0]["success"]
+
+
+def test_run_checks_the_schema_before_validating_rows(tmp_path):
+    csv_path = tmp_path / "delivery.csv"
+    csv_path.write_text("MMSI,Latitude\n1,2\n")
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump({"expectations": EXPECTATIONS[:2]}))
+
+    processor = ValidationProcessor(str(csv_path), str(config_path), None, "TEST", engine="native")
+    df_valid = processor.run()
+
+    assert df_valid.empty and processor.df is None
+    assert not processor.validation_results.success
+
+    config_path.write_text(yaml.safe_dump({"expectations": [
+        {"name": "ExpectTableColumnsToMatchSet", "columns": ["MMSI"], "action": "failure"}]}))
+    processor = ValidationProcessor(str(csv_path), str(config_path), pd.read_csv(csv_path), "TEST", engine="native")
+    with pytest.raises(StopProcessError):
+        processor.run()
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.sketches import DistinctCounter, MomentsAccumulator, QuantileSketch
+
+
+@pytest.fixture(scope="module")
+def values():
+    return np.random.default_rng(11).normal(12, 4, 200_000)
+
+
+def test_moments_merge_matches_whole_column(values):
+    left, right = MomentsAccumulator(), MomentsAccumulator()
+    for i, batch in enumerate(np.array_split(values, 9)):
+        (left if i % 2 else right).update(batch)
+    merged = left.merge(right)
+
+    assert merged.count == len(values)
+    assert merged.mean == pytest.approx(values.mean())
+    assert merged.stdev == pytest.approx(values.std(ddof=1))
+    assert (merged.min, merged.max) == (values.min(), values.max())
+
+
+def test_quantile_sketch_stays_within_rank_error(values):
+    sketches = [QuantileSketch(relative_error=0.01, seed=seed) for seed in range(3)]
+    for i, batch in enumerate(np.array_split(values, 30)):
+        sketches[i % 3].update(batch)
+    merged = sketches[0].merge(sketches[1]).merge(sketches[2])
+
+    ordered = np.sort(values)
+    for quantile, estimate in zip([0.05, 0.5, 0.95], merged.quantiles([0.05, 0.5, 0.95])):
+        assert abs(np.searchsorted(ordered, estimate) / len(values) - quantile) <= 0.01
+
+
+def test_exact_quantile_sketch_matches_pandas(values):
+    sample = pd.Series(values[:1001].round(2))
+    sketch = QuantileSketch(exact=True)
+    for batch in np.array_split(sample.to_numpy(), 4):
+        sketch.update(batch)
+
+    assert sketch.quantiles([0.1, 0.9]) == sample.quantile([0.1, 0.9], interpolation="nearest").tolist()
+    assert sketch.median() == sample.median()
+
+
+def test_distinct_counter_error_and_exact_fallback():
+    ids = np.random.default_rng(3).integers(0, 50_000, 300_000)
+    approximate, other = DistinctCounter(relative_error=0.01), DistinctCounter(relative_error=0.01)
+    approximate.update(ids[:150_000])
+    other.update(ids[150_000:])
+    exact = DistinctCounter(exact=True)
+    exact.update(ids)
+
+    truth = len(np.unique(ids))
+    assert abs(approximate.merge(other).count() - truth) / truth < 0.03
+    assert exact.count() == truth
+
+
+def test_distinct_counter_ignores_the_dtype_each_batch_was_read_with():
+    for exact in (True, False):
+        counter = DistinctCounter(exact=exact)
+        counter.update(pd.Series([1.0, 2.0, None]))
+        counter.update(pd.Series([1, 2]))
+
+        assert counter.count() == 2
@@ -0,0 +1,103 @@
+import great_expectations.expectations as gxe
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+pyspark = pytest.importorskip("pyspark")
+
+from pyspark.sql import SparkSession  # noqa: E402
+
+from src.validators.native_validate import NativeDataValidator  # noqa: E402
+from src.validators.spark_validate import SparkDataValidator  # noqa: E402
+from validation_processor import ValidationProcessor  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def spark():
+    session = SparkSession.builder.master("local[2]").appName("data-quality-tests") \
+        .config("spark.sql.shuffle.partitions", "2").getOrCreate()
+    yield session
+    session.stop()
+
+
+def make_frame():
+    return pd.DataFrame({
+        "MMSI": ["413226770", "413768737", None, "413768737", "41322677X"],
+        "Latitude": [32.0, 95.5, 13.6, np.nan, -12.1],
+        "Source": ["Spire_DAIS", "Spire_DAIS", "Orbcomm", "Unknown", "Orbcomm"],
+        "MessageType": [1, 1, 18, 3, 27],
+    })
+
+
+def counts(checkpoint_result):
+    validation_result = list(checkpoint_result.run_results.values())[0]
+    return [(result["success"], result["result"].get("unexpected_count"),
+             pytest.approx(result["result"].get("observed_value")))
+            for result in validation_result["results"]]
+
+
+def test_spark_backend_matches_the_native_engine(spark):
+    expectations = [
+        gxe.ExpectColumnValuesToNotBeNull(column="MMSI"),
+        gxe.ExpectColumnValuesToBeBetween(column="Latitude", min_value=-90, max_value=90),
+        gxe.ExpectColumnValuesToBeInSet(column="Source", value_set=["Spire_DAIS", "Orbcomm"]),
+        gxe.ExpectColumnValuesToBeUnique(column="MMSI"),
+        gxe.ExpectColumnValuesToMatchRegex(column="MMSI", regex=r"^\d{9}$"),
+        gxe.ExpectTableRowCountToBeBetween(min_value=1, max_value=10),
+        gxe.ExpectColumnMeanToBeBetween(column="Latitude", min_value=0, max_value=20),
+        gxe.ExpectColumnUniqueValueCountToBeBetween(column="Source", min_value=1, max_value=3),
+    ]
+    native, _ = NativeDataValidator(make_frame()).validate(expectations)
+    distributed, _ = SparkDataValidator(spark.createDataFrame(make_frame())).validate(expectations)
+
+    assert counts(distributed) == counts(native)
+
+
+def test_run_spark_splits_skip_failures_into_dataframes(spark, tmp_path):
+    config = tmp_path / "config.yaml"
+    config.write_text(yaml.safe_dump({"file_validation": [], "expectations": [
+        {"name": "ExpectColumnValuesToNotBeNull", "column": "MMSI", "action": "skip"},
+        {"name": "ExpectColumnValuesToBeBetween", "column": "Latitude", "min_value": -90, "max_value": 90,
+         "action": "skip"},
+    ]}))
+    invalid_path = tmp_path / "invalid"
+    processor = ValidationProcessor(None, str(config), None, "TEST", invalid_file_path=str(invalid_path))
+
+    df_valid, _ = processor.run_spark(spark.createDataFrame(make_frame()))
+
+    assert sorted(row["MMSI"] for row in df_valid.collect()) == ["413226770", "41322677X", "413768737"]
+    invalid = spark.read.parquet(str(invalid_path)).toPandas()
+    assert sorted(invalid["expectation_failed_name"]) == ["ExpectColumnValuesToBeBetween",
+                                                          "ExpectColumnValuesToNotBeNull"]
+
+
+def test_type_and_unsupported_expectations_do_not_abort_the_run(spark):
+    expectations = [
+        gxe.ExpectColumnValuesToBeOfType(column="MessageType", type_="int64"),
+        gxe.ExpectColumnValuesToBeInTypeList(column="MMSI", type_list=["int64", "StringType"]),
+        gxe.ExpectColumnValuesToBeOfType(column="Latitude", type_="int64"),
+        gxe.ExpectColumnMedianToBeBetween(column="MessageType", min_value=0, max_value=5),
+        gxe.ExpectColumnValuesToNotBeNull(column="MMSI"),
+    ]
+    result, _ = SparkDataValidator(spark.createDataFrame(make_frame())).validate(expectations)
+
+    results = list(result.run_results.values())[0]["results"]
+    assert [r["success"] for r in results] == [True, True, False, False, False]
+    assert results[2]["result"]["observed_value"] == "double"
+    assert results[3]["exception_info"]["raised_exception"]
+    assert results[4]["result"]["unexpected_count"] == 1
+
+
+def test_run_spark_answers_type_expectations_of_the_user_yaml(spark, tmp_path):
+    config = tmp_path / "config.yaml"
+    config.write_text(yaml.safe_dump({"file_validation": [], "expectations": [
+        {"name": "ExpectColumnValuesToBeOfType", "column": "MessageType", "type": "int64", "action": "skip"},
+        {"name": "ExpectColumnValuesToNotBeNull", "column": "MMSI", "action": "skip"},
+    ]}))
+    processor = ValidationProcessor(None, str(config), None, "TEST")
+
+    df_valid, results = processor.run_spark(spark.createDataFrame(make_frame()))
+
+    assert [result["success"] for result in list(results.run_results.values())[0]["results"]] == [True, False]
+    assert df_valid.count() == 4
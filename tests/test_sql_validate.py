@@ -0,0 +1,167 @@
+import great_expectations.expectations as gxe
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.validators.native_validate import NativeDataValidator
+from src.validators.sql_validate import SQLDataValidator
+
+
+def make_frame():
+    return pd.DataFrame({
+        "MMSI": ["413226770", "413768737", None, "413768737", "41322677X"],
+        "Latitude": [32.0, 95.5, 13.6, np.nan, -12.1],
+        "Source": ["Spire_DAIS", "Spire_DAIS", "Orbcomm", "Unknown", "Orbcomm"],
+        "MessageType": [1, 1, 18, 3, 27],
+    }, index=[10, 11, 12, 13, 14])
+
+
+EXPECTATIONS = [
+    gxe.ExpectColumnValuesToNotBeNull(column="MMSI"),
+    gxe.ExpectColumnValuesToBeBetween(column="Latitude", min_value=-90, max_value=90),
+    gxe.ExpectColumnValuesToBeInSet(column="Source", value_set=["Spire_DAIS", "Orbcomm"]),
+    gxe.ExpectColumnValuesToBeUnique(column="MMSI"),
+    gxe.ExpectColumnValuesToMatchRegex(column="MMSI", regex=r"^\d{9}$"),
+    gxe.ExpectColumnValueLengthsToBeBetween(column="Source", min_value=7, max_value=10),
+    gxe.ExpectTableRowCountToBeBetween(min_value=1, max_value=10),
+    gxe.ExpectColumnMeanToBeBetween(column="MessageType", min_value=0, max_value=20),
+    gxe.ExpectColumnStdevToBeBetween(column="Latitude", min_value=0, max_value=100),
+    gxe.ExpectColumnUniqueValueCountToBeBetween(column="Source", min_value=1, max_value=3),
+    gxe.ExpectColumnToExist(column="Speed"),
+    # Not compiled to SQL, evaluated by the native engine
+    gxe.ExpectColumnMedianToBeBetween(column="MessageType", min_value=0, max_value=5),
+]
+
+
+def comparable(checkpoint_result):
+    validation_result = list(checkpoint_result.run_results.values())[0]
+    return [(result["expectation_config"]["type"], result["success"],
+             {key: pytest.approx(value) if isinstance(value, float) else value
+              for key, value in result["result"].items()})
+            for result in validation_result["results"]]
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "duckdb"])
+def test_sql_engine_matches_the_native_engine(backend):
+    if backend == "duckdb":
+        pytest.importorskip("duckdb")
+    native, _ = NativeDataValidator(make_frame()).validate(EXPECTATIONS)
+    sql, _ = SQLDataValidator(make_frame(), backend=backend).validate(EXPECTATIONS)
+
+    assert comparable(sql) == comparable(native)
+    assert list(sql.run_results.values())[0]["meta"]["engine"] == f"sql_{backend}"
+
+
+def test_sql_engine_validates_a_table_of_a_local_database(tmp_path):
+    import sqlite3
+
+    connection = sqlite3.connect(str(tmp_path / "positions.db"))
+    make_frame().to_sql("positions", connection, index=False)
+    result, _ = SQLDataValidator(connection=connection, table="positions", backend="sqlite").validate([
+        gxe.ExpectColumnValuesToNotBeNull(column="MMSI"),
+        gxe.ExpectTableColumnsToMatchSet(column_set=["MMSI", "Latitude", "Source", "MessageType"]),
+    ])
+
+    not_null, columns = list(result.run_results.values())[0]["results"]
+    assert not_null["result"]["unexpected_index_list"] == [2]
+    assert columns["success"]
+
+
+def test_processor_partitions_rows_with_the_sql_engine(tmp_path):
+    import yaml
+
+    from validation_processor import ValidationProcessor
+
+    config = tmp_path / "config.yaml"
+    config.write_text(yaml.safe_dump({"file_validation": [], "expectations": [
+        {"name": "ExpectColumnValuesToNotBeNull", "column": "MMSI", "action": "skip"},
+        {"name": "ExpectColumnValuesToBeBetween", "column": "Latitude", "min_value": -90, "max_value": 90,
+         "action": "skip"},
+    ]}))
+    processor = ValidationProcessor("positions.csv", str(config), make_frame().reset_index(drop=True), "TEST",
+                                    engine="sql")
+    processor.load_data()
+
+    invalid_df, df_valid, df_invalid = processor.validate_rows()
+
+    assert df_valid["MMSI"].tolist() == ["413226770", "413768737", "41322677X"]
+    assert sorted(invalid_df["expectation_failed_name"]) == ["ExpectColumnValuesToBeBetween",
+                                                             "ExpectColumnValuesToNotBeNull"]
+
+
+def test_stdev_of_large_magnitude_values_matches_pandas():
+    df = pd.DataFrame({"MMSI": [244000000 + i % 7 for i in range(10000)]})
+    result, _ = SQLDataValidator(df, backend="sqlite").validate([
+        gxe.ExpectColumnStdevToBeBetween(column="MMSI", min_value=1, max_value=3),
+    ])
+
+    stdev = list(result.run_results.values())[0]["results"][0]
+    assert stdev["result"]["observed_value"] == pytest.approx(df["MMSI"].std())
+    assert stdev["success"]
+
+
+@pytest.mark.parametrize("source", ["frame", "table"])
+def test_duckdb_reports_failing_rows_in_source_order(source):
+    duckdb = pytest.importorskip("duckdb")
+    # Several vectors worth of rows, scanned by more than one thread
+    df = pd.DataFrame({"Latitude": [95.0 if i % 997 == 0 else 10.0 for i in range(300000)]})
+    expected = df.index[df["Latitude"] > 90].tolist()
+    if source == "frame":
+        validator = SQLDataValidator(df, backend="duckdb")
+    else:
+        connection = duckdb.connect()
+        connection.execute("CREATE TABLE positions AS SELECT * FROM df")
+        validator = SQLDataValidator(connection=connection, table="positions", backend="duckdb")
+
+    result, _ = validator.validate([gxe.ExpectColumnValuesToBeBetween(
+        column="Latitude", min_value=-90, max_value=90, result_format={"result_format": "COMPLETE"})])
+
+    between = list(result.run_results.values())[0]["results"][0]
+    assert between["result"]["unexpected_index_list"] == expected
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "duckdb"])
+def test_values_of_another_type_than_the_column_match_the_native_engine(backend):
+    if backend == "duckdb":
+        pytest.importorskip("duckdb")
+    df = pd.DataFrame({"MessageType": [1, 2, 3, 1], "MMSI": ["1", "2", "x", "1"],
+                       "Timestamp": pd.to_datetime(["2024-01-02", "2023-12-31", "2024-03-01", "2024-01-05"])})
+    expectations = [
+        gxe.ExpectColumnValuesToBeInSet(column="MessageType", value_set=["1", "x"]),
+        gxe.ExpectColumnValuesToBeInSet(column="MMSI", value_set=[1]),
+        gxe.ExpectColumnValuesToBeInSet(column="MMSI", value_set=[1, "x"]),
+        gxe.ExpectColumnValuesToNotBeInSet(column="MessageType", value_set=[1, "2"]),
+        gxe.ExpectColumnValuesToBeBetween(column="MessageType", min_value="2024-01-01"),
+        gxe.ExpectColumnValuesToBeInSet(column="Timestamp", value_set=["x"]),
+    ]
+    native, _ = NativeDataValidator(df).validate(expectations)
+    sql, _ = SQLDataValidator(df, backend=backend).validate(expectations)
+
+    def outcomes(checkpoint_result):
+        return [(result["success"], result["result"].get("unexpected_count"),
+                 result["exception_info"]["raised_exception"])
+                for result in list(checkpoint_result.run_results.values())[0]["results"]]
+
+    assert outcomes(sql) == outcomes(native)
+    assert [unexpected_count for _, unexpected_count, _ in outcomes(sql)] == [4, 4, 3, 2, None, 4]
+
+
+def test_failing_statement_falls_back_to_one_statement_per_expectation(monkeypatch):
+    validator = SQLDataValidator(make_frame(), backend="sqlite")
+    statements = []
+    execute = validator.dialect.execute
+
+    def failing_execute(sql, params=()):
+        statements.append(sql)
+        if "Source" in sql and "IN" in sql:
+            raise RuntimeError("cannot compare")
+        return execute(sql, params)
+
+    monkeypatch.setattr(validator.dialect, "execute", failing_execute)
+    result, _ = validator.validate(EXPECTATIONS[:3])
+
+    results = list(result.run_results.values())[0]["results"]
+    assert [r["expectation_config"]["type"] for r in results] == [e.expectation_type for e in EXPECTATIONS[:3]]
+    assert [r["success"] for r in results] == [False, False, False]
+    # The set expectation is answered by the native engine after its own statement failed
+    assert results[2]["result"]["unexpected_count"] == 1
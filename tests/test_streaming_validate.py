@@ -0,0 +1,128 @@
+import io
+
+import great_expectations.expectations as gxe
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from src.validators.native_validate import NativeDataValidator
+from src.validators.streaming_validate import StreamingDataValidator
+from validation_processor import ValidationProcessor
+
+
+def make_frame(rows=1000, seed=7):
+    rng = np.random.default_rng(seed)
+    speed = rng.normal(12, 4, rows).round(1)
+    speed[rng.choice(rows, 20, replace=False)] = np.nan
+    return pd.DataFrame({
+        "MMSI": rng.integers(100, 400, rows).astype(str),
+        "Speed": speed,
+        "Source": rng.choice(["Spire_DAIS", "Orbcomm", "Terrestrial"], rows),
+    })
+
+
+def observed(checkpoint_result):
+    validation_result = list(checkpoint_result.run_results.values())[0]
+    return [(r["success"], r["result"].get("observed_value"), r["result"].get("unexpected_count"))
+            for r in validation_result["results"]]
+
+
+def test_streaming_matches_in_memory_results():
+    df = make_frame()
+    expectations = [
+        gxe.ExpectColumnValuesToBeBetween(column="Speed", min_value=0, max_value=20),
+        gxe.ExpectColumnValuesToNotBeNull(column="Speed"),
+        gxe.ExpectTableRowCountToBeBetween(min_value=1, max_value=5000),
+        gxe.ExpectTableColumnCountToBeBetween(min_value=3, max_value=3),
+        gxe.ExpectColumnMeanToBeBetween(column="Speed", min_value=10, max_value=14),
+        gxe.ExpectColumnStdevToBeBetween(column="Speed", min_value=3, max_value=5),
+        gxe.ExpectColumnMedianToBeBetween(column="Speed", min_value=10, max_value=14),
+        gxe.ExpectColumnQuantileValuesToBeBetween(column="Speed", quantile_ranges={
+            "quantiles": [0.1, 0.9], "value_ranges": [[0, 10], [14, 30]]}),
+        gxe.ExpectColumnUniqueValueCountToBeBetween(column="Source", min_value=1, max_value=3),
+        gxe.ExpectColumnDistinctValuesToBeInSet(column="Source", value_set=["Spire_DAIS", "Orbcomm"]),
+    ]
+
+    in_memory, _ = NativeDataValidator(df).validate(expectations)
+    streaming = StreamingDataValidator(expectations)
+    for start in range(0, len(df), 128):
+        streaming.validate_chunk(df.iloc[start:start + 128])
+
+    for (s_success, s_value, s_count), (m_success, m_value, m_count) in zip(observed(streaming.finalize()),
+                                                                            observed(in_memory)):
+        assert s_success == m_success
+        assert s_count == m_count
+        if isinstance(m_value, float):
+            assert s_value == pytest.approx(m_value)
+        else:
+            assert s_value == m_value
+
+
+def test_uniqueness_is_tracked_across_chunks():
+    df = pd.DataFrame({"MMSI": ["a", "b", "a", None, "b", "c"]})
+    streaming = StreamingDataValidator([gxe.ExpectColumnValuesToBeUnique(column="MMSI")])
+
+    for start in (0, 3):
+        streaming.count_keys(df.iloc[start:start + 3])
+    masks = [mask for start in (0, 3) for _, mask in streaming.validate_chunk(df.iloc[start:start + 3])]
+
+    # Every occurrence of a duplicated value, as the native engine flags them
+    native = NativeDataValidator(df).evaluate_expectations(streaming.expectations)[0]
+    assert np.concatenate(masks).tolist() == [True, True, True, False, True, False]
+    assert streaming.finalize().run_results["DEFAULT_VALIDATION_NAME"]["results"][0]["result"]["unexpected_count"] \
+        == native["result"]["unexpected_count"] == 4
+
+
+def test_uniqueness_holds_across_chunks_inferring_different_dtypes():
+    streaming = StreamingDataValidator([gxe.ExpectColumnValuesToBeUnique(column="MMSI")])
+    # float64 (because of the null) in the first chunk, int64 in the second
+    csv = "MMSI,Speed\n1,1.0\n,2.0\n1,3.0\n"
+    for chunk in pd.read_csv(io.StringIO(csv), chunksize=2):
+        streaming.count_keys(chunk)
+    for chunk in pd.read_csv(io.StringIO(csv), chunksize=2):
+        streaming.validate_chunk(chunk)
+
+    result = streaming.finalize().run_results["DEFAULT_VALIDATION_NAME"]["results"][0]
+
+    assert result["result"]["unexpected_count"] == 2
+
+
+def test_run_streaming_writes_valid_and_invalid_rows_incrementally(tmp_path):
+    df = make_frame(rows=300)
+    input_path = tmp_path / "input.csv"
+    df.to_csv(input_path, index=False)
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump({"expectations": [
+        {"name": "ExpectColumnValuesToNotBeNull", "column": "Speed", "action": "skip"},
+        {"name": "ExpectColumnValuesToBeInSet", "column": "Source", "value_set": ["Spire_DAIS", "Orbcomm"],
+         "action": "skip"},
+    ]}))
+
+    processor = ValidationProcessor(str(input_path), str(config_path), None, "TEST",
+                                    invalid_file_path=str(tmp_path / "invalid.csv"))
+    processor.run_streaming(chunk_size=64, valid_file_path=str(tmp_path / "valid.csv"))
+
+    valid = pd.read_csv(tmp_path / "valid.csv")
+    invalid = pd.read_csv(tmp_path / "invalid.csv")
+    bad = df["Speed"].isna() | (df["Source"] == "Terrestrial")
+    assert len(valid) == int((~bad).sum())
+    assert set(invalid["expectation_failed_column"]) == {"Speed", "Source"}
+    assert invalid.drop_duplicates(subset=list(df.columns)).shape[0] == int(bad.sum())
+
+
+def test_run_streaming_sends_every_duplicate_to_the_invalid_rows(tmp_path):
+    df = pd.DataFrame({"MMSI": ["a", "b", "c", "d", "a", "e", "b"], "Speed": range(7)})
+    input_path = tmp_path / "input.csv"
+    df.to_csv(input_path, index=False)
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump({"expectations": [
+        {"name": "ExpectColumnValuesToBeUnique", "column": "MMSI", "action": "skip"},
+    ]}))
+
+    processor = ValidationProcessor(str(input_path), str(config_path), None, "TEST",
+                                    invalid_file_path=str(tmp_path / "invalid.csv"))
+    processor.run_streaming(chunk_size=3, valid_file_path=str(tmp_path / "valid.csv"))
+
+    assert pd.read_csv(tmp_path / "valid.csv")["MMSI"].tolist() == ["c", "d", "e"]
+    assert sorted(pd.read_csv(tmp_path / "invalid.csv")["MMSI"]) == ["a", "a", "b", "b"]
@@ -0,0 +1,68 @@
+import great_expectations.expectations as gxe
+import pandas as pd
+import pytest
+
+from src.validators.native_validate import NativeDataValidator
+from src.validators.validate import DataValidator, clear_checkpoint_cache
+
+
+@pytest.fixture(autouse=True)
+def gx_project(tmp_path, monkeypatch):
+    # Every test compiles into its own file context and starts without warm checkpoints
+    monkeypatch.chdir(tmp_path)
+    clear_checkpoint_cache()
+    yield
+    clear_checkpoint_cache()
+
+
+def make_frame():
+    return pd.DataFrame({"MMSI": ["1", None, "3"], "Source": ["Orbcomm", "Orbcomm", "Spire_DAIS"]})
+
+
+def make_expectations():
+    return [
+        gxe.ExpectColumnValuesToNotBeNull(column="MMSI"),
+        gxe.ExpectColumnValuesToNotBeNull(column="MMSI", row_condition='Source=="Orbcomm"', condition_parser="pandas"),
+    ]
+
+
+def result_types(checkpoint_result):
+    results = list(checkpoint_result.run_results.values())[0]["results"]
+    return sorted((result["expectation_config"]["type"], bool(result["expectation_config"]["kwargs"].get(
+        "row_condition"))) for result in results)
+
+
+def test_same_expectations_reuse_the_warm_checkpoint(monkeypatch):
+    DataValidator(make_frame(), fingerprint="config").validate(make_expectations())
+
+    compiled = []
+    monkeypatch.setattr(DataValidator, "add_expectations", lambda self, expectations: compiled.append(expectations))
+    checkpoint_result, _ = DataValidator(make_frame(), fingerprint="config").validate(make_expectations())
+
+    assert compiled == []
+    assert len(result_types(checkpoint_result)) == 2
+
+
+def test_native_fallback_and_gx_runs_do_not_share_a_suite():
+    full = [("expect_column_values_to_not_be_null", False), ("expect_column_values_to_not_be_null", True)]
+
+    # The native engine compiles only its fallback expectation under the same names and fingerprint
+    native_result, _ = NativeDataValidator(make_frame(), fingerprint="config").validate(make_expectations())
+    gx_result, _ = DataValidator(make_frame(), fingerprint="config").validate(make_expectations())
+    assert result_types(native_result) == full
+    assert result_types(gx_result) == full
+
+    # And the other way round, the fallback does not run the whole suite again
+    native_result, _ = NativeDataValidator(make_frame(), fingerprint="config").validate(make_expectations())
+    assert result_types(native_result) == full
+
+
+def test_native_fallback_results_keep_their_position_in_the_suite():
+    expectations = make_expectations() + [gxe.ExpectColumnValuesToBeInSet(column="Source", value_set=["Orbcomm"])]
+    checkpoint_result, _ = NativeDataValidator(make_frame()).validate(expectations)
+
+    results = list(checkpoint_result.run_results.values())[0]["results"]
+    assert [(result["expectation_config"]["type"], bool(result["expectation_config"]["kwargs"].get("row_condition")))
+            for result in results] == [("expect_column_values_to_not_be_null", False),
+                                       ("expect_column_values_to_not_be_null", True),
+                                       ("expect_column_values_to_be_in_set", False)]
@@ -0,0 +1,93 @@
+import gzip
+import io
+
+import pandas as pd
+import pytest
+import yaml
+
+from tests.test_s3_writer import LocalS3
+from validation_processor import StopProcessError, ValidationProcessor
+
+
+def make_processor(df):
+    return ValidationProcessor("unused.csv", "unused.yaml", df, "TEST", engine="native")
+
+
+def failed(expectation_type, column, unexpected_index_list):
+    return {
+        "success": False,
+        "expectation_config": {"type": expectation_type, "kwargs": {"column": column}},
+        "result": {"unexpected_index_list": unexpected_index_list},
+    }
+
+
+def test_partition_rows_annotates_each_failure_and_dedups_invalid_rows():
+    df = pd.DataFrame({"MMSI": ["a", None, "c", "d"], "Speed": [1.0, 2.0, -5.0, None]})
+    processor = make_processor(df)
+    validation_result = {"results": [
+        failed("expect_column_values_to_not_be_null", "MMSI", [1]),
+        failed("expect_column_values_to_not_be_null", "Speed", [3]),
+        failed("expect_column_values_to_be_between", "Speed", [1, 2]),
+    ]}
+    actions = {
+        ("ExpectColumnValuesToNotBeNull", "MMSI"): "skip",
+        ("ExpectColumnValuesToBeBetween", "Speed"): "skip",
+    }
+
+    masks = processor.collect_failure_masks(validation_result, actions)
+    invalid_df, df_valid, df_invalid = processor.partition_rows(df, masks)
+
+    assert list(invalid_df["expectation_failed_column"]) == ["MMSI", "Speed", "Speed"]
+    assert list(invalid_df["MMSI"].fillna("-")) == ["-", "-", "c"]
+    assert list(df_invalid["Speed"]) == [2.0, -5.0]
+    assert df_valid["MMSI"].tolist() == ["a", "d"]
+
+
+def test_unknown_index_labels_mark_no_row():
+    df = pd.DataFrame({"MMSI": ["a", None, "c"]}, index=[10, 11, 12])
+    processor = make_processor(df)
+    validation_result = {"results": [failed("expect_column_values_to_not_be_null", "MMSI", [11, 99])]}
+
+    masks = processor.collect_failure_masks(validation_result, {("ExpectColumnValuesToNotBeNull", "MMSI"): "skip"})
+
+    assert masks[0][2].tolist() == [False, True, False]
+
+
+def test_failure_action_stops_the_process():
+    processor = make_processor(pd.DataFrame({"MMSI": [None]}))
+    validation_result = {"results": [failed("expect_column_values_to_not_be_null", "MMSI", [0])]}
+
+    with pytest.raises(StopProcessError):
+        processor.collect_failure_masks(validation_result,
+                                        {("ExpectColumnValuesToNotBeNull", "MMSI"): "failure"})
+
+
+def test_no_failures_keeps_every_row_valid():
+    df = pd.DataFrame({"MMSI": ["a", "b"]})
+    invalid_df, df_valid, df_invalid = make_processor(df).partition_rows(df, [])
+
+    assert invalid_df.empty and df_invalid.empty
+    assert df_valid.equals(df)
+
+
+def test_processors_share_one_s3_client():
+    assert make_processor(None).s3_client is make_processor(None).s3_client
+
+
+def test_streaming_run_uploads_invalid_rows_to_s3_per_chunk(tmp_path):
+    path = tmp_path / "positions.csv"
+    pd.DataFrame({"MMSI": ["1", None, "3", None, "5"], "Speed": [1.0, 2.0, 3.0, 4.0, 5.0]}).to_csv(path, index=False)
+    config = tmp_path / "config.yaml"
+    config.write_text(yaml.safe_dump({
+        "file_validation": [],
+        "expectations": [{"name": "ExpectColumnValuesToNotBeNull", "column": "MMSI", "action": "skip"}],
+    }))
+    processor = ValidationProcessor(str(path), str(config), None, "TEST", engine="native")
+    processor.s3_client = LocalS3()
+
+    processor.run_streaming(chunk_size=2, invalid_rows_s3_format="csv.gz")
+
+    (key, body), = processor.s3_client.objects.items()
+    assert key[1].endswith(".csv.gz")
+    uploaded = pd.read_csv(io.BytesIO(gzip.decompress(body)))
+    assert uploaded["Speed"].tolist() == [2.0, 4.0]
@@ -0,0 +1,82 @@
+import pandas as pd
+import yaml
+
+from src.utils.watermarks import WatermarkStore, complete_lines_end
+from validation_processor import ValidationProcessor
+
+EXPECTATIONS = [
+    {"name": "ExpectColumnValuesToNotBeNull", "column": "MMSI", "action": "skip"},
+    {"name": "ExpectColumnValuesToBeUnique", "column": "MMSI", "action": "skip"},
+    {"name": "ExpectColumnMeanToBeBetween", "column": "Speed", "min_value": 0, "max_value": 10},
+    {"name": "ExpectTableRowCountToBeBetween", "min": 1},
+]
+
+
+def write_config(tmp_path):
+    config = tmp_path / "config.yaml"
+    config.write_text(yaml.safe_dump({"file_validation": [], "expectations": EXPECTATIONS}))
+    return str(config)
+
+
+def incremental_run(tmp_path, path, store):
+    processor = ValidationProcessor(str(path), write_config(tmp_path), None, "AIS",
+                                    invalid_file_path=str(tmp_path / "invalid.csv"), engine="native")
+    results = processor.run_incremental(store, chunk_size=2)
+    chunk_rows = sum(event["rows"] for event in processor.instrumentation.events if event["stage"] == "chunk")
+    return {result["expectation_config"]["type"]: result["result"]
+            for result in list(results.run_results.values())[0]["results"]}, chunk_rows
+
+
+def test_only_appended_rows_are_validated_and_aggregates_continue(tmp_path):
+    path = tmp_path / "firehose.csv"
+    store = WatermarkStore(str(tmp_path / "watermarks"))
+    path.write_text("MMSI,Speed\n1,2.0\n,4.0\n3,6.0\n")
+
+    first, chunk_rows = incremental_run(tmp_path, path, store)
+    assert chunk_rows == 3
+    assert first["expect_table_row_count_to_be_between"]["observed_value"] == 3
+
+    # The last line is still being written and waits for the next run
+    with open(path, 'a') as file:
+        file.write("3,8.0\n,10.0\n7,1")
+    second, chunk_rows = incremental_run(tmp_path, path, store)
+
+    assert chunk_rows == 2
+    assert second["expect_table_row_count_to_be_between"]["observed_value"] == 5
+    assert second["expect_column_mean_to_be_between"]["observed_value"] == 6.0
+    # Duplicates are found against the values of the earlier run, indices continue across runs
+    assert second["expect_column_values_to_be_unique"]["partial_unexpected_index_list"] == [3]
+    assert second["expect_column_values_to_not_be_null"]["unexpected_count"] == 2
+    assert store.load("AIS", str(path))["byte_offset"] == complete_lines_end(str(path))
+
+    invalid = pd.read_csv(tmp_path / "invalid.csv")
+    assert sorted(invalid["Speed"]) == [4.0, 8.0, 10.0]
+
+
+def test_rewritten_file_is_validated_from_the_first_row(tmp_path):
+    path = tmp_path / "firehose.csv"
+    store = WatermarkStore(str(tmp_path / "watermarks"))
+    path.write_text("MMSI,Speed\n1,2.0\n2,4.0\n")
+    incremental_run(tmp_path, path, store)
+
+    path.write_text("MMSI,Speed\n5,1.0\n6,1.0\n7,1.0\n")
+    results, chunk_rows = incremental_run(tmp_path, path, store)
+
+    assert chunk_rows == 3
+    assert results["expect_table_row_count_to_be_between"]["observed_value"] == 3
+    assert results["expect_column_mean_to_be_between"]["observed_value"] == 1.0
+
+
+def test_appended_rows_are_read_with_the_dtypes_of_the_first_run(tmp_path):
+    path = tmp_path / "firehose.csv"
+    store = WatermarkStore(str(tmp_path / "watermarks"))
+    path.write_text("MMSI,Speed\nunknown,2\n1,4\n")
+    incremental_run(tmp_path, path, store)
+
+    # Inferred alone, the appended MMSI would be int64 and Speed would hold a null in an int column
+    with open(path, 'a') as file:
+        file.write("1,\n3,6\n")
+    results, _ = incremental_run(tmp_path, path, store)
+
+    assert results["expect_column_values_to_be_unique"]["partial_unexpected_index_list"] == [2]
+    assert results["expect_column_mean_to_be_between"]["observed_value"] == 4.0
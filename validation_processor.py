@@ -1,17 +1,47 @@
+import logging
 import re
 from datetime import datetime
-from io import StringIO
 
-import boto3
+import numpy as np
 import pandas as pd
 
 from src.checks.file_validation_checks import FileValidator
-from src.config.settings import CONFIG_YAML_PATH, S3_REGION, DATA_QUALITY_PATH, BUCKET_NAME
+from src.checks.schema_checks import SchemaValidator
+from src.config.settings import (CONFIG_YAML_PATH, S3_REGION, DATA_QUALITY_PATH, BUCKET_NAME, DEFAULT_CHUNK_SIZE,
+                                 S3_INVALID_ROWS_FORMAT)
 from src.utils.ExpectationMapper import ExpectationMapper
-from src.utils.file_utils import load_yaml_config
+from src.utils.compression import is_compressed
+from src.utils.data_loader import (load_data_in_chunks, load_compressed_data, load_data_with_schema,
+                                   referenced_columns, schema_read_options)
+from src.utils.docs_builder import flush_data_docs
+from src.utils.output_writer import BackgroundWriter, CSVFileSink, OutputWriteError
+from src.utils.parquet_stats import is_parquet
+from src.utils.file_utils import load_yaml_config, fingerprint_config, fingerprint_file
+from src.utils.instrumentation import Instrumentation
+from src.utils.metric_cache import MetricCache
 from src.utils.parse_validation_result import Parse_GXValidator
+from src.utils.result_cache import ResultCache
+from src.utils.s3_writer import RECORD_FORMATS, S3RecordWriter, get_s3_client
+from src.utils.watermarks import WatermarkStore, complete_lines_end, continuation_dtypes
+from src.validators.native_validate import NativeDataValidator, build_checkpoint_result
+from src.validators.parquet_stats_validate import ParquetStatisticsValidator, is_answerable_from_statistics
+from src.validators.sql_validate import SQLDataValidator
+from src.validators.spark_validate import SPARK_MAP_EXPECTATIONS, SparkDataValidator
+from src.validators.streaming_validate import StreamingDataValidator
 from src.validators.validate import DataValidator
 
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Expectation engines selectable through `ValidationProcessor(engine=...)`.
+# "native" evaluates supported expectations as pandas/NumPy masks and falls back to GX for the rest.
+# "sql" compiles them into one aggregate query on embedded DuckDB / SQLite, falling back to "native".
+VALIDATION_ENGINES = {
+    "gx": DataValidator,
+    "native": NativeDataValidator,
+    "sql": SQLDataValidator,
+}
+
 
 class StopProcessError(Exception):
     """
@@ -23,14 +53,24 @@ class StopProcessError(Exception):
 class ValidationProcessor:
     def __init__(self, file_path: str, yaml_config_path: str,
                  dataframe: pd.DataFrame, process_id: str,
-                 invalid_file_path: str = None, site_name: str = None):
-        """Initializes the ValidationProcessor with necessary configurations and file paths."""
+                 invalid_file_path: str = None, site_name: str = None,
+                 engine: str = "gx", instrumentation: Instrumentation = None,
+                 result_cache: ResultCache = None):
+        """
+        Initializes the ValidationProcessor with necessary configurations and file paths.
+        Every stage (and, with the native engine, every expectation) is measured by `instrumentation`;
+        by default the events are only kept in memory (`self.instrumentation.events`).
+        With a `result_cache`, `run` reuses the outcome of an earlier run on the same input and configuration.
+        """
+        if engine not in VALIDATION_ENGINES:
+            raise ValueError(f"Unknown validation engine '{engine}'. Available: {list(VALIDATION_ENGINES)}")
 
         self.process_id = process_id
         self.file_path = file_path
         self.yaml_config_path = yaml_config_path
         self.invalid_file_path = invalid_file_path
         self.df = dataframe
+        self.engine = engine
 
         ## GX setting
         self.site_name = self.generate_dynamic_value(site_name, "DATA_DOCS_SITE")
@@ -43,10 +83,22 @@ class ValidationProcessor:
         self.validation_config = None
         self.mapped_expectations = None
         self.validation_results = None
+        self.parsed_results = None
+        self.failure_masks = None
         self.expectation_mapping_config_path = CONFIG_YAML_PATH
-
-        # S3 Config
-        self.s3_client = boto3.client('s3', region_name=S3_REGION)
+        self.compression_report = None
+        # How `self.df` was parsed (read options, schema, projection), part of the result cache key
+        self.load_options = None
+        self.parquet_statistics = None
+        self.output_writer = None
+        # Added to the S3 key of the invalid rows, e.g. the file name when several files are validated at once
+        self.s3_key_tag = None
+        self.instrumentation = instrumentation or Instrumentation(process_id)
+        self.result_cache = result_cache
+        self.metric_cache = None
+
+        # S3 Config: one client per process, shared by all processors
+        self.s3_client = get_s3_client(S3_REGION)
         self.bucket_name = BUCKET_NAME
         self.data_quality_path = DATA_QUALITY_PATH
         self.process_id = process_id
@@ -64,21 +116,82 @@ class ValidationProcessor:
         """
         self.validation_config = load_yaml_config(self.yaml_config_path)
 
+    def load_dataframe(self, read_options: dict = None, schema: dict = None, consumer_columns: list = None):
+        """
+        Load `file_path` into `self.df`. Compressed inputs are decompressed once: the same stream is
+        integrity-checked and parsed, and the integrity report is reused by `validate_file`.
+        With a declarative `schema` (see `load_process_schema`) the file is parsed by the pyarrow
+        reader into typed Arrow columns, keeping only the columns referenced by the expectations
+        and by `consumer_columns`; `read_options` then do not apply.
+        """
+        read_options = read_options or {}
+        self.load_options = {"read_options": read_options, "schema": schema, "consumer_columns": consumer_columns}
+        with self.instrumentation.stage("load") as measurement:
+            if schema is not None:
+                columns = referenced_columns(self.validation_config.get('expectations', []), consumer_columns,
+                                             [column['name'] for column in schema['columns']])
+                self.df, self.compression_report = load_data_with_schema(self.file_path, schema, columns)
+            elif is_compressed(self.file_path):
+                self.df, self.compression_report = load_compressed_data(self.file_path, **read_options)
+            elif is_parquet(self.file_path):
+                self.df = pd.read_parquet(self.file_path)
+            else:
+                self.df = pd.read_csv(self.file_path, **read_options)
+            measurement["rows"] = len(self.df) if self.df is not None else None
+        if self.df is None:
+            details = self.compression_report["error"] or self.compression_report["parse_error"]
+            print(f"Error loading compressed data: {details}")
+        return self.df
+
+    def validate_schema(self, read_options: dict = None, columns: list = None):
+        """
+        Pre-load stage: answer the schema expectations from the CSV header / Parquet schema, before
+        any data is loaded, or from `columns` when the data was loaded by the caller.
+        Raises StopProcessError for a failed expectation with action 'failure'.
+        Returns (schema results, True if a failed expectation with action 'skip' means the file should be skipped).
+        """
+        schema_validator = SchemaValidator(self.file_path, self.validation_config.get('expectations', []),
+                                           self.expectation_mapping_config_path, read_options, columns)
+        with self.instrumentation.stage("schema"):
+            results = schema_validator.validate()
+        failed = [result for result in results if not result["success"]]
+        for result in failed:
+            if result["action"] == "failure":
+                raise StopProcessError(
+                    f"Action 'failure' encountered for schema check {schema_validator.describe(result)}. "
+                    f"Stopping the process.")
+        return results, any(result["action"] == "skip" for result in failed)
+
     def validate_file(self):
         """
         Run file validations.
         """
-        file_validator = FileValidator(self.file_path, self.validation_config)
-        file_validation_results = file_validator.validate()
+        file_validator = FileValidator(self.file_path, self.validation_config, self.compression_report)
+        with self.instrumentation.stage("file_checks"):
+            file_validation_results = file_validator.validate()
         return file_validation_results
 
     def validate_expectations(self):
         """Validate expectations using mapped expectations."""
-        mapped_expectation = ExpectationMapper(self.expectation_mapping_config_path)
-        val_dict = self.validation_config.get('expectations', [])
-        self.mapped_expectations = mapped_expectation.map_user_expectations(val_dict)
-
-        expectation_validator = DataValidator(
+        with self.instrumentation.stage("mapping"):
+            mapped_expectation = ExpectationMapper(self.expectation_mapping_config_path)
+            val_dict = self.validation_config.get('expectations', [])
+            self.mapped_expectations = mapped_expectation.map_user_expectations(val_dict)
+
+        validator_class = VALIDATION_ENGINES[self.engine]
+        validator_options = {}
+        if self.engine in ("native", "sql"):
+            validator_options["instrumentation"] = self.instrumentation
+        if self.engine == "native":
+            # Null masks, value counts, ... shared by the expectations of this run only
+            self.metric_cache = MetricCache()
+            validator_options["metric_cache"] = self.metric_cache
+        if self.engine == "native" and is_parquet(self.file_path):
+            # Footer statistics answer min/max/null/row-count expectations before any row group is scanned
+            validator_class = ParquetStatisticsValidator
+            validator_options["file_path"] = self.file_path
+        expectation_validator = validator_class(
+            **validator_options,
             dataframe=self.df,
             data_source_name=self.data_source_name,
             data_asset_name=self.data_asset_name,
@@ -86,12 +199,48 @@ class ValidationProcessor:
             site_name=self.site_name,
             expectation_suite_name=self.expectation_suite_name,
             checkpoint_name=self.checkpoint_name,
-            validation_definition_name=self.validation_definition_name
+            validation_definition_name=self.validation_definition_name,
+            fingerprint=self.expectations_fingerprint()
         )
 
-        expectation_validation_results, context = expectation_validator.validate(self.mapped_expectations)
+        with self.instrumentation.stage("checkpoint", rows=len(self.df) if self.df is not None else None,
+                                        engine=self.engine):
+            expectation_validation_results, context = expectation_validator.validate(self.mapped_expectations)
+        if self.metric_cache is not None:
+            logger.debug(f"Metric cache of {self.file_path}: {self.metric_cache.stats()}")
+            # The statistics are kept for reporting, the cached data is released with the run
+            self.metric_cache.clear()
         return expectation_validation_results, context
 
+    def validate_from_statistics(self):
+        """
+        Answers the expectations of a Parquet file from its row-group statistics, before loading it.
+        Returns the CheckpointResult when every expectation is a statistics expectation and all of
+        them pass (the file is valid without loading it), None otherwise.
+        """
+        mapped_expectation = ExpectationMapper(self.expectation_mapping_config_path)
+        expectations = mapped_expectation.map_user_expectations(self.validation_config.get('expectations', []))
+        if not expectations or not all(is_answerable_from_statistics(expectation) for expectation in expectations):
+            return None
+
+        statistics_validator = ParquetStatisticsValidator(
+            self.file_path,
+            expectation_suite_name=self.expectation_suite_name,
+            validation_definition_name=self.validation_definition_name
+        )
+        expectation_validation_results, _ = statistics_validator.validate(expectations)
+        self.parquet_statistics = statistics_validator.statistics
+        return expectation_validation_results if expectation_validation_results.success else None
+
+    def expectations_fingerprint(self) -> str:
+        """Content fingerprint of the user expectations and the expectation mapping config."""
+        return fingerprint_config(self.validation_config.get('expectations', []),
+                                  fingerprint_file(self.expectation_mapping_config_path))
+
+    def flush_data_docs(self, timeout: float = None) -> bool:
+        """Waits for the background Data Docs build requested by the validation to finish."""
+        return flush_data_docs(timeout)
+
     def process_results(self, expectation_validation_results):
         """Process the validation results to separate valid and invalid rows."""
         gx_parse_val = Parse_GXValidator(data_source_name=self.data_source_name)
@@ -107,33 +256,74 @@ class ValidationProcessor:
             except Exception as e:
                 print(f"Error saving invalid rows: {e}")
 
-    def save_invalid_rows_S3(self, df_invalid):
-        """Save the invalid rows to S3 in a structured path with date-based folders."""
+    def invalid_rows_s3_key(self, file_format: str = S3_INVALID_ROWS_FORMAT) -> str:
+        """S3 key of the invalid rows, in date-based folders."""
+        current_date = datetime.now()
+        year_folder = current_date.strftime('%Y')
+        month_folder = current_date.strftime('%m')
+        day_folder = current_date.strftime('%d')
+        extension = RECORD_FORMATS[file_format][0]
+        tag = f"_{self.s3_key_tag}" if self.s3_key_tag else ""
+        return f"{self.data_quality_path}/{year_folder}/{month_folder}/{day_folder}/{self.process_id}{tag}_data_{current_date.strftime('%Y%m%d%H%M%S')}{extension}"
+
+    def open_invalid_rows_S3(self, file_format: str = S3_INVALID_ROWS_FORMAT) -> S3RecordWriter:
+        """Opens a multipart upload the invalid rows can be streamed to, frame by frame."""
+        return S3RecordWriter(self.bucket_name, self.invalid_rows_s3_key(file_format), file_format, self.s3_client)
+
+    def save_invalid_rows_S3(self, df_invalid, file_format: str = S3_INVALID_ROWS_FORMAT,
+                             chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Save the invalid rows to S3 in a structured path with date-based folders. Rows are encoded
+        `chunk_size` at a time and uploaded in multipart parts, never as one in-memory body.
+        """
         if not df_invalid.empty:
             try:
+                with self.open_invalid_rows_S3(file_format) as writer:
+                    for start in range(0, len(df_invalid), chunk_size):
+                        writer.write(df_invalid.iloc[start:start + chunk_size])
 
-                current_date = datetime.now()
-                year_folder = current_date.strftime('%Y')
-                month_folder = current_date.strftime('%m')
-                day_folder = current_date.strftime('%d')
-
-                file_key = f"{self.data_quality_path}/{year_folder}/{month_folder}/{day_folder}/{self.process_id}_data_{current_date.strftime('%Y%m%d%H%M%S')}.csv"
-
-                csv_buffer = StringIO()
-                df_invalid.to_csv(csv_buffer, index=False)
-
-                self.s3_client.put_object(
-                    Bucket=self.bucket_name,
-                    Key=file_key,
-                    Body=csv_buffer.getvalue(),
-                    ContentType="text/csv"  # Optional: Content type for the file
-                )
-
-                print(f"Invalid records have been saved to S3: {self.bucket_name}/{file_key}")
+                print(f"Invalid records have been saved to S3: {self.bucket_name}/{writer.upload.key}")
 
             except Exception as e:
                 print(f"Error saving invalid rows to S3: {e}")
 
+    def open_output_writer(self, s3_file_format: str = None, append: bool = False) -> BackgroundWriter:
+        """
+        Starts the background writer of the invalid rows: the local `invalid_file_path` (appended to
+        with `append`) and, with `s3_file_format`, an S3 upload in that encoding, written concurrently.
+        A previous writer that was not flushed yet is flushed first, so its rows are written (and its
+        errors raised) before it is replaced.
+        """
+        if self.output_writer is not None:
+            self.flush_outputs()
+        sinks = {}
+        if self.invalid_file_path:
+            sinks["local"] = CSVFileSink(self.invalid_file_path, append=append)
+        if s3_file_format:
+            sinks["s3"] = self.open_invalid_rows_S3(s3_file_format)
+        self.output_writer = BackgroundWriter(sinks)
+        return self.output_writer
+
+    def flush_outputs(self, timeout: float = None) -> bool:
+        """
+        Waits for the invalid rows handed to the background writer to be written.
+        Raises OutputWriteError if a sink failed; returns False if `timeout` expired first.
+        """
+        if self.output_writer is None:
+            return True
+        try:
+            if not self.output_writer.flush(timeout):
+                return False
+        except OutputWriteError:
+            # Reported once: the failed writer is done and must not block the next one
+            self.output_writer = None
+            raise
+        for name, sink in self.output_writer.sinks.items():
+            target = sink.file_path if name == "local" else f"{self.bucket_name}/{sink.upload.key}"
+            print(f"Invalid records have been saved to: {target}")
+        self.output_writer = None
+        return True
+
     def display_results(self, file_validation_results, df_valid, df_invalid):
         """Display the validation results."""
         print("File Validation Results:")
@@ -169,72 +359,467 @@ class ValidationProcessor:
         name = ''.join(word.capitalize() for word in name_parts)
         return name
 
-    def run(self):
-        """Main method to run all the validation steps."""
-        # Load validation configuration
-        self.load_data()
+    def index_positions(self, unexpected_index_list) -> np.ndarray:
+        """
+        Translate GX unexpected index labels into row positions of `self.df`. Labels that are not
+        in the index are dropped, so they never mark another row (e.g. -1, the last one).
+        """
+        labels = np.asarray(unexpected_index_list)
+        if isinstance(self.df.index, pd.RangeIndex) and self.df.index.start == 0 and self.df.index.step == 1:
+            positions = labels.astype(np.int64, copy=False)
+        else:
+            positions = self.df.index.get_indexer(labels)
+        in_frame = (positions >= 0) & (positions < len(self.df))
+        if not in_frame.all():
+            print(f"Ignoring {int((~in_frame).sum())} unexpected index label(s) not found in the DataFrame.")
+        return positions[in_frame]
 
-        # Validate file
-        file_validation_results = self.validate_file()
-        print(file_validation_results)
+    def collect_failure_masks(self, validation_result, expectations_action_dict) -> list:
+        """
+        Builds one boolean row mask per failing expectation whose action is 'skip'.
+        Raises StopProcessError for failing expectations whose action is 'failure'.
+        Returns a list of (expectation_name, column, mask) tuples.
+        """
+        failure_masks = []
+        for expectation_result in validation_result["results"]:
+            if expectation_result["success"]:
+                continue
 
-        # Validate expectations
-        expectation_validation_results, _ = self.validate_expectations()
-        action_dict = self.validation_config.get('expectations', [])
-        result = self.process_results(expectation_validation_results)
+            expectation_name = expectation_result["expectation_config"]["type"]
+            expectation_column = expectation_result["expectation_config"]["kwargs"].get("column")
+            normalized_expectation_name = self.normalize_to_pascal_case(expectation_name)
 
-        expectations_action_dict = {(expectation['name'], expectation['column']): expectation['action'] for expectation
-                                    in action_dict}
+            action = expectations_action_dict.get((normalized_expectation_name, expectation_column), None)
 
-        invalid_rows = []
-        invalid_row_indices = []
+            if action == "skip":
+                unexpected_index_list = expectation_result["result"].get("unexpected_index_list") or []
+                mask = np.zeros(len(self.df), dtype=bool)
+                if len(unexpected_index_list):
+                    mask[self.index_positions(unexpected_index_list)] = True
+                failure_masks.append((normalized_expectation_name, expectation_column, mask))
 
-        # Collecting invalid rows and adding the expectation failed info
-        for result in result["results"]:
-            if not result["success"]:
-                expectation_name = result["expectation_config"]["type"]
-                expectation_column = result['expectation_config']['kwargs']['column']
-                normalized_expectation_name = self.normalize_to_pascal_case(expectation_name)
+            elif action == "failure":
+                # Raise an exception to stop the process
+                raise StopProcessError(
+                    f"Action 'failure' encountered for expectation {normalized_expectation_name} on column {expectation_column}. Stopping the process.")
 
-                action = expectations_action_dict.get((normalized_expectation_name, expectation_column), None)
+        return failure_masks
 
-                if action == "skip":
-                    # Get the indices of the invalid rows
-                    unexpected_index_list = result["result"]["unexpected_index_list"]
+    def partition_rows(self, df, failure_masks):
+        """
+        Splits `df` using the per-expectation masks, each output in one vectorized selection.
+        Returns (invalid_df, df_valid, df_invalid) where invalid_df holds one row per
+        (row, failed expectation) annotated with the failure, and df_invalid the distinct invalid rows.
+        """
+        invalid_mask = np.zeros(len(df), dtype=bool)
+        for _, _, mask in failure_masks:
+            invalid_mask |= mask
+
+        if failure_masks:
+            positions = [np.flatnonzero(mask) for _, _, mask in failure_masks]
+            counts = [len(p) for p in positions]
+            invalid_df = df.iloc[np.concatenate(positions)].assign(
+                expectation_failed_name=np.repeat([name for name, _, _ in failure_masks], counts),
+                expectation_failed_column=np.repeat([column for _, column, _ in failure_masks], counts),
+            )
+        else:
+            invalid_df = pd.DataFrame()
 
-                    if unexpected_index_list:
-                        invalid_row_indices.extend(unexpected_index_list)
+        if invalid_mask.any():
+            df_invalid = df[invalid_mask].reset_index(drop=True)
+        else:
+            df_invalid = pd.DataFrame()
 
-                    # Add the failed expectation info to the invalid rows
-                    for idx in unexpected_index_list:
-                        invalid_row = self.df.iloc[idx].copy()  # Copy the invalid row
-                        invalid_row['expectation_failed_name'] = normalized_expectation_name
-                        invalid_row['expectation_failed_column'] = expectation_column
-                        invalid_rows.append(invalid_row)
+        df_valid = df[~invalid_mask].reset_index(drop=True)
+        return invalid_df, df_valid, df_invalid
 
-                elif action == "failure":
-                    # Raise an exception to stop the process
-                    raise StopProcessError(
-                        f"Action 'failure' encountered for expectation {normalized_expectation_name} on column {expectation_column}. Stopping the process.")
+    def validate_rows(self):
+        """
+        Validate the expectations on the DataFrame and apply their actions.
+        Returns (invalid_df annotated per failed expectation, df_valid, df_invalid);
+        raises StopProcessError for a failed expectation whose action is 'failure'.
+        """
+        expectation_validation_results, _ = self.validate_expectations()
+        action_dict = self.validation_config.get('expectations', [])
+        with self.instrumentation.stage("parsing"):
+            result = self.process_results(expectation_validation_results)
+        self.parsed_results = result
 
-        invalid_row_indices = list(set(invalid_row_indices))
+        expectations_action_dict = {(expectation['name'], expectation.get('column')): expectation.get('action')
+                                    for expectation in action_dict}
 
-        # If invalid rows exist, save them to a file
-        if invalid_rows:
-            invalid_df = pd.DataFrame(invalid_rows)
-            self.save_invalid_rows(invalid_df)
-            self.save_invalid_rows_S3(invalid_df)
+        # One mask per failing 'skip' expectation, then a single selection per output frame
+        with self.instrumentation.stage("partition", rows=len(self.df)):
+            self.failure_masks = self.collect_failure_masks(result, expectations_action_dict)
+            return self.partition_rows(self.df, self.failure_masks)
 
-        # Separate invalid rows
-        if invalid_row_indices:
-            df_invalid = self.df.iloc[invalid_row_indices].reset_index(drop=True)
+    def result_cache_key(self, source_etag: str = None) -> str:
+        """
+        Key of this run in the result cache: the input (content hash, or size + mtime + `source_etag`
+        in fast mode), how it was parsed (read options or schema, and the resulting dtypes), the loaded
+        frame's shape, the file-validation config, the expectations as compiled from the mapping
+        config, and the engine.
+        """
+        return self.result_cache.key(
+            self.result_cache.input_fingerprint(self.file_path, source_etag),
+            self.load_options,
+            {str(column): str(dtype) for column, dtype in self.df.dtypes.items()}, len(self.df),
+            self.validation_config.get('file_validation', []),
+            self.expectations_fingerprint(),
+            self.engine,
+        )
+
+    def cache_entry(self, file_validation_results) -> dict:
+        """What a rerun needs to skip every check: the results and the failing row positions."""
+        return {
+            "file_validation_results": file_validation_results,
+            "parsed_results": self.parsed_results,
+            "failures": [(name, column, np.flatnonzero(mask)) for name, column, mask in self.failure_masks],
+        }
+
+    def cached_failure_masks(self, entry: dict) -> list:
+        """Rebuilds the (expectation_name, column, mask) tuples of a cache entry for `self.df`."""
+        failure_masks = []
+        for name, column, positions in entry["failures"]:
+            mask = np.zeros(len(self.df), dtype=bool)
+            mask[positions] = True
+            failure_masks.append((name, column, mask))
+        return failure_masks
+
+    def skip_on_schema(self, read_options: dict = None, schema: dict = None) -> bool:
+        """
+        Runs the schema stage of `run`: from the file's header / footer before the data is loaded,
+        from the columns of `self.df` when the caller loaded it. When a failed expectation with
+        action 'skip' skips the file, its schema results become `self.validation_results`.
+        Returns True when the file is skipped.
+        """
+        columns = list(self.df.columns) if self.df is not None else None
+        schema_results, skip_file = self.validate_schema(schema_read_options(schema) if schema else read_options,
+                                                         columns)
+        if skip_file:
+            print(f"Schema check failed with action 'skip', file skipped: {self.file_path}")
+            self.validation_results = build_checkpoint_result(schema_results, self.expectation_suite_name,
+                                                              self.validation_definition_name, engine="schema")
+        return skip_file
+
+    def run(self, source_etag: str = None, read_options: dict = None, schema: dict = None):
+        """
+        Main method to run all the validation steps. The invalid rows are written to the local
+        file and S3 in the background, so the valid rows are returned without waiting for them;
+        call `flush_outputs()` before relying on the outputs (they are also flushed at exit).
+        Without a `dataframe`, the schema expectations are answered from the file's header / footer
+        first and the file is then loaded with `read_options` or `schema` (see `load_dataframe`). With the
+        native engine, a Parquet file whose expectations all pass on its row-group statistics skips the row checks.
+        A failed schema expectation with action 'skip' skips the file: no valid rows are returned
+        and `self.validation_results` holds the schema results.
+        With a result cache, a rerun on the same input and configuration partitions the rows from
+        the cached outcome without running any check; `source_etag` identifies the input in fast mode.
+        """
+        # Load validation configuration
+        self.load_data()
+
+        schema_checked = False
+        statistics_results = None
+        if self.df is None:
+            if self.skip_on_schema(read_options, schema):
+                return pd.DataFrame()
+            schema_checked = True
+            if self.engine == "native" and is_parquet(self.file_path):
+                # Expectations that all pass on the footer statistics make the row checks unnecessary;
+                # the file is then decoded only for the rows returned
+                with self.instrumentation.stage("row_group_statistics"):
+                    statistics_results = self.validate_from_statistics()
+            self.load_dataframe(read_options, schema)
+            if self.df is None:
+                report = self.compression_report
+                raise ValueError(f"Could not load {self.file_path}: {report['error'] or report['parse_error']}")
+
+        cache_key = None
+        cached = None
+        if self.result_cache is not None and self.file_path and self.df is not None:
+            with self.instrumentation.stage("result_cache"):
+                cache_key = self.result_cache_key(source_etag)
+                cached = self.result_cache.get(cache_key)
+
+        if cached is not None:
+            print(f"Validation results of {self.file_path} taken from the result cache.")
+            file_validation_results = cached["file_validation_results"]
+            self.parsed_results = cached["parsed_results"]
+            with self.instrumentation.stage("partition", rows=len(self.df)):
+                self.failure_masks = self.cached_failure_masks(cached)
+                invalid_df, df_valid, df_invalid = self.partition_rows(self.df, self.failure_masks)
         else:
-            df_invalid = pd.DataFrame()
+            # Validate file
+            file_validation_results = self.validate_file()
+            print(file_validation_results)
+
+            if not schema_checked and self.skip_on_schema(read_options, schema):
+                return pd.DataFrame()
+
+            if statistics_results is not None:
+                print(f"Expectations of {self.file_path} answered from its row-group statistics.")
+                self.validation_results = statistics_results
+                self.parsed_results = self.process_results(statistics_results)
+                self.failure_masks = []
+                invalid_df, df_valid, df_invalid = self.partition_rows(self.df, self.failure_masks)
+            else:
+                # Validate expectations
+                invalid_df, df_valid, df_invalid = self.validate_rows()
+            if cache_key is not None:
+                self.result_cache.put(cache_key, self.cache_entry(file_validation_results))
+
+        # If invalid rows exist, save them to a file and S3 off the critical path
+        if not invalid_df.empty:
+            with self.instrumentation.stage("write", rows=len(invalid_df)):
+                self.open_output_writer(S3_INVALID_ROWS_FORMAT).submit(invalid_df)
 
-        # Separate valid rows
-        df_valid = self.df.drop(self.df.index[invalid_row_indices]).reset_index(drop=True)
         print("Process completed.")
 
         self.display_results(file_validation_results, df_valid, df_invalid)
+        self.instrumentation.flush()
 
         return df_valid
+
+    def append_rows(self, df, file_path, header: bool):
+        """Append a chunk of rows to a CSV file, writing the header only for the first chunk."""
+        df.to_csv(file_path, mode='w' if header else 'a', header=header, index=False)
+
+    def run_streaming(self, chunk_size: int = DEFAULT_CHUNK_SIZE, read_options: dict = None,
+                      valid_file_path: str = None, approximate: bool = False,
+                      invalid_rows_s3_format: str = None):
+        """
+        Validate the file chunk by chunk so peak memory is bounded by `chunk_size`, not file size.
+        Row-level expectations run per chunk; valid and invalid rows are appended to
+        `valid_file_path` / `invalid_file_path` as each chunk is processed. Table-level
+        expectations (row count, column count, aggregates) are answered from running state;
+        `approximate=True` answers quantile and distinct-count checks from bounded sketches.
+        With `invalid_rows_s3_format` (csv, csv.gz or parquet) the invalid rows are also streamed
+        to S3 in that encoding, one multipart upload for the whole file.
+        Returns the CheckpointResult-shaped summary of the whole file.
+        """
+        skipped = self.start_streaming(read_options)
+        if skipped is not None:
+            return skipped
+        expectations_action_dict = self.expectations_actions()
+
+        streaming_validator = StreamingDataValidator(
+            self.mapped_expectations,
+            expectation_suite_name=self.expectation_suite_name,
+            validation_definition_name=self.validation_definition_name,
+            approximate=approximate
+        )
+
+        valid_count, invalid_count = self.validate_chunks(
+            streaming_validator, lambda: load_data_in_chunks(self.file_path, chunk_size, **(read_options or {})),
+            expectations_action_dict, valid_file_path, invalid_rows_s3_format)
+
+        self.validation_results = streaming_validator.finalize()
+        self.apply_failure_actions(self.validation_results, expectations_action_dict)
+
+        print("Process completed.")
+        print(f"Valid Rows Count: {valid_count}")
+        print(f"Invalid Rows Count: {invalid_count}")
+        self.instrumentation.flush()
+
+        return self.validation_results
+
+    def run_incremental(self, watermark_store: WatermarkStore = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        read_options: dict = None, valid_file_path: str = None, approximate: bool = False,
+                        invalid_rows_s3_format: str = None):
+        """
+        Validate an append-only CSV incrementally: only the rows appended since the watermark saved
+        for (`process_id`, file) are read and checked by the row-level expectations, and their valid /
+        invalid rows are appended to the outputs. Table-level expectations continue from the running
+        state saved with the watermark, so the result covers the whole file. The watermark is moved
+        to the last complete line once the new rows are written; a truncated or rewritten file, or
+        changed expectations, start over from the first row.
+        Takes the arguments of `run_streaming`; returns the CheckpointResult-shaped summary of the whole file.
+        """
+        if is_compressed(self.file_path) or is_parquet(self.file_path):
+            raise ValueError(f"Incremental validation needs an append-only CSV file: {self.file_path}")
+        watermark_store = watermark_store or WatermarkStore()
+
+        skipped = self.start_streaming(read_options)
+        if skipped is not None:
+            return skipped
+        expectations_action_dict = self.expectations_actions()
+
+        streaming_validator = StreamingDataValidator(
+            self.mapped_expectations,
+            expectation_suite_name=self.expectation_suite_name,
+            validation_definition_name=self.validation_definition_name,
+            approximate=approximate
+        )
+        fingerprint = self.expectations_fingerprint()
+        read_options = dict(read_options or {})
+        start_offset = 0
+        watermark = watermark_store.load(self.process_id, self.file_path)
+        if watermark is not None:
+            reason = watermark_store.stale_reason(watermark, self.file_path, fingerprint, approximate)
+            if reason is None:
+                streaming_validator.restore_state(watermark["state"])
+                start_offset = watermark["byte_offset"]
+                # The header, if any, was read with the first rows, and so were the dtypes to hash alike
+                read_options.update(header=None, names=streaming_validator.columns)
+                if not read_options.get("dtype") or isinstance(read_options["dtype"], dict):
+                    read_options["dtype"] = {**continuation_dtypes(streaming_validator.dtypes),
+                                             **(read_options.get("dtype") or {})}
+            else:
+                print(f"Watermark of {self.file_path} discarded ({reason}), validating from the first row.")
+        end_offset = complete_lines_end(self.file_path)
+        first_row = streaming_validator.row_count
+
+        valid_count, invalid_count = self.validate_chunks(
+            streaming_validator,
+            lambda: load_data_in_chunks(self.file_path, chunk_size, byte_range=(start_offset, end_offset),
+                                        first_row=first_row, **read_options),
+            expectations_action_dict, valid_file_path, invalid_rows_s3_format, append=start_offset > 0)
+
+        if streaming_validator.row_count:
+            watermark_store.save(self.process_id, self.file_path, end_offset,
+                                 streaming_validator.row_count, fingerprint, approximate,
+                                 streaming_validator.export_state())
+        print(f"Validated rows {first_row} to {streaming_validator.row_count} of {self.file_path}; "
+              f"watermark at byte {end_offset}.")
+
+        self.validation_results = streaming_validator.finalize()
+        self.apply_failure_actions(self.validation_results, expectations_action_dict)
+
+        print("Process completed.")
+        print(f"Valid Rows Count: {valid_count}")
+        print(f"Invalid Rows Count: {invalid_count}")
+        self.instrumentation.flush()
+
+        return self.validation_results
+
+    def run_spark(self, spark_df, invalid_rows_format: str = "parquet"):
+        """
+        Validate a Spark DataFrame (e.g. a whole day of deliveries) with the same user YAML: the
+        mapped expectations run as one distributed aggregation, and the rows of failing 'skip'
+        expectations are split out as filtered DataFrames instead of collected index lists. The
+        invalid rows are written by the executors to `invalid_file_path` (a directory) in
+        `invalid_rows_format`. Raises StopProcessError for a failed 'failure' expectation.
+        Returns (valid rows DataFrame, CheckpointResult-shaped summary); the valid rows are lazy.
+        """
+        self.load_data()
+        expectations_action_dict = self.expectations_actions()
+        mapped_expectation = ExpectationMapper(self.expectation_mapping_config_path)
+        self.mapped_expectations = mapped_expectation.map_user_expectations(
+            self.validation_config.get('expectations', []))
+
+        spark_validator = SparkDataValidator(spark_df, expectation_suite_name=self.expectation_suite_name,
+                                             validation_definition_name=self.validation_definition_name)
+        with self.instrumentation.stage("checkpoint", engine="spark"):
+            self.validation_results, _ = spark_validator.validate(self.mapped_expectations)
+        self.apply_failure_actions(self.validation_results, expectations_action_dict)
+
+        results = self.validation_results.run_results[self.validation_definition_name]["results"]
+        failures = []
+        for position, expectation_result in enumerate(results):
+            expectation_name = self.normalize_to_pascal_case(expectation_result["expectation_config"]["type"])
+            expectation_column = expectation_result["expectation_config"]["kwargs"].get("column")
+            if not expectation_result["success"] \
+                    and expectations_action_dict.get((expectation_name, expectation_column)) == "skip" \
+                    and expectation_result["expectation_config"]["type"] in SPARK_MAP_EXPECTATIONS:
+                failures.append((expectation_name, expectation_column, position))
+        invalid_df, df_valid = spark_validator.partition(failures)
+
+        if invalid_df is not None and self.invalid_file_path:
+            with self.instrumentation.stage("write", format=invalid_rows_format):
+                invalid_df.write.mode("overwrite").format(invalid_rows_format) \
+                    .option("header", True).save(self.invalid_file_path)
+            print(f"Invalid records have been saved to: {self.invalid_file_path}")
+
+        print("Process completed.")
+        self.instrumentation.flush()
+        return df_valid, self.validation_results
+
+    def start_streaming(self, read_options: dict = None):
+        """
+        Loads the configuration, runs the file and schema checks and maps the expectations of a
+        chunked run. Returns the schema CheckpointResult when the file is skipped, None otherwise.
+        """
+        self.load_data()
+
+        file_validation_results = self.validate_file()
+        print(file_validation_results)
+
+        # Schema expectations are answered from the header before a single chunk is read
+        schema_results, skip_file = self.validate_schema(read_options)
+        if skip_file:
+            print(f"Schema check failed with action 'skip', file skipped: {self.file_path}")
+            return build_checkpoint_result(schema_results, self.expectation_suite_name,
+                                           self.validation_definition_name, engine="schema")
+
+        mapped_expectation = ExpectationMapper(self.expectation_mapping_config_path)
+        self.mapped_expectations = mapped_expectation.map_user_expectations(
+            self.validation_config.get('expectations', []))
+        return None
+
+    def expectations_actions(self) -> dict:
+        """The YAML action of every expectation, keyed by (expectation name, column)."""
+        return {(expectation['name'], expectation.get('column')): expectation.get('action')
+                for expectation in self.validation_config.get('expectations', [])}
+
+    def validate_chunks(self, streaming_validator: StreamingDataValidator, read_chunks,
+                        expectations_action_dict: dict, valid_file_path: str = None,
+                        invalid_rows_s3_format: str = None, append: bool = False):
+        """
+        Validates the chunks returned by `read_chunks()` one at a time and writes their valid /
+        invalid rows as they go. Uniqueness expectations first read the chunks once more to find
+        the duplicated values, so every occurrence of them is flagged.
+        With `append` the local outputs are appended to instead of rewritten.
+        Returns (valid rows, invalid rows).
+        """
+        if streaming_validator.needs_key_pass:
+            with self.instrumentation.stage("key_pass"):
+                for chunk in read_chunks():
+                    streaming_validator.count_keys(chunk)
+
+        valid_count = invalid_count = 0
+        first_valid = not append
+        output_writer = None
+        try:
+            for chunk in read_chunks():
+                failure_masks = []
+                with self.instrumentation.stage("chunk", rows=len(chunk)):
+                    for expectation, mask in streaming_validator.validate_chunk(chunk):
+                        expectation_name = self.normalize_to_pascal_case(expectation.expectation_type)
+                        expectation_column = getattr(expectation, "column", None)
+                        action = expectations_action_dict.get((expectation_name, expectation_column), None)
+                        if action == "skip" and mask is not None:
+                            failure_masks.append((expectation_name, expectation_column, mask))
+
+                    invalid_df, df_valid, df_invalid = self.partition_rows(chunk, failure_masks)
+                valid_count += len(df_valid)
+                invalid_count += len(df_invalid)
+
+                if valid_file_path:
+                    self.append_rows(df_valid, valid_file_path, header=first_valid)
+                    first_valid = False
+                if (self.invalid_file_path or invalid_rows_s3_format) and not invalid_df.empty:
+                    # Bad records are written in the background while the next chunk is validated
+                    if output_writer is None:
+                        output_writer = self.open_output_writer(invalid_rows_s3_format, append=append)
+                    output_writer.submit(invalid_df)
+        except BaseException:
+            if output_writer is not None:
+                output_writer.abort()
+                self.output_writer = None
+            raise
+        self.flush_outputs()
+        return valid_count, invalid_count
+
+    def apply_failure_actions(self, validation_results, expectations_action_dict: dict) -> None:
+        """Raises StopProcessError for a failed expectation whose action is 'failure'."""
+        result = self.process_results(validation_results)
+
+        # 'skip' rows were already separated per chunk, only 'failure' actions remain to be applied
+        for expectation_result in result["results"]:
+            if expectation_result["success"]:
+                continue
+            expectation_name = self.normalize_to_pascal_case(expectation_result["expectation_config"]["type"])
+            expectation_column = expectation_result["expectation_config"]["kwargs"].get("column")
+            if expectations_action_dict.get((expectation_name, expectation_column), None) == "failure":
+                raise StopProcessError(
+                    f"Action 'failure' encountered for expectation {expectation_name} on column {expectation_column}. Stopping the process.")